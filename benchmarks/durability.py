@@ -0,0 +1,67 @@
+"""Throughput of --durability none, batch and strict on many small files.
+
+Scrubs ``--files`` small PNGs once per mode into a fresh output directory
+and prints files per second. fsync cost depends entirely on the storage,
+so point ``--dir`` at the disk you care about: on tmpfs (often /tmp) every
+mode measures the same.
+
+    python benchmarks/durability.py [--files 2000] [--dir .] [--jobs 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, PngImagePlugin
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.durability import DURABILITY_MODES
+from metadata_scrubber.models import ScrubStatus
+
+
+def make_inputs(src: Path, files: int) -> None:
+    src.mkdir()
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "Alice Smith")
+    for i in range(files):
+        # Spread over subdirectories so batch mode has several parents to sync.
+        sub = src / f"d{i % 16}"
+        sub.mkdir(exist_ok=True)
+        Image.new("RGB", (16, 16), (i % 256, i // 256 % 256, 0)).save(
+            sub / f"f{i}.png", pnginfo=info
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--dir", type=Path, default=Path("."), help="where to write files")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--batch", type=int, default=256, help="--durability-batch")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir, prefix="durability-bench-") as tmp:
+        src = Path(tmp) / "in"
+        make_inputs(src, args.files)
+        print(f"{'mode':8} {'files/s':>9} {'seconds':>8}")
+        for mode in DURABILITY_MODES:
+            out = Path(tmp) / "out"
+            shutil.rmtree(out, ignore_errors=True)
+            opts = RunOptions(
+                out_dir=out, durability=mode, durability_batch=args.batch, jobs=args.jobs
+            )
+            start = time.perf_counter()
+            results = scrub_paths([src], opts)
+            elapsed = time.perf_counter() - start
+            failed = [r for r in results if r.status != ScrubStatus.SCRUBBED]
+            if failed:
+                raise SystemExit(f"{mode}: {failed[0].status.value}: {failed[0].message}")
+            print(f"{mode:8} {len(results) / elapsed:9.0f} {elapsed:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Throughput and peak memory of the streaming author rewriter on a large part.
+
+Writes a ``word/document.xml`` of ``--mb`` megabytes full of revision marks
+(``w:ins``/``w:del`` with ``w:author``/``w:date``) and ``w:rsid*``
+attributes, then times ``rewrite_author_xml`` over it and the full OpenXML
+scrub of a .docx that contains it. Peak memory is the growth of the
+process's max RSS during each step, so it includes expat's C buffers.
+Exits non-zero if a step grows RSS by more than ``--max-peak-mb``.
+
+    python benchmarks/openxml_authors.py [--mb 300] [--max-peak-mb 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import ScrubStatus
+from metadata_scrubber.scrubbers.openxml_authors import Pseudonyms, rewrite_author_xml
+
+_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    b"<w:body>"
+)
+_TAIL = b"</w:body></w:document>"
+
+
+def _paragraph(n: int) -> bytes:
+    author = f"Reviewer {n % 17}"
+    return (
+        f'<w:p w:rsidR="00A{n % 4096:05X}" w:rsidRDefault="00B12345">'
+        f'<w:ins w:id="{n}" w:author="{author}" w:date="2024-03-01T10:00:00Z">'
+        f'<w:r w:rsidRPr="00C{n % 999:05d}"><w:t>Inserted text number {n}</w:t></w:r></w:ins>'
+        f'<w:del w:id="{n + 1}" w:author="{author}" w:date="2024-03-02T11:30:00Z">'
+        f"<w:r><w:delText>Deleted text number {n}</w:delText></w:r></w:del>"
+        f"<w:r><w:t>Plain text that is copied through unchanged.</w:t></w:r></w:p>"
+    ).encode()
+
+
+def write_document(path: Path, size: int) -> None:
+    with path.open("wb") as f:
+        f.write(_HEAD)
+        n = 0
+        while f.tell() < size:
+            f.write(b"".join(_paragraph(n + i) for i in range(1000)))
+            n += 1000
+        f.write(_TAIL)
+
+
+def _max_rss() -> int:
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(label: str, size: int, step: Callable[[], None]) -> int:
+    before = _max_rss()
+    start = time.perf_counter()
+    step()
+    elapsed = time.perf_counter() - start
+    growth = _max_rss() - before
+    print(
+        f"{label:14} {size / 2**20:8.0f} MiB {elapsed:7.2f} s "
+        f"{size / 2**20 / elapsed:8.1f} MiB/s  peak +{growth / 2**20:.1f} MiB"
+    )
+    return growth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, default=300, help="size of word/document.xml")
+    parser.add_argument("--max-peak-mb", type=float, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        part = root / "document.xml"
+        write_document(part, args.mb * 2**20)
+        size = part.stat().st_size
+
+        def rewrite() -> None:
+            with part.open("rb") as src, (root / "rewritten.xml").open("wb") as dst:
+                rewrite_author_xml(src, dst, mode="pseudonymize", pseudonyms=Pseudonyms())
+
+        docx = root / "in" / "large.docx"
+        docx.parent.mkdir()
+        with zipfile.ZipFile(docx, "w", compression=zipfile.ZIP_DEFLATED) as z:
+            z.writestr("[Content_Types].xml", "<Types/>")
+            z.write(part, "word/document.xml")
+
+        def scrub() -> None:
+            [result] = scrub_paths([docx], RunOptions(out_dir=root / "out"))
+            if result.status != ScrubStatus.SCRUBBED:
+                raise SystemExit(f"scrub failed: {result.status.value}: {result.message}")
+
+        peaks = [measure("rewrite part", size, rewrite)]
+        (root / "rewritten.xml").unlink()
+        peaks.append(measure("scrub .docx", size, scrub))
+
+    if max(peaks) > args.max_peak_mb * 2**20:
+        raise SystemExit(f"peak memory growth above {args.max_peak_mb} MiB")
+
+
+if __name__ == "__main__":
+    main()
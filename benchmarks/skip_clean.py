@@ -0,0 +1,141 @@
+"""Where does --skip-clean pay off? Preflight probe vs. full rescrub, per format.
+
+For each format and size this scrubs a set of files that still carry
+metadata and a set that was already scrubbed, with and without
+``skip_clean``. On dirty input the probe is pure overhead; on clean input
+it replaces the scrub with a copy. The crossover is the share of
+already-clean files above which ``--skip-clean`` is faster overall.
+
+    python benchmarks/skip_clean.py [--files 20] [--sizes 64,512,2048]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import shutil
+import tempfile
+import time
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+from PIL import Image
+from pypdf import PdfWriter
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import ScrubStatus
+
+
+def _image(size: int, i: int) -> Image.Image:
+    # Noise-free gradients compress like photos would, without random data.
+    img = Image.linear_gradient("L").resize((size, size)).convert("RGB")
+    img.putpixel((0, 0), (i % 256, 0, 0))
+    return img
+
+
+def make_jpeg(path: Path, size: int, i: int) -> None:
+    exif = Image.Exif()
+    exif[0x010F] = "Benchmark Camera"
+    exif[0x0132] = "2024:01:01 12:00:00"
+    _image(size, i).save(path, "JPEG", quality=90, exif=exif.tobytes())
+
+
+def make_png(path: Path, size: int, i: int) -> None:
+    from PIL import PngImagePlugin
+
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "Alice Smith")
+    _image(size, i).save(path, "PNG", pnginfo=info)
+
+
+def make_pdf(path: Path, size: int, i: int) -> None:
+    # One page per 64 px of "size", each with an embedded JPEG.
+    buf = io.BytesIO()
+    _image(size, i).save(buf, "JPEG", quality=90)
+    image_pdf = io.BytesIO()
+    Image.open(buf).save(image_pdf, "PDF")
+    writer = PdfWriter()
+    for _ in range(max(1, size // 64)):
+        writer.append(io.BytesIO(image_pdf.getvalue()))
+    writer.add_metadata({"/Author": "Alice Smith", "/Producer": "benchmark"})
+    with path.open("wb") as f:
+        writer.write(f)
+
+
+def make_docx(path: Path, size: int, i: int) -> None:
+    # One paragraph per px of "size", plus core properties.
+    body = "".join(f"<w:p><w:r><w:t>Paragraph {n} of {i}</w:t></w:r></w:p>" for n in range(size))
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", "<Types/>")
+        z.writestr(
+            "docProps/core.xml",
+            "<coreProperties><dc:creator>Alice Smith</dc:creator></coreProperties>",
+        )
+        z.writestr("word/document.xml", f"<w:document><w:body>{body}</w:body></w:document>")
+
+
+FORMATS: dict[str, tuple[str, Callable[[Path, int, int], None]]] = {
+    "jpeg": (".jpg", make_jpeg),
+    "png": (".png", make_png),
+    "pdf": (".pdf", make_pdf),
+    "docx": (".docx", make_docx),
+}
+
+
+def _run(src: Path, out: Path, *, skip_clean: bool) -> tuple[float, int]:
+    shutil.rmtree(out, ignore_errors=True)
+    start = time.perf_counter()
+    results = scrub_paths([src], RunOptions(out_dir=out, skip_clean=skip_clean))
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(r.status == ScrubStatus.ALREADY_CLEAN for r in results)
+
+
+def bench(fmt: str, size: int, files: int, root: Path) -> None:
+    suffix, make = FORMATS[fmt]
+    dirty = root / f"{fmt}-{size}-dirty"
+    dirty.mkdir()
+    for i in range(files):
+        make(dirty / f"f{i}{suffix}", size, i)
+    clean = root / f"{fmt}-{size}-clean"
+    scrub_paths([dirty], RunOptions(out_dir=clean))
+    out = root / "out"
+
+    dirty_plain, _ = _run(dirty, out, skip_clean=False)
+    dirty_skip, _ = _run(dirty, out, skip_clean=True)
+    clean_plain, _ = _run(clean, out, skip_clean=False)
+    clean_skip, skipped = _run(clean, out, skip_clean=True)
+
+    overhead = max(dirty_skip - dirty_plain, 0.0)
+    saving = clean_plain - clean_skip
+    if saving <= 0:
+        crossover = "never"
+    else:
+        crossover = f"{overhead / (overhead + saving):.0%}"
+    ms = 1000 / files
+    print(
+        f"{fmt:5} {size:6} {dirty_plain * ms:9.2f} {dirty_skip * ms:9.2f} "
+        f"{clean_plain * ms:9.2f} {clean_skip * ms:9.2f} {skipped:>4}/{files:<4} {crossover:>9}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20, help="files per format and size")
+    parser.add_argument("--sizes", default="64,512,2048", help="image side in px (see make_*)")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    args = parser.parse_args()
+
+    print("ms/file: dirty input without/with --skip-clean, clean input without/with")
+    print(
+        f"{'fmt':5} {'size':>6} {'dirty':>9} {'dirty+sc':>9} {'clean':>9} {'clean+sc':>9} "
+        f"{'skipped':>9} {'crossover':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats.split(","):
+            for size in (int(s) for s in args.sizes.split(",")):
+                bench(fmt, size, args.files, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 Public API is intentionally small; prefer the CLI entrypoint.
 """
 
+from .aio import ascrub_paths, averify_paths
 from .core import scrub_paths
 
-__all__ = ["scrub_paths"]
+__all__ = ["ascrub_paths", "averify_paths", "scrub_paths"]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import subprocess
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .core import (
+    RunOptions,
+    _adopt,
+    _pick_scrubber,
+    _plan_tasks,
+    _scrub_one,
+    _scrubber_options,
+    _timed_scrub_one,
+)
+from .models import ScrubResult
+from .scrubbers import default_scrubbers
+from .scrubbers.video import VideoScrubber
+from .utils import tool_runner
+from .verify import VerifyOptions, VerifyResult, iter_files, verifier_kind, verify_file
+
+
+async def ascrub_paths(
+    paths: Iterable[Path],
+    options: RunOptions,
+    *,
+    concurrency: int | None = None,
+    executor: Executor | None = None,
+) -> list[ScrubResult]:
+    """Async counterpart of ``scrub_paths``; results are in the same order.
+
+    At most ``concurrency`` files (default: CPU count) are in flight. Videos
+    are scrubbed by ffmpeg running as an asyncio subprocess. The other
+    scrubbers are CPU-bound and run on ``executor`` when given (for example a
+    ProcessPoolExecutor), otherwise on a private thread pool.
+
+    Cancelling the call kills running ffmpeg processes and removes their
+    temp files before the CancelledError propagates. A CPU-bound file that
+    is already being scrubbed is allowed to finish (its output is still
+    written atomically); files that haven't started are dropped.
+
+    The journal and dedup options are not supported here.
+    """
+    if options.journal is not None or options.dedup:
+        raise ValueError("journal and dedup are only supported by scrub_paths")
+
+    limit = concurrency or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="metadata-scrubber") as pool:
+        loop = asyncio.get_running_loop()
+        tasks = await _run_in(loop, pool, _plan_tasks, list(paths), options)
+        scrubbers = default_scrubbers()
+        scrubber_opts = _scrubber_options(options)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def one(src: Path, dst: Path | None) -> ScrubResult:
+            async with semaphore:
+                if executor is not None and not isinstance(_pick_scrubber(src, scrubbers), VideoScrubber):
+                    result, _elapsed, staged = await _run_in(
+                        loop, executor, _timed_scrub_one, src, dst, scrubber_opts, options
+                    )
+                    if staged:
+                        await _run_in(loop, pool, _adopt, None, staged)
+                    return result
+                return await _run_in(
+                    loop,
+                    pool,
+                    _scrub_one,
+                    src,
+                    dst,
+                    scrubbers=scrubbers,
+                    scrubber_options=scrubber_opts,
+                    options=options,
+                )
+
+        return list(await asyncio.gather(*(one(src, dst) for src, dst in tasks)))
+
+
+async def averify_paths(
+    paths: Iterable[Path],
+    options: VerifyOptions,
+    *,
+    concurrency: int | None = None,
+    executor: Executor | None = None,
+) -> list[VerifyResult]:
+    """Async counterpart of ``verify_paths``; results are in the same order.
+
+    ffprobe (when a video needs it) runs as an asyncio subprocess and is
+    killed on cancellation; other verifiers run on ``executor`` when given,
+    otherwise on a private thread pool of ``concurrency`` threads.
+    """
+    limit = concurrency or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="metadata-verify") as pool:
+        loop = asyncio.get_running_loop()
+        files = await _run_in(loop, pool, _list_files, list(paths), options.recursive)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def one(path: Path) -> VerifyResult:
+            async with semaphore:
+                target = executor if executor is not None and verifier_kind(path) != "video" else pool
+                return await _run_in(loop, target, verify_file, path, options=options)
+
+        return list(await asyncio.gather(*(one(p) for p in files)))
+
+
+def _list_files(paths: list[Path], recursive: bool) -> list[Path]:
+    return [p for root in paths for p in iter_files(root.expanduser(), recursive=recursive)]
+
+
+async def _run_in(
+    loop: asyncio.AbstractEventLoop,
+    executor: Executor,
+    fn: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    # Work on our own threads gets a runner that starts external tools on the
+    # loop; process pools can't reach the loop, so tools run there as usual.
+    runner = _LoopToolRunner(loop)
+    if isinstance(executor, ThreadPoolExecutor):
+        ctx = contextvars.copy_context()
+        ctx.run(tool_runner.set, runner)
+        cfut: Future = executor.submit(ctx.run, fn, *args, **kwargs)
+    else:
+        cfut = executor.submit(fn, *args, **kwargs)
+
+    afut = asyncio.wrap_future(cfut, loop=loop)
+    try:
+        return await asyncio.shield(afut)
+    except asyncio.CancelledError:
+        # Not started: never runs. Running: kill its tool, then let it unwind
+        # so TempPath has removed its temp file before we report cancellation.
+        cfut.cancel()
+        runner.cancel()
+        await asyncio.wait([afut])
+        raise
+
+
+class _LoopToolRunner:
+    """Runs one task's external tools as asyncio subprocesses on loop.
+
+    Called from a worker thread (through ``utils.run_tool``), which blocks
+    until the tool exits; the event loop itself never waits on it.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._task: asyncio.Task | None = None
+        self._cancelled = False
+
+    def __call__(self, cmd: list[str], capture: bool, timeout: float | None) -> bytes:
+        done: Future = Future()
+
+        def start() -> None:
+            if self._cancelled:
+                done.set_exception(RuntimeError("cancelled"))
+                return
+            self._task = self._loop.create_task(_run_tool(cmd, capture=capture, timeout=timeout))
+            self._task.add_done_callback(lambda task: _settle(task, done))
+
+        self._loop.call_soon_threadsafe(start)
+        # Only returns once the tool has exited (or been killed and reaped).
+        return done.result()
+
+    def cancel(self) -> None:
+        # Runs on the loop, like start(), so the two can't interleave.
+        self._cancelled = True
+        if self._task is not None:
+            self._task.cancel()
+
+
+def _settle(task: asyncio.Task, done: Future) -> None:
+    if task.cancelled():
+        done.set_exception(RuntimeError("cancelled"))
+    elif task.exception() is not None:
+        done.set_exception(task.exception())
+    else:
+        done.set_result(task.result())
+
+
+async def _run_tool(cmd: list[str], *, capture: bool, timeout: float | None) -> bytes:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE if capture else None
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        raise
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, out)
+    return out or b""
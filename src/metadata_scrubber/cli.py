@@ -7,7 +7,14 @@ from rich.console import Console
 from rich.table import Table
 
 from .core import RunOptions, scrub_paths
-from .models import ScrubStatus
+from .durability import DURABILITY_MODES
+from .manifest import write_manifest
+from .models import RunStats, ScrubStatus
+from .ordering import ORDERS
+from .scrubbers.openxml import ZIP_COMPRESSION_MODES
+from .scrubbers.openxml_authors import AUTHOR_MODES
+from .shard import parse_shard
+from .utils import parse_size
 
 
 def main(
@@ -26,6 +33,21 @@ def main(
         help="Copy unsupported file types as-is (no scrubbing)",
     ),
     no_recursive: bool = typer.Option(False, "--no-recursive", help="Do not traverse directories"),
+    dedup: bool = typer.Option(
+        False,
+        "--dedup",
+        help="Scrub byte-identical inputs once and reuse the result (reflink or copy)",
+    ),
+    dedup_hardlinks: bool = typer.Option(
+        False,
+        "--dedup-hardlinks",
+        help="With --dedup, hardlink duplicate outputs to the first one (they share its mode/times)",
+    ),
+    skip_clean: bool = typer.Option(
+        False,
+        "--skip-clean",
+        help="Probe files first (as metadata-verify does) and copy already-clean files as-is",
+    ),
     preserve_times: bool = typer.Option(True, "--preserve-times/--no-preserve-times"),
     preserve_perms: bool = typer.Option(True, "--preserve-perms/--no-preserve-perms"),
     strip_xattrs: bool = typer.Option(True, "--strip-xattrs/--no-strip-xattrs"),
@@ -34,16 +56,153 @@ def main(
         "--normalize-zip-timestamps/--no-normalize-zip-timestamps",
         help="Normalize timestamps inside Office (OpenXML) zip packages",
     ),
+    openxml_media: bool = typer.Option(
+        True,
+        "--openxml-media/--no-openxml-media",
+        help="Also scrub images and embedded documents inside Office (OpenXML) files",
+    ),
+    openxml_authors: str = typer.Option(
+        "pseudonymize",
+        "--openxml-authors",
+        help="Author names on revisions/comments in Office files: pseudonymize, strip or keep",
+    ),
+    zip_compression: str = typer.Option(
+        "auto",
+        "--zip-compression",
+        help="Office (OpenXML) output compression: auto (store JPEG/PNG/MP4 etc., deflate the rest), deflate or store",
+    ),
+    zip_level: int | None = typer.Option(
+        None,
+        "--zip-level",
+        min=0,
+        max=9,
+        help="Deflate level for Office (OpenXML) members (default: zlib's)",
+    ),
     pdf_aggressive: bool = typer.Option(
         False,
         "--pdf-aggressive/--no-pdf-aggressive",
         help="More aggressive PDF sanitization (may remove bookmarks/forms/annotations)",
     ),
+    pdf_compact: bool = typer.Option(
+        False,
+        "--pdf-compact/--no-pdf-compact",
+        help="Shrink PDF output: compress uncompressed streams and merge identical objects",
+    ),
     backup_suffix: str = typer.Option(
         ".bak",
         "--backup-suffix",
         help="Backup suffix for in-place mode (empty string disables backups)",
     ),
+    journal: Path | None = typer.Option(
+        None,
+        "--journal",
+        help="Record per-file progress in this journal file so an interrupted run can be resumed",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue the run recorded in --journal, rolling back half-finished files",
+    ),
+    shard: str | None = typer.Option(
+        None,
+        "--shard",
+        help="Only process shard I of N (I/N, 0-based), assigned by a stable relative-path hash",
+    ),
+    shard_by_size: bool = typer.Option(
+        False,
+        "--shard-by-size",
+        help="With --shard, balance shards by total file size instead of hashing",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Worker processes for CPU-bound scrubbers (>1 schedules largest files first)",
+    ),
+    video_jobs: int = typer.Option(
+        2,
+        "--video-jobs",
+        min=1,
+        help="With --jobs > 1, concurrent ffmpeg (video) scrubs",
+    ),
+    max_memory: str | None = typer.Option(
+        None,
+        "--max-memory",
+        help="With --jobs > 1, only run files concurrently while their estimated memory fits (e.g. 8G)",
+    ),
+    file_timeout: float | None = typer.Option(
+        None,
+        "--file-timeout",
+        min=0.001,
+        help="Give up on a file after this many seconds (status: timeout); scrubbers run in killable workers",
+    ),
+    prefetch: int = typer.Option(
+        0,
+        "--prefetch",
+        min=0,
+        help="Ask the OS to read this many upcoming files ahead of the scrubbers (posix_fadvise WILLNEED)",
+    ),
+    drop_behind: bool = typer.Option(
+        False,
+        "--drop-behind",
+        help="Evict finished input files from the page cache (posix_fadvise DONTNEED)",
+    ),
+    drop_behind_depth: int = typer.Option(
+        32,
+        "--drop-behind-depth",
+        min=1,
+        help="With --drop-behind, finished files that may wait for eviction before scrubbing pauses",
+    ),
+    order: str | None = typer.Option(
+        None,
+        "--order",
+        help="Dispatch order: inode or physical (FIEMAP) for spinning disks, path, or size; results keep walk order",
+    ),
+    durability: str = typer.Option(
+        "none",
+        "--durability",
+        help="none: atomic renames only; strict: fsync every file and directory; batch: fsync in groups",
+    ),
+    durability_batch: int = typer.Option(
+        256,
+        "--durability-batch",
+        min=1,
+        help="With --durability batch, files per group fsync",
+    ),
+    max_pixels: int | None = typer.Option(
+        None,
+        "--max-pixels",
+        min=1,
+        help="Reject images larger than this many pixels before decoding (status: rejected)",
+    ),
+    zip_max_total: str | None = typer.Option(
+        None,
+        "--zip-max-total",
+        help="Reject Office files whose members expand to more than this (e.g. 2G)",
+    ),
+    zip_max_ratio: float | None = typer.Option(
+        None,
+        "--zip-max-ratio",
+        min=1.0,
+        help="Reject Office files whose overall compression ratio is above this (e.g. 100)",
+    ),
+    pdf_max_objects: int | None = typer.Option(
+        None,
+        "--pdf-max-objects",
+        min=1,
+        help="Reject PDFs whose cross-reference table lists more objects than this",
+    ),
+    pdf_max_stream: str | None = typer.Option(
+        None,
+        "--pdf-max-stream",
+        help="Reject PDFs that may hold a single object larger than this (e.g. 256M)",
+    ),
+    manifest: Path | None = typer.Option(
+        None,
+        "--manifest",
+        help="Write a JSON manifest of the results (combine shards with metadata-merge-manifests)",
+    ),
 ) -> None:
     console = Console()
 
@@ -53,6 +212,38 @@ def main(
     if not in_place and out is None:
         out = Path("scrubbed")
 
+    shard_spec = None
+    if shard is not None:
+        try:
+            shard_spec = parse_shard(shard)
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from None
+
+    try:
+        max_memory_bytes = parse_size(max_memory) if max_memory is not None else None
+        zip_max_total_bytes = parse_size(zip_max_total) if zip_max_total is not None else None
+        pdf_max_stream_bytes = parse_size(pdf_max_stream) if pdf_max_stream is not None else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from None
+
+    if openxml_authors not in AUTHOR_MODES:
+        raise typer.BadParameter(f"--openxml-authors must be one of: {', '.join(AUTHOR_MODES)}")
+
+    if order is not None and order not in ORDERS:
+        raise typer.BadParameter(f"--order must be one of: {', '.join(ORDERS)}")
+
+    if durability not in DURABILITY_MODES:
+        raise typer.BadParameter(f"--durability must be one of: {', '.join(DURABILITY_MODES)}")
+
+    if zip_compression not in ZIP_COMPRESSION_MODES:
+        raise typer.BadParameter(f"--zip-compression must be one of: {', '.join(ZIP_COMPRESSION_MODES)}")
+
+    if resume and journal is None:
+        raise typer.BadParameter("--resume requires --journal")
+
+    if journal is not None and not resume and journal.exists() and journal.stat().st_size > 0:
+        raise typer.BadParameter(f"journal exists: {journal} (use --resume to continue that run)")
+
     opts = RunOptions(
         out_dir=out,
         in_place=in_place,
@@ -60,15 +251,46 @@ def main(
         overwrite=overwrite,
         copy_unknown=copy_unknown,
         recursive=not no_recursive,
+        skip_clean=skip_clean,
+        dedup=dedup,
+        dedup_hardlinks=dedup_hardlinks,
         preserve_times=preserve_times,
         preserve_perms=preserve_perms,
         strip_xattrs=strip_xattrs,
         normalize_zip_timestamps=normalize_zip_timestamps,
         pdf_aggressive=pdf_aggressive,
+        openxml_media=openxml_media,
+        openxml_authors=openxml_authors,
+        zip_compression=zip_compression,
+        zip_level=zip_level,
+        pdf_compact=pdf_compact,
         backup_suffix=backup_suffix,
+        journal=journal,
+        resume=resume,
+        shard=shard_spec,
+        shard_by_size=shard_by_size,
+        jobs=jobs,
+        video_jobs=video_jobs,
+        max_memory=max_memory_bytes,
+        file_timeout=file_timeout,
+        prefetch_depth=prefetch,
+        drop_behind=drop_behind,
+        drop_behind_depth=drop_behind_depth,
+        order=order,
+        durability=durability,
+        durability_batch=durability_batch,
+        max_pixels=max_pixels,
+        zip_max_total=zip_max_total_bytes,
+        zip_max_ratio=zip_max_ratio,
+        pdf_max_objects=pdf_max_objects,
+        pdf_max_stream=pdf_max_stream_bytes,
     )
 
-    results = scrub_paths(paths, opts)
+    stats = RunStats()
+    results = scrub_paths(paths, opts, stats=stats)
+
+    if manifest is not None:
+        write_manifest(manifest, results, shard=shard_spec, stats=stats)
 
     counts: dict[ScrubStatus, int] = {}
     for r in results:
@@ -83,7 +305,20 @@ def main(
 
     console.print(table)
 
-    errors = [r for r in results if r.status == ScrubStatus.ERROR]
+    if stats.dedup_files:
+        console.print(
+            f"Deduplicated {stats.dedup_files} file(s); {stats.dedup_bytes_saved} input bytes not re-scrubbed"
+        )
+
+    if stats.pool_utilization:
+        usage = ", ".join(f"{pool} {u:.0%}" for pool, u in sorted(stats.pool_utilization.items()))
+        console.print(f"Pool utilization: {usage}")
+
+    if stats.stage_utilization:
+        usage = ", ".join(f"{stage} {u:.0%}" for stage, u in sorted(stats.stage_utilization.items()))
+        console.print(f"Stage utilization: {usage}")
+
+    errors = [r for r in results if r.status in {ScrubStatus.ERROR, ScrubStatus.REJECTED, ScrubStatus.TIMEOUT}]
     if errors:
         err_table = Table(title="Errors", show_lines=False)
         err_table.add_column("Source")
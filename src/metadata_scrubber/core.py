@@ -1,14 +1,44 @@
 from __future__ import annotations
 
+import multiprocessing
 import os
-from dataclasses import dataclass
+import subprocess
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
-
-from .models import ScrubResult, ScrubStatus
+from typing import Any, Callable, Iterable
+
+from .dedup import find_duplicates
+from .durability import GroupCommit, Staged
+from .journal import Journal, JournalState, load_journal
+from .models import RunStats, ScrubResult, ScrubStatus
+from .ordering import dispatch_order
+from .pipeline import ReadAhead
 from .scrubbers import default_scrubbers
-from .scrubbers.base import ScrubOptions
-from .utils import TempPath, atomic_replace, copy_bytes, preserve_stat, strip_xattrs
+from .scrubbers.base import ResourceLimitExceeded, ScrubOptions
+from .scrubbers.openxml_authors import package_mentions_authors
+from .scrubbers.video import VideoScrubber
+from .shard import assign_shards
+from .utils import (
+    TempPath,
+    atomic_replace,
+    clone_or_copy,
+    copy_bytes,
+    link_replace,
+    remove_temp_files,
+    strip_xattrs,
+)
+from .verify import VerifyOptions, VerifyStatus, verify_file
+from .watchdog import CallTimeout, Watchdog, WatchdogPool
 
 
 @dataclass(frozen=True)
@@ -19,6 +49,9 @@ class RunOptions:
     overwrite: bool = False
     copy_unknown: bool = False
     recursive: bool = True
+    skip_clean: bool = False
+    dedup: bool = False
+    dedup_hardlinks: bool = False
 
     preserve_times: bool = True
     preserve_perms: bool = True
@@ -26,22 +59,242 @@ class RunOptions:
 
     normalize_zip_timestamps: bool = True
     pdf_aggressive: bool = False
+    pdf_compact: bool = False
+    openxml_media: bool = True
+    openxml_authors: str = "pseudonymize"
+    zip_compression: str = "auto"
+    zip_level: int | None = None
 
     backup_suffix: str = ".bak"
 
-
-def scrub_paths(paths: Iterable[Path], options: RunOptions) -> list[ScrubResult]:
+    # Write-ahead journal of per-file states; with resume=True, continue a prior run.
+    journal: Path | None = None
+    resume: bool = False
+
+    # (index, count): only process the files that hash to this shard.
+    shard: tuple[int, int] | None = None
+    shard_by_size: bool = False
+
+    # jobs > 1 enables the size-aware scheduler: a process pool of `jobs`
+    # workers for CPU-bound scrubbers and a thread pool for ffmpeg.
+    jobs: int = 1
+    video_jobs: int = 2
+    # Byte budget for the summed memory estimates of concurrently running files.
+    max_memory: int | None = None
+    # Seconds one file may take. CPU-bound scrubbers then run in killable
+    # worker processes; ffmpeg gets the same limit as a subprocess timeout.
+    file_timeout: float | None = None
+    # Files to prefetch (POSIX_FADV_WILLNEED) ahead of the one being scrubbed.
+    prefetch_depth: int = 0
+    # Evict finished inputs from the page cache, from a queue this deep.
+    drop_behind: bool = False
+    drop_behind_depth: int = 32
+    # Dispatch order (see ordering.ORDERS); None walks in traversal order,
+    # largest first with jobs > 1. Results keep traversal order either way.
+    order: str | None = None
+
+    # Budgets checked before a file is decoded; a file over one is REJECTED.
+    max_pixels: int | None = None
+    zip_max_total: int | None = None
+    zip_max_ratio: float | None = None
+    pdf_max_objects: int | None = None
+    pdf_max_stream: int | None = None
+
+    # "none": plain atomic renames. "strict": fsync each file and its
+    # directory. "batch": stage finished files and make them durable
+    # durability_batch at a time (see durability.GroupCommit).
+    durability: str = "none"
+    durability_batch: int = 256
+
+
+def scrub_paths(
+    paths: Iterable[Path],
+    options: RunOptions,
+    *,
+    stats: RunStats | None = None,
+) -> list[ScrubResult]:
     scrubbers = default_scrubbers()
-    scrubber_opts = ScrubOptions(
-        normalize_zip_timestamps=options.normalize_zip_timestamps,
-        pdf_aggressive=options.pdf_aggressive,
-    )
+    scrubber_opts = _scrubber_options(options)
+    tasks = _plan_tasks(paths, options)
+
+    if stats is None:
+        stats = RunStats()
+
+    duplicate_of: dict[int, int] = {}
+    if options.dedup and not options.in_place:
+        # Only scrubbable files are worth hashing; unknown types are never linked.
+        candidates = [i for i, (src, _dst) in enumerate(tasks) if _pick_scrubber(src, scrubbers)]
+        # Same bytes under another extension are encoded differently (a.jpg vs b.png).
+        found = find_duplicates(
+            [tasks[i][0] for i in candidates],
+            kinds=[tasks[i][0].suffix.lower() for i in candidates],
+        )
+        duplicate_of = {candidates[i]: candidates[j] for i, j in found.items()}
+
+    commit: GroupCommit | None = None
+    if options.durability == "batch" and not options.dry_run:
+        commit = GroupCommit(options.durability_batch)
+
+    journal: Journal | None = None
+    prior: dict[str, dict[str, Any]] = {}
+    if options.journal is not None and not options.dry_run:
+        if options.resume:
+            prior = load_journal(options.journal)
+        journal = Journal(
+            options.journal,
+            append=options.resume,
+            before_flush=commit.flush if commit is not None else None,
+        )
+
+    # Sequential runs with a time limit keep one killable worker for the whole run.
+    watchdog: Watchdog | None = None
+    if options.file_timeout is not None and options.jobs == 1:
+        watchdog = Watchdog(options.file_timeout)
+
+    try:
+        if journal is not None:
+            for src, _dst in tasks:
+                if str(src) not in prior:
+                    journal.record(src, JournalState.PLANNED, **_planned_info(src, options))
+            journal.flush()
+
+        results: list[ScrubResult | None] = [None] * len(tasks)
+        task_options: dict[int, RunOptions] = {}
+
+        def finish(i: int, result: ScrubResult) -> None:
+            if journal is not None and result.status not in _UNFINISHED:
+                journal.record(tasks[i][0], JournalState.STAT_RESTORED)
+            results[i] = result
+
+        def run(indices: list[int]) -> None:
+            if options.order is not None:
+                ranked = dispatch_order([tasks[i][0] for i in indices], options.order)
+                indices = [indices[k] for k in ranked]
+
+            if options.jobs > 1:
+                # Pool workers can't share the journal; the parent records completion.
+                jobs = [(i, *tasks[i], task_options.get(i, options)) for i in indices]
+                _run_scheduled(
+                    jobs,
+                    scrubbers=scrubbers,
+                    scrubber_options=scrubber_opts,
+                    options=options,
+                    on_result=finish,
+                    stats=stats,
+                    commit=commit,
+                )
+                return
+
+            read_ahead = _read_ahead([tasks[i][0] for i in indices], options)
+            try:
+                for i in indices:
+                    src, dst = tasks[i]
+                    task_opts = task_options.get(i, options)
+                    if read_ahead is not None:
+                        read_ahead.advance()
+                    started = time.perf_counter()
+                    if watchdog is not None and _pool_for(_pick_scrubber(src, scrubbers)) == "cpu":
+                        result = _scrub_watched(watchdog, src, dst, scrubber_opts, task_opts, commit=commit)
+                    else:
+                        result = _scrub_one(
+                            src,
+                            dst,
+                            scrubbers=scrubbers,
+                            scrubber_options=scrubber_opts,
+                            options=task_opts,
+                            journal=journal,
+                            commit=commit,
+                        )
+                    if read_ahead is not None:
+                        read_ahead.compute(time.perf_counter() - started)
+                        _drop_input(read_ahead, src, options)
+                    finish(i, result)
+            finally:
+                if read_ahead is not None:
+                    stats.stage_utilization.update(read_ahead.close())
+
+        pending: list[int] = []
+        followers: list[int] = []
+        for i, (src, dst) in enumerate(tasks):
+            entry = prior.get(str(src))
+            if entry is not None:
+                resumed = _resume_task(src, dst, entry, scrubbers=scrubbers, options=options)
+                if resumed is not None:
+                    finish(i, resumed)
+                    continue
+                if not options.in_place:
+                    # Output left behind by the interrupted attempt is ours to replace.
+                    task_options[i] = replace(options, overwrite=True)
+
+            (followers if i in duplicate_of else pending).append(i)
+
+        run(pending)
+        if commit is not None:
+            commit.flush()
+
+        # Duplicates go last, once their leader's output exists.
+        retry: list[int] = []
+        for i in followers:
+            leader = results[duplicate_of[i]]
+            if leader is not None and leader.status in _REUSABLE:
+                src, dst = tasks[i]
+                opts = task_options.get(i, options)
+                finish(i, _materialize_duplicate(src, dst, leader, options=opts, stats=stats, commit=commit))
+            else:
+                retry.append(i)
+        run(retry)
+    finally:
+        if watchdog is not None:
+            watchdog.close()
+        # Files staged before a failure are complete; commit them before the journal says so.
+        if commit is not None:
+            commit.flush()
+        if journal is not None:
+            journal.close()
+
+    return [r for r in results if r is not None]
+
+
+# Results after which the journal must not mark a file as done.
+_UNFINISHED = {ScrubStatus.ERROR, ScrubStatus.REJECTED, ScrubStatus.TIMEOUT, ScrubStatus.SKIPPED_DONE}
+
 
+def _scrub_watched(
+    watchdog: Watchdog,
+    src: Path,
+    dst: Path | None,
+    scrubber_options: ScrubOptions,
+    options: RunOptions,
+    *,
+    commit: GroupCommit | None = None,
+) -> ScrubResult:
+    # The worker can't share the journal; the parent records completion.
+    try:
+        result, _elapsed, staged = watchdog.call(_timed_scrub_one, src, dst, scrubber_options, options)
+    except CallTimeout as e:
+        return _timed_out(src, dst, options, e.timeout)
+    except Exception as e:  # noqa: BLE001
+        return ScrubResult(src=src, dst=dst, status=ScrubStatus.ERROR, message=str(e))
+    _adopt(commit, staged)
+    return result
+
+
+def _timed_out(src: Path, dst: Path | None, options: RunOptions, timeout: float) -> ScrubResult:
+    # The killed worker never got to leave its TempPath blocks (or hand
+    # over what it staged; those names match too).
+    target = src if options.in_place else dst
+    if target is not None:
+        remove_temp_files(target)
+    return ScrubResult(src=src, dst=dst, status=ScrubStatus.TIMEOUT, message=f"timed out after {timeout:g}s")
+
+
+def _plan_tasks(paths: Iterable[Path], options: RunOptions) -> list[tuple[Path, Path | None]]:
     out_dir_resolved = None
     if options.out_dir is not None:
         out_dir_resolved = options.out_dir.resolve()
 
     tasks: list[tuple[Path, Path | None]] = []
+    shard_keys: list[str] = []
     for root in paths:
         root = root.expanduser()
         for src in _iter_files(root, recursive=options.recursive):
@@ -61,19 +314,354 @@ def scrub_paths(paths: Iterable[Path], options: RunOptions) -> list[ScrubResult]
                 dst = _map_output_path(src, root, options.out_dir)
                 tasks.append((src, dst))
 
-    results: list[ScrubResult] = []
-    for (src, dst) in tasks:
-        results.append(
-            _scrub_one(
-                src,
-                dst,
-                scrubbers=scrubbers,
-                scrubber_options=scrubber_opts,
-                options=options,
-            )
+            if options.shard is not None:
+                # Same relative layout as the output tree: independent of the mount point.
+                shard_keys.append(_map_output_path(src, root, Path()).as_posix())
+
+    if options.shard is not None:
+        index, count = options.shard
+        sizes = [_size_or_zero(src) for src, _dst in tasks] if options.shard_by_size else None
+        assignment = assign_shards(shard_keys, count, sizes=sizes)
+        tasks = [t for t, shard in zip(tasks, assignment) if shard == index]
+
+    return tasks
+
+
+def _scrubber_options(options: RunOptions) -> ScrubOptions:
+    return ScrubOptions(
+        normalize_zip_timestamps=options.normalize_zip_timestamps,
+        pdf_aggressive=options.pdf_aggressive,
+        pdf_compact=options.pdf_compact,
+        openxml_media=options.openxml_media,
+        openxml_authors=options.openxml_authors,
+        zip_compression=options.zip_compression,
+        zip_level=options.zip_level,
+        tool_timeout=options.file_timeout,
+        max_pixels=options.max_pixels,
+        zip_max_total=options.zip_max_total,
+        zip_max_ratio=options.zip_max_ratio,
+        pdf_max_objects=options.pdf_max_objects,
+        pdf_max_stream=options.pdf_max_stream,
+    )
+
+
+def _run_scheduled(
+    jobs: list[tuple[int, Path, Path | None, RunOptions]],
+    *,
+    scrubbers,
+    scrubber_options: ScrubOptions,
+    options: RunOptions,
+    on_result: Callable[[int, ScrubResult], None],
+    stats: RunStats,
+    commit: GroupCommit | None = None,
+) -> None:
+    """Run tasks on two pools, largest files first (LPT ordering).
+
+    Jobs arrive already sorted when ``options.order`` is set, and then keep
+    that order instead.
+
+    Video scrubbing is an ffmpeg subprocess, so it goes to a thread pool with
+    its own cap (``video_jobs``), together with unsupported files that are at
+    most copied. Every other scrubber is CPU-bound Python (Pillow, pypdf,
+    zlib) and runs on a process pool of ``jobs`` workers.
+
+    With ``max_memory`` set, work is only admitted while the summed per-file
+    estimates (``Scrubber.estimate_memory``) of running tasks fit the budget.
+
+    With ``prefetch_depth``/``drop_behind``, a ReadAhead pipeline warms the
+    page cache for upcoming files and evicts finished inputs. Files staged
+    by workers for batched durability are committed here, through ``commit``.
+    """
+    if not jobs:
+        return
+
+    budget = options.max_memory
+    workers = {"cpu": options.jobs, "io": options.video_jobs}
+    queues: dict[str, deque[_Job]] = {"cpu": deque(), "io": deque()}
+
+    # Starting the biggest files first keeps one huge file from dominating the makespan.
+    planned = []
+    for i, src, dst, task_options in jobs:
+        scrubber = _pick_scrubber(src, scrubbers)
+        pool = _pool_for(scrubber)
+        cost = _estimate_memory(scrubber, src) if budget is not None else 0
+        planned.append(_Job(i, src, dst, task_options, pool, _size_or_zero(src), cost))
+    if options.order is None:
+        planned.sort(key=lambda job: job.size, reverse=True)
+    rank = {job.index: r for r, job in enumerate(planned)}
+    for job in planned:
+        queues[job.pool].append(job)
+    # Dispatch interleaves the two queues by rank, so this is roughly the start order.
+    read_ahead = _read_ahead([job.src for job in planned], options)
+
+    busy = {"cpu": 0.0, "io": 0.0}
+    queued = {"cpu": 0, "io": 0}
+    futures: dict[Future, _Job] = {}
+    in_flight = 0
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=options.video_jobs) as io_pool, _cpu_pool(options) as cpu_pool:
+            executors = {"cpu": cpu_pool, "io": io_pool}
+            running: set[Future] = set()
+            while queues["cpu"] or queues["io"] or running:
+                # Keep each pool a little ahead of its workers, taking the
+                # earliest-ranked head-of-queue job first. A job larger than the whole memory
+                # budget still runs, but only on its own.
+                while True:
+                    ready = [p for p in ("cpu", "io") if queues[p] and queued[p] < 2 * workers[p]]
+                    if not ready:
+                        break
+                    pool = min(ready, key=lambda p: rank[queues[p][0].index])
+                    job = queues[pool][0]
+                    if budget is not None and running and in_flight + job.cost > budget:
+                        break
+
+                    queues[pool].popleft()
+                    if read_ahead is not None:
+                        read_ahead.advance()
+                    fut = executors[pool].submit(_timed_scrub_one, job.src, job.dst, scrubber_options, job.options)
+                    futures[fut] = job
+                    running.add(fut)
+                    queued[pool] += 1
+                    in_flight += job.cost
+                    stats.peak_estimated_memory = max(stats.peak_estimated_memory, in_flight)
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    job = futures.pop(fut)
+                    queued[job.pool] -= 1
+                    in_flight -= job.cost
+                    try:
+                        result, elapsed, staged = fut.result()
+                        _adopt(commit, staged)
+                    except CallTimeout as e:
+                        result, elapsed = _timed_out(job.src, job.dst, job.options, e.timeout), e.timeout
+                    except Exception as e:  # noqa: BLE001
+                        # For example a worker process that died (BrokenProcessPool).
+                        result, elapsed = ScrubResult(src=job.src, dst=job.dst, status=ScrubStatus.ERROR, message=str(e)), 0.0
+                    busy[job.pool] += elapsed
+                    if read_ahead is not None:
+                        read_ahead.compute(elapsed)
+                        _drop_input(read_ahead, job.src, job.options)
+                    on_result(job.index, result)
+    finally:
+        if read_ahead is not None:
+            stats.stage_utilization.update(read_ahead.close(workers=options.jobs + options.video_jobs))
+    wall = max(time.perf_counter() - started, 1e-9)
+
+    for pool in ("cpu", "io"):
+        stats.pool_utilization[pool] = min(busy[pool] / (wall * workers[pool]), 1.0)
+
+
+def _adopt(commit: GroupCommit | None, staged: list[Staged]) -> None:
+    if commit is not None:
+        commit.add(staged)
+    elif staged:
+        # Nothing to batch with (e.g. the asyncio API): commit right away.
+        own = GroupCommit()
+        own.add(staged)
+        own.flush()
+
+
+def _read_ahead(paths: list[Path], options: RunOptions) -> ReadAhead | None:
+    if not paths or (options.prefetch_depth <= 0 and not options.drop_behind):
+        return None
+    return ReadAhead(
+        paths,
+        depth=options.prefetch_depth,
+        drop_behind=options.drop_behind,
+        behind_depth=options.drop_behind_depth,
+    )
+
+
+def _drop_input(read_ahead: ReadAhead, src: Path, options: RunOptions) -> None:
+    # In place, src is now the freshly written output; only inputs are evicted.
+    if not options.in_place:
+        read_ahead.done(src)
+
+
+def _pool_for(scrubber) -> str:
+    # ffmpeg and plain copies mostly wait on I/O; everything else is Python on the CPU.
+    return "io" if scrubber is None or isinstance(scrubber, VideoScrubber) else "cpu"
+
+
+def _cpu_pool(options: RunOptions) -> ProcessPoolExecutor | WatchdogPool:
+    if options.file_timeout is not None:
+        # Killing a ProcessPoolExecutor worker breaks the whole pool.
+        return WatchdogPool(options.jobs, options.file_timeout)
+    return ProcessPoolExecutor(max_workers=options.jobs, mp_context=multiprocessing.get_context("spawn"))
+
+
+@dataclass(frozen=True)
+class _Job:
+    index: int
+    src: Path
+    dst: Path | None
+    options: RunOptions
+    pool: str
+    size: int
+    cost: int
+
+
+def _estimate_memory(scrubber, src: Path) -> int:
+    if scrubber is None:
+        # Unsupported files are at most copied in small chunks.
+        return 0
+    try:
+        return scrubber.estimate_memory(src)
+    except Exception:  # noqa: BLE001
+        return _size_or_zero(src)
+
+
+def _timed_scrub_one(
+    src: Path,
+    dst: Path | None,
+    scrubber_options: ScrubOptions,
+    options: RunOptions,
+) -> tuple[ScrubResult, float, list[Staged]]:
+    # Runs inside pool workers, so it builds (and caches) its own scrubbers.
+    # With batched durability the caller commits what was staged here,
+    # together with other workers' files.
+    started = time.perf_counter()
+    commit = GroupCommit() if options.durability == "batch" else None
+    result = _scrub_one(
+        src,
+        dst,
+        scrubbers=_worker_scrubbers(),
+        scrubber_options=scrubber_options,
+        options=options,
+        commit=commit,
+    )
+    return result, time.perf_counter() - started, commit.take() if commit is not None else []
+
+
+@lru_cache(maxsize=1)
+def _worker_scrubbers():
+    return default_scrubbers()
+
+
+def _size_or_zero(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _planned_info(src: Path, options: RunOptions) -> dict[str, Any]:
+    st = src.stat()
+    info: dict[str, Any] = {"mode": st.st_mode, "atime_ns": st.st_atime_ns, "mtime_ns": st.st_mtime_ns}
+    if options.in_place and options.backup_suffix:
+        # A backup that predates this run is not ours to roll back from.
+        info["backup_preexisting"] = src.with_name(src.name + options.backup_suffix).exists()
+    return info
+
+
+def _resume_task(
+    src: Path,
+    dst: Path | None,
+    entry: dict[str, Any],
+    *,
+    scrubbers,
+    options: RunOptions,
+) -> ScrubResult | None:
+    """Settle a task seen by an earlier, interrupted run.
+
+    Returns a result if nothing is left to do, or None if the task must be
+    (re)scrubbed; half-finished in-place files are rolled back first.
+    """
+    state = entry.get("state")
+    if state == JournalState.STAT_RESTORED.value:
+        return ScrubResult(src=src, dst=dst, status=ScrubStatus.SKIPPED_DONE)
+
+    if not options.in_place:
+        # Copy mode never touches the input; the output is written atomically.
+        return None
+
+    if state == JournalState.SCRUBBED.value:
+        # The scrubbed file is in place; only the mode/times restore is missing.
+        _restore_journaled_stat(src, entry, options)
+        scrubber = _pick_scrubber(src, scrubbers)
+        removed = strip_xattrs(src) if options.strip_xattrs else ()
+        return ScrubResult(
+            src=src,
+            dst=src,
+            status=ScrubStatus.SCRUBBED,
+            scrubber=getattr(scrubber, "name", None),
+            removed_xattrs=removed,
+            message="resumed after interruption",
         )
 
-    return results
+    if options.backup_suffix and not entry.get("backup_preexisting"):
+        backup = src.with_name(src.name + options.backup_suffix)
+        if backup.exists():
+            # Journal writes are batched, so the file may or may not have been
+            # replaced already. Backups are written atomically, so put the
+            # original bytes back and start this file over.
+            with TempPath(src) as tmp:
+                copy_bytes(backup, tmp)
+                atomic_replace(tmp, src, durable=options.durability != "none")
+            _restore_journaled_stat(src, entry, options)
+            backup.unlink()
+
+    return None
+
+
+def _restore_journaled_stat(src: Path, entry: dict[str, Any], options: RunOptions) -> None:
+    if options.preserve_perms and "mode" in entry:
+        os.chmod(src, entry["mode"])
+    if options.preserve_times and "mtime_ns" in entry:
+        os.utime(src, ns=(entry["atime_ns"], entry["mtime_ns"]))
+
+
+# Results whose output can stand in for an identical input.
+_REUSABLE = {ScrubStatus.SCRUBBED, ScrubStatus.ALREADY_CLEAN}
+
+
+def _materialize_duplicate(
+    src: Path,
+    dst: Path,
+    leader: ScrubResult,
+    *,
+    options: RunOptions,
+    stats: RunStats,
+    commit: GroupCommit | None = None,
+) -> ScrubResult:
+    if dst.exists() and not options.overwrite:
+        return ScrubResult(src=src, dst=dst, status=ScrubStatus.SKIPPED_EXISTS, scrubber=leader.scrubber)
+
+    # Always link against the leader's *output*, never an input: a link to an
+    # input would expose unscrubbed bytes (or get rewritten by a later in-place run).
+    assert leader.dst is not None
+    try:
+        linked = False
+        if options.dedup_hardlinks:
+            try:
+                # Hardlinked duplicates share the leader's inode, so mode/times are the leader's.
+                link_replace(leader.dst, dst)
+                removed = strip_xattrs(dst) if options.strip_xattrs else ()
+                linked = True
+            except OSError:
+                # Cross-device or no hardlink support: fall back to a reflink/copy.
+                pass
+
+        if not linked:
+            with TempPath(dst) as tmp:
+                clone_or_copy(leader.dst, tmp)
+                removed = _finish_output(src.stat(), tmp, dst, options=options, commit=commit)
+    except Exception as e:  # noqa: BLE001
+        return ScrubResult(src=src, dst=dst, status=ScrubStatus.ERROR, scrubber=leader.scrubber, message=str(e))
+
+    stats.dedup_files += 1
+    stats.dedup_bytes_saved += src.stat().st_size
+    return ScrubResult(
+        src=src,
+        dst=dst,
+        status=ScrubStatus.DEDUPLICATED,
+        scrubber=leader.scrubber,
+        removed_xattrs=removed,
+        message=f"identical to {leader.src}",
+    )
 
 
 def _iter_files(root: Path, *, recursive: bool) -> Iterable[Path]:
@@ -132,6 +720,8 @@ def _scrub_one(
     scrubbers,
     scrubber_options: ScrubOptions,
     options: RunOptions,
+    journal: Journal | None = None,
+    commit: GroupCommit | None = None,
 ) -> ScrubResult:
     if not src.is_file():
         return ScrubResult(src=src, dst=dst, status=ScrubStatus.SKIPPED_NOT_A_FILE)
@@ -147,10 +737,8 @@ def _scrub_one(
 
             with TempPath(dst) as tmp:
                 copy_bytes(src, tmp)
-                atomic_replace(tmp, dst)
+                removed = _finish_output(src.stat(), tmp, dst, options=options, commit=commit)
 
-            preserve_stat(src, dst, preserve_times=options.preserve_times, preserve_perms=options.preserve_perms)
-            removed = strip_xattrs(dst) if options.strip_xattrs else ()
             return ScrubResult(
                 src=src,
                 dst=dst,
@@ -174,6 +762,12 @@ def _scrub_one(
     src_stat = src.stat()
 
     try:
+        # Headers only: reject bombs before the clean check or a backup reads them.
+        scrubber.check_limits(src, options=scrubber_options)
+
+        if options.skip_clean and _is_already_clean(src, scrubber, options=options):
+            return _emit_already_clean(src, dst, scrubber=scrubber, options=options, commit=commit)
+
         if options.in_place:
             # Optional backup.
             if options.backup_suffix:
@@ -186,30 +780,56 @@ def _scrub_one(
                         scrubber=scrubber.name,
                         message=f"backup exists: {backup}",
                     )
-                copy_bytes(src, backup)
-
+                # Write the backup atomically so a partial backup never exists.
+                # With batched durability it's committed ahead of the scrubbed file.
+                with TempPath(backup) as tmp:
+                    copy_bytes(src, tmp)
+                    _replace(tmp, backup, options=options, commit=commit, early=True)
+                if journal is not None:
+                    journal.record(src, JournalState.BACKED_UP)
+
+            # Mode/times are restored from the stat taken before reading src.
             with TempPath(src) as tmp:
-                scrubber.scrub(src, tmp, options=scrubber_options)
-                atomic_replace(tmp, src)
-
-            # Restore mode/times if requested.
-            if options.preserve_perms:
-                os.chmod(src, src_stat.st_mode)
-            if options.preserve_times:
-                os.utime(src, (src_stat.st_atime, src_stat.st_mtime))
+                note = scrubber.scrub(src, tmp, options=scrubber_options)
+                removed = _finish_output(src_stat, tmp, src, options=options, commit=commit)
+            if journal is not None:
+                journal.record(src, JournalState.SCRUBBED)
 
-            removed = strip_xattrs(src) if options.strip_xattrs else ()
-            return ScrubResult(src=src, dst=src, status=ScrubStatus.SCRUBBED, scrubber=scrubber.name, removed_xattrs=removed)
+            return ScrubResult(
+                src=src,
+                dst=src,
+                status=ScrubStatus.SCRUBBED,
+                scrubber=scrubber.name,
+                message=note,
+                removed_xattrs=removed,
+            )
 
         # Copy mode
         with TempPath(dst) as tmp:
-            scrubber.scrub(src, tmp, options=scrubber_options)
-            atomic_replace(tmp, dst)
+            note = scrubber.scrub(src, tmp, options=scrubber_options)
+            removed = _finish_output(src.stat(), tmp, dst, options=options, commit=commit)
+        if journal is not None:
+            journal.record(src, JournalState.SCRUBBED)
 
-        preserve_stat(src, dst, preserve_times=options.preserve_times, preserve_perms=options.preserve_perms)
-        removed = strip_xattrs(dst) if options.strip_xattrs else ()
-        return ScrubResult(src=src, dst=dst, status=ScrubStatus.SCRUBBED, scrubber=scrubber.name, removed_xattrs=removed)
+        return ScrubResult(
+            src=src,
+            dst=dst,
+            status=ScrubStatus.SCRUBBED,
+            scrubber=scrubber.name,
+            message=note,
+            removed_xattrs=removed,
+        )
 
+    except ResourceLimitExceeded as e:
+        return ScrubResult(src=src, dst=dst, status=ScrubStatus.REJECTED, scrubber=scrubber.name, message=str(e))
+    except subprocess.TimeoutExpired as e:
+        return ScrubResult(
+            src=src,
+            dst=dst,
+            status=ScrubStatus.TIMEOUT,
+            scrubber=scrubber.name,
+            message=f"timed out after {e.timeout:g}s",
+        )
     except Exception as e:  # noqa: BLE001
         return ScrubResult(
             src=src,
@@ -218,3 +838,83 @@ def _scrub_one(
             scrubber=getattr(scrubber, "name", None),
             message=str(e),
         )
+
+
+def _finish_output(
+    src_stat: os.stat_result,
+    tmp: Path,
+    dst: Path,
+    *,
+    options: RunOptions,
+    commit: GroupCommit | None,
+) -> tuple[str, ...]:
+    """Give tmp the input's mode/times, strip its xattrs and move it over dst.
+
+    All of it happens before the rename, so a file staged for batched
+    durability is already final when it lands. Returns the removed xattrs.
+    """
+    if options.preserve_perms:
+        os.chmod(tmp, src_stat.st_mode)
+    if options.preserve_times:
+        os.utime(tmp, (src_stat.st_atime, src_stat.st_mtime))
+    removed = strip_xattrs(tmp) if options.strip_xattrs else ()
+    _replace(tmp, dst, options=options, commit=commit)
+    return removed
+
+
+def _replace(tmp: Path, dst: Path, *, options: RunOptions, commit: GroupCommit | None, early: bool = False) -> None:
+    if commit is not None:
+        commit.stage(tmp, dst, early=early)
+    else:
+        # Batch mode with no group to join (a single file) is the same as strict.
+        atomic_replace(tmp, dst, durable=options.durability != "none")
+
+
+def _is_already_clean(src: Path, scrubber, *, options: RunOptions) -> bool:
+    # The verify probes don't look at the extra structures removed by
+    # --pdf-aggressive, so a "clean" verdict doesn't cover that mode.
+    if options.pdf_aggressive and scrubber.name == "pdf":
+        return False
+    # Nor at author names and revision ids inside the document parts. The
+    # pre-scan is deliberately broad: a false hit only costs a rescrub.
+    if options.openxml_authors != "keep" and scrubber.name == "openxml" and package_mentions_authors(src):
+        return False
+
+    result = verify_file(src, options=VerifyOptions(recursive=False, show_values=False))
+    # Embedded video, audio or packages would be scrubbed, but the probe can't vouch for them.
+    if options.openxml_media and result.details.get("media_unchecked"):
+        return False
+    return result.status == VerifyStatus.CLEAN
+
+
+def _emit_already_clean(
+    src: Path,
+    dst: Path,
+    *,
+    scrubber,
+    options: RunOptions,
+    commit: GroupCommit | None = None,
+) -> ScrubResult:
+    if options.in_place:
+        # Nothing to rewrite; leave the file (and its stat) untouched.
+        removed = strip_xattrs(src) if options.strip_xattrs else ()
+        return ScrubResult(
+            src=src,
+            dst=src,
+            status=ScrubStatus.ALREADY_CLEAN,
+            scrubber=scrubber.name,
+            removed_xattrs=removed,
+        )
+
+    with TempPath(dst) as tmp:
+        clone_or_copy(src, tmp)
+        removed = _finish_output(src.stat(), tmp, dst, options=options, commit=commit)
+
+    return ScrubResult(
+        src=src,
+        dst=dst,
+        status=ScrubStatus.ALREADY_CLEAN,
+        scrubber=scrubber.name,
+        removed_xattrs=removed,
+        message="no metadata found; copied as-is",
+    )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from pathlib import Path
+
+_CHUNK = 1024 * 1024
+_HEAD = 64 * 1024
+
+
+def find_duplicates(paths: Sequence[Path], *, kinds: Sequence[str] | None = None) -> dict[int, int]:
+    """Find byte-identical files.
+
+    Returns a mapping of ``index -> leader index`` for every path whose content
+    is identical to an earlier path in ``paths``. Files are bucketed by size
+    first, then by a hash of the first 64 KB, and only then fully hashed, so
+    unique files are usually never read at all.
+
+    With ``kinds``, only files of the same kind (for example the extension,
+    which picks the output encoding) can be duplicates of each other.
+    """
+    by_size: dict[tuple[str, int], list[int]] = {}
+    for i, p in enumerate(paths):
+        try:
+            size = p.stat().st_size
+        except OSError:
+            continue
+        kind = kinds[i] if kinds is not None else ""
+        by_size.setdefault((kind, size), []).append(i)
+
+    leaders: dict[int, int] = {}
+    for (_kind, size), idxs in by_size.items():
+        if len(idxs) < 2:
+            continue
+
+        candidates = [idxs]
+        if size > _HEAD:
+            candidates = _split_by(idxs, lambda i: _digest(paths[i], limit=_HEAD))
+
+        for group in candidates:
+            if len(group) < 2:
+                continue
+            for same in _split_by(group, lambda i: _digest(paths[i])):
+                if len(same) < 2:
+                    continue
+                first = same[0]
+                for i in same[1:]:
+                    leaders[i] = first
+
+    return leaders
+
+
+def _split_by(idxs: list[int], key) -> list[list[int]]:
+    buckets: dict[bytes, list[int]] = {}
+    for i in idxs:
+        try:
+            k = key(i)
+        except OSError:
+            continue
+        buckets.setdefault(k, []).append(i)
+    # Keep input order within and across buckets so the leader is the first path seen.
+    return sorted(buckets.values(), key=lambda b: b[0])
+
+
+def _digest(path: Path, *, limit: int | None = None) -> bytes:
+    h = hashlib.blake2b(digest_size=20)
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            n = _CHUNK if remaining is None else min(_CHUNK, remaining)
+            chunk = f.read(n)
+            if not chunk:
+                break
+            h.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return h.digest()
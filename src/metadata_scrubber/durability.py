@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import secrets
+from pathlib import Path
+
+from .utils import fsync_dir
+
+DURABILITY_MODES = ("none", "batch", "strict")
+
+# (staged temp file, destination, early)
+Staged = tuple[Path, Path, bool]
+
+
+class GroupCommit:
+    """Atomic replaces that are made durable together, a batch at a time.
+
+    Finished temp files are handed over with ``stage`` instead of being
+    renamed into place. ``flush`` then fdatasyncs every staged file, renames
+    them and fsyncs each parent directory once. A power loss leaves either
+    the old file or the complete new one, never a renamed but empty file,
+    at the cost of one directory sync per batch instead of per file.
+
+    Renames staged as ``early`` (in-place backups) are made durable before
+    any other rename in the batch, so a backup is always on disk before the
+    original it protects is replaced.
+    """
+
+    def __init__(self, batch_size: int = 256) -> None:
+        self.batch_size = batch_size
+        self.batches = 0
+        self._pending: list[Staged] = []
+
+    def stage(self, tmp: Path, dst: Path, *, early: bool = False) -> None:
+        # Take the file away from its TempPath, which would delete it on exit.
+        # The name still matches remove_temp_files, so a crash can't strand it.
+        staged = tmp.with_name(f".{dst.name}.{secrets.token_hex(4)}.staged.tmp")
+        os.replace(tmp, staged)
+        self.add([(staged, dst, early)])
+
+    def add(self, entries: list[Staged]) -> None:
+        """Adopt entries staged elsewhere (by a worker process)."""
+        self._pending.extend(entries)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def take(self) -> list[Staged]:
+        """Hand all pending entries to the caller, which must commit them."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def flush(self) -> None:
+        pending = self.take()
+        if not pending:
+            return
+
+        for staged, _dst, _early in pending:
+            fd = os.open(staged, os.O_RDONLY)
+            try:
+                # Data only: the rename is what makes the inode's metadata matter.
+                getattr(os, "fdatasync", os.fsync)(fd)
+            finally:
+                os.close(fd)
+
+        for early in (True, False):
+            parents: dict[Path, None] = {}
+            for staged, dst, is_early in pending:
+                if is_early is early:
+                    os.replace(staged, dst)
+                    parents[dst.parent] = None
+            for parent in parents:
+                fsync_dir(parent)
+        self.batches += 1
+
+    def discard(self) -> None:
+        for staged, _dst, _early in self.take():
+            try:
+                staged.unlink()
+            except OSError:
+                pass
@@ -0,0 +1 @@
+"""Small, dependency-free readers for the byte-level structure of file formats."""
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import io
+from collections.abc import Iterator
+from typing import BinaryIO
+
+# Element IDs (with their length-marker bits, as in the Matroska spec).
+EBML = 0x1A45DFA3
+SEGMENT = 0x18538067
+SEEK_HEAD = 0x114D9B74
+SEEK = 0x4DBB
+SEEK_ID = 0x53AB
+SEEK_POSITION = 0x53AC
+INFO = 0x1549A966
+TITLE = 0x7BA9
+DATE_UTC = 0x4461
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_UID = 0x73C5
+NAME = 0x536E
+LANGUAGE = 0x22B59C
+LANGUAGE_BCP47 = 0x22B59D
+TAGS = 0x1254C367
+TAG = 0x7373
+TARGETS = 0x63C0
+TAG_TRACK_UID = 0x63C5
+TAG_CHAPTER_UID = 0x63C4
+TAG_ATTACHMENT_UID = 0x63C6
+SIMPLE_TAG = 0x67C8
+TAG_NAME = 0x45A3
+CLUSTER = 0x1F43B675
+
+_WANTED = (INFO, TRACKS, TAGS)
+
+# Info, Tracks and Tags are read whole; anything bigger is not a header.
+_MAX_ELEMENT_READ = 4 * 1024 * 1024
+
+_UNKNOWN = -1
+
+
+def probe_tags(f: BinaryIO) -> tuple[list[str], dict[str, list[str]]]:
+    """Return ffprobe-style ``(format_tag_keys, {stream_index: tag_keys})``.
+
+    Reads the Segment's Info, Tracks and Tags elements, locating them
+    through the SeekHead when they sit after the Clusters, so frame data is
+    never read. Raises ValueError for files that aren't Matroska / WebM.
+    """
+    size = f.seek(0, io.SEEK_END)
+    f.seek(0)
+    if _read_id(f) != EBML:
+        raise ValueError("not an EBML file")
+    f.seek(_read_size(f, size), io.SEEK_CUR)
+
+    segment_id = _read_id(f)
+    if segment_id != SEGMENT:
+        raise ValueError("missing Matroska segment")
+    seg_size = _read_size(f, size)
+    seg_start = f.tell()
+    seg_end = size if seg_size == _UNKNOWN else min(size, seg_start + seg_size)
+
+    found: dict[int, bytes] = {}
+    seek_positions: dict[int, int] = {}
+    pos = seg_start
+    while pos < seg_end and len(found) < len(_WANTED):
+        f.seek(pos)
+        eid = _read_id(f)
+        esize = _read_size(f, seg_end - f.tell())
+        body = f.tell()
+
+        if eid == CLUSTER:
+            # Everything we still need is after the frame data; jump to it.
+            for wanted, offset in seek_positions.items():
+                if wanted not in found:
+                    found[wanted] = _read_element(f, seg_start + offset, wanted, seg_end)
+            if seek_positions or esize == _UNKNOWN:
+                break
+        elif esize == _UNKNOWN:
+            raise ValueError(f"unknown-size element {eid:#x} at offset {pos}")
+        elif eid in _WANTED and eid not in found:
+            found[eid] = _read_body(f, esize)
+        elif eid == SEEK_HEAD:
+            seek_positions.update(_seek_entries(_read_body(f, esize)))
+
+        if esize == _UNKNOWN:
+            break
+        pos = body + esize
+
+    fmt: set[str] = set()
+    streams: dict[str, set[str]] = {}
+    track_index: dict[int, str] = {}
+
+    info = found.get(INFO, b"")
+    for eid, _, _ in _children(info, 0, len(info)):
+        if eid == TITLE:
+            fmt.add("title")
+        elif eid == DATE_UTC:
+            fmt.add("creation_time")
+
+    tracks = found.get(TRACKS, b"")
+    entries = [(s, e) for eid, s, e in _children(tracks, 0, len(tracks)) if eid == TRACK_ENTRY]
+    for index, (start, end) in enumerate(entries):
+        keys = streams.setdefault(str(index), set())
+        language = None
+        for cid, cstart, cend in _children(tracks, start, end):
+            if cid == TRACK_UID:
+                track_index[_uint(tracks[cstart:cend])] = str(index)
+            elif cid == NAME:
+                keys.add("title")
+            elif cid in (LANGUAGE, LANGUAGE_BCP47):
+                language = tracks[cstart:cend].rstrip(b"\x00")
+        # Matroska's default language is "eng"; ffprobe only hides "und".
+        if language != b"und":
+            keys.add("language")
+
+    tags = found.get(TAGS, b"")
+    for eid, start, end in _children(tags, 0, len(tags)):
+        if eid != TAG:
+            continue
+        target_tracks: list[int] = []
+        other_target = False
+        names: list[str] = []
+        for cid, cstart, cend in _children(tags, start, end):
+            if cid == TARGETS:
+                for tid, tstart, tend in _children(tags, cstart, cend):
+                    if tid == TAG_TRACK_UID:
+                        target_tracks.append(_uint(tags[tstart:tend]))
+                    elif tid in (TAG_CHAPTER_UID, TAG_ATTACHMENT_UID):
+                        other_target = True
+            elif cid == SIMPLE_TAG:
+                names.extend(_simple_tag_names(tags, cstart, cend, ""))
+
+        if target_tracks:
+            for uid in target_tracks:
+                if uid in track_index:
+                    streams[track_index[uid]].update(names)
+        elif not other_target:
+            fmt.update(names)
+
+    return sorted(fmt), {k: sorted(v) for k, v in streams.items() if v}
+
+
+def _simple_tag_names(data: bytes, start: int, end: int, prefix: str) -> list[str]:
+    # Nested SimpleTags are reported as "PARENT/CHILD".
+    name = ""
+    nested: list[tuple[int, int]] = []
+    for eid, cstart, cend in _children(data, start, end):
+        if eid == TAG_NAME:
+            name = data[cstart:cend].rstrip(b"\x00").decode("utf-8", errors="replace")
+        elif eid == SIMPLE_TAG:
+            nested.append((cstart, cend))
+    key = f"{prefix}/{name}" if prefix else name
+    names = [key] if name else []
+    for cstart, cend in nested:
+        names.extend(_simple_tag_names(data, cstart, cend, key))
+    return names
+
+
+def _seek_entries(data: bytes) -> dict[int, int]:
+    entries: dict[int, int] = {}
+    for eid, start, end in _children(data, 0, len(data)):
+        if eid != SEEK:
+            continue
+        target = position = None
+        for cid, cstart, cend in _children(data, start, end):
+            if cid == SEEK_ID:
+                target = _uint(data[cstart:cend])
+            elif cid == SEEK_POSITION:
+                position = _uint(data[cstart:cend])
+        # A file may have several Tags elements; the first one listed wins.
+        if target in _WANTED and position is not None:
+            entries.setdefault(target, position)
+    return entries
+
+
+def _read_element(f: BinaryIO, pos: int, expected: int, limit: int) -> bytes:
+    f.seek(pos)
+    if _read_id(f) != expected:
+        raise ValueError(f"SeekHead entry for {expected:#x} points at the wrong element")
+    size = _read_size(f, limit - f.tell())
+    if size == _UNKNOWN:
+        raise ValueError(f"unknown-size element {expected:#x} at offset {pos}")
+    return _read_body(f, size)
+
+
+def _read_body(f: BinaryIO, size: int) -> bytes:
+    if size > _MAX_ELEMENT_READ:
+        raise ValueError("Matroska header element too large")
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("truncated Matroska element")
+    return data
+
+
+def _read_id(f: BinaryIO) -> int:
+    first = f.read(1)
+    if not first:
+        raise ValueError("truncated EBML element")
+    length = _vint_length(first[0], 4)
+    rest = f.read(length - 1)
+    if len(rest) != length - 1:
+        raise ValueError("truncated EBML element")
+    return int.from_bytes(first + rest, "big")
+
+
+def _read_size(f: BinaryIO, remaining: int) -> int:
+    first = f.read(1)
+    if not first:
+        raise ValueError("truncated EBML element")
+    length = _vint_length(first[0], 8)
+    rest = f.read(length - 1)
+    if len(rest) != length - 1:
+        raise ValueError("truncated EBML element")
+    value = int.from_bytes(bytes([first[0] & (0xFF >> length)]) + rest, "big")
+    if value == (1 << (7 * length)) - 1:
+        return _UNKNOWN
+    if value > remaining:
+        raise ValueError("EBML element runs past its parent")
+    return value
+
+
+def _vint_length(first: int, max_length: int) -> int:
+    for length in range(1, max_length + 1):
+        if first & (0x80 >> (length - 1)):
+            return length
+    raise ValueError("invalid EBML variable-length integer")
+
+
+def _children(data: bytes, start: int, end: int) -> Iterator[tuple[int, int, int]]:
+    """Yield ``(id, body_start, body_end)`` for elements in data[start:end]."""
+    pos = start
+    while pos < end:
+        id_len = _vint_length(data[pos], 4)
+        eid = int.from_bytes(data[pos : pos + id_len], "big")
+        pos += id_len
+        if pos >= end:
+            raise ValueError("truncated EBML element")
+        size_len = _vint_length(data[pos], 8)
+        raw = bytes([data[pos] & (0xFF >> size_len)]) + data[pos + 1 : pos + size_len]
+        size = int.from_bytes(raw, "big")
+        pos += size_len
+        if size == (1 << (7 * size_len)) - 1:
+            # Unknown size inside a header element: it runs to the parent's end.
+            size = end - pos
+        if pos + size > end:
+            raise ValueError("EBML element runs past its parent")
+        yield eid, pos, pos + size
+        pos += size
+
+
+def _uint(data: bytes) -> int:
+    return int.from_bytes(data, "big")
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import io
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+from . import jpeg
+
+# Hard cap on header bytes read per file. Chunk and segment bodies are
+# skipped with seeks, so only headers and short identifiers count.
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+
+class HeaderLimitExceeded(ValueError):
+    pass
+
+
+@dataclass
+class HeaderScan:
+    """Metadata blocks found by walking an image's container structure."""
+
+    format: str
+    blocks: list[str] = field(default_factory=list)
+    bytes_read: int = 0
+
+
+def scan_image_headers(f: BinaryIO, *, max_bytes: int = DEFAULT_MAX_BYTES) -> HeaderScan:
+    """Find metadata blocks in a JPEG, PNG, WebP or TIFF without decoding it.
+
+    Only structural headers and block identifiers are read; everything else
+    is seeked over. Raises HeaderLimitExceeded when more than max_bytes would
+    have to be read, and ValueError for unknown or malformed files.
+    """
+    r = _CappedReader(f, max_bytes)
+    magic = r.read(12)
+    r.seek(0)
+
+    if magic.startswith(jpeg.SOI):
+        scan = HeaderScan("jpeg", _scan_jpeg(r))
+    elif magic.startswith(b"\x89PNG\r\n\x1a\n"):
+        scan = HeaderScan("png", _scan_png(r))
+    elif magic[:4] == b"RIFF" and magic[8:12] == b"WEBP":
+        scan = HeaderScan("webp", _scan_webp(r))
+    elif magic[:4] in (b"II*\x00", b"MM\x00*"):
+        scan = HeaderScan("tiff", _scan_tiff(r))
+    else:
+        raise ValueError("unrecognized image format")
+
+    scan.blocks = sorted(set(scan.blocks))
+    scan.bytes_read = r.bytes_read
+    return scan
+
+
+class _CappedReader:
+    def __init__(self, f: BinaryIO, max_bytes: int) -> None:
+        self._f = f
+        self._max = max_bytes
+        self.bytes_read = 0
+
+    def read(self, n: int) -> bytes:
+        if self.bytes_read + n > self._max:
+            raise HeaderLimitExceeded(f"metadata headers exceed the {self._max} byte read cap")
+        data = self._f.read(n)
+        self.bytes_read += len(data)
+        return data
+
+    def read_exact(self, n: int) -> bytes:
+        data = self.read(n)
+        if len(data) != n:
+            raise ValueError("truncated image header")
+        return data
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        return self._f.seek(pos, whence)
+
+    def tell(self) -> int:
+        return self._f.tell()
+
+
+# APPn identifiers worth naming; other metadata segments are reported as "appN".
+_JPEG_APP_IDS = (
+    (0xE1, b"Exif\x00", "exif"),
+    (0xE1, b"http://ns.adobe.com/xap/1.0/", "xmp"),
+    (0xE1, b"http://ns.adobe.com/xmp/extension/", "xmp"),
+    (0xE2, b"ICC_PROFILE\x00", "icc_profile"),
+    (0xED, b"Photoshop 3.0\x00", "iptc"),
+)
+
+
+def _scan_jpeg(r: _CappedReader) -> list[str]:
+    blocks: list[str] = []
+    r.read_exact(2)
+    while True:
+        b = r.read_exact(1)
+        if b != b"\xff":
+            raise ValueError(f"expected JPEG marker at offset {r.tell() - 1}")
+        marker = 0xFF
+        while marker == 0xFF:
+            marker = r.read_exact(1)[0]
+
+        if marker == jpeg.EOI or marker == jpeg.SOS:
+            # Metadata segments all come before the scan data.
+            return blocks
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            continue
+
+        length = int.from_bytes(r.read_exact(2), "big")
+        if length < 2:
+            raise ValueError("bad JPEG segment length")
+        body_start = r.tell()
+
+        if jpeg.is_metadata_segment(marker):
+            if marker == jpeg.COM:
+                blocks.append("comment")
+            else:
+                head = r.read(min(length - 2, 40))
+                for app, ident, name in _JPEG_APP_IDS:
+                    if marker == app and head.startswith(ident):
+                        blocks.append(name)
+                        break
+                else:
+                    blocks.append(f"app{marker - 0xE0}")
+
+        r.seek(body_start + length - 2)
+
+
+_PNG_METADATA_CHUNKS = {
+    b"tEXt": "text",
+    b"zTXt": "text",
+    b"iTXt": "text",
+    b"eXIf": "exif",
+    b"iCCP": "icc_profile",
+    b"tIME": "time",
+}
+
+
+def _scan_png(r: _CappedReader) -> list[str]:
+    blocks: list[str] = []
+    r.seek(8)
+    while True:
+        header = r.read(8)
+        if len(header) < 8:
+            # Missing IEND: still report what was found.
+            return blocks
+        length, ctype = struct.unpack(">I4s", header)
+        if ctype == b"IEND":
+            return blocks
+        if ctype in _PNG_METADATA_CHUNKS:
+            blocks.append(_PNG_METADATA_CHUNKS[ctype])
+        # Text chunks can follow the image data, so walk to the end.
+        r.seek(length + 4, io.SEEK_CUR)
+
+
+_WEBP_METADATA_CHUNKS = {b"EXIF": "exif", b"XMP ": "xmp", b"ICCP": "icc_profile"}
+
+
+def _scan_webp(r: _CappedReader) -> list[str]:
+    blocks: list[str] = []
+    riff_size = struct.unpack("<I", r.read_exact(12)[4:8])[0]
+    end = 8 + riff_size
+    pos = 12
+    while pos + 8 <= end:
+        r.seek(pos)
+        header = r.read(8)
+        if len(header) < 8:
+            break
+        ctype, size = struct.unpack("<4sI", header)
+        if ctype in _WEBP_METADATA_CHUNKS:
+            blocks.append(_WEBP_METADATA_CHUNKS[ctype])
+        # Chunks are padded to an even size.
+        pos += 8 + size + (size & 1)
+    return blocks
+
+
+# Tags that describe the file's origin rather than its pixels.
+_TIFF_METADATA_TAGS = {
+    269: "document_name",
+    270: "description",
+    271: "make",
+    272: "model",
+    285: "page_name",
+    305: "software",
+    306: "datetime",
+    315: "artist",
+    316: "host_computer",
+    700: "xmp",
+    33432: "copyright",
+    33723: "iptc",
+    34377: "photoshop",
+    34665: "exif",
+    34675: "icc_profile",
+    34853: "gps",
+}
+
+_TIFF_MAX_IFDS = 1024
+
+
+def _scan_tiff(r: _CappedReader) -> list[str]:
+    blocks: list[str] = []
+    head = r.read_exact(8)
+    bo = "<" if head[:2] == b"II" else ">"
+    offset = struct.unpack(bo + "I", head[4:8])[0]
+
+    seen: set[int] = set()
+    while offset and offset not in seen and len(seen) < _TIFF_MAX_IFDS:
+        seen.add(offset)
+        r.seek(offset)
+        (count,) = struct.unpack(bo + "H", r.read_exact(2))
+        entries = r.read_exact(12 * count)
+        for i in range(count):
+            (tag,) = struct.unpack_from(bo + "H", entries, 12 * i)
+            if tag in _TIFF_METADATA_TAGS:
+                blocks.append(_TIFF_METADATA_TAGS[tag])
+        (offset,) = struct.unpack(bo + "I", r.read_exact(4))
+    return blocks
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import io
+import struct
+from collections.abc import Iterator
+from typing import BinaryIO
+
+# Tag names as ffprobe reports them for QuickTime/iTunes-style items.
+_ITEM_NAMES = {
+    b"\xa9nam": "title",
+    b"\xa9ART": "artist",
+    b"aART": "album_artist",
+    b"\xa9alb": "album",
+    b"\xa9cmt": "comment",
+    b"\xa9inf": "comment",
+    b"\xa9day": "date",
+    b"\xa9too": "encoder",
+    b"\xa9swr": "encoder",
+    b"\xa9enc": "encoder",
+    b"\xa9gen": "genre",
+    b"gnre": "genre",
+    b"\xa9wrt": "composer",
+    b"\xa9dir": "director",
+    b"\xa9prd": "producer",
+    b"cprt": "copyright",
+    b"\xa9cpy": "copyright",
+    b"desc": "description",
+    b"ldes": "synopsis",
+    b"\xa9lyr": "lyrics",
+    b"\xa9grp": "grouping",
+    b"\xa9key": "keywords",
+    b"trkn": "track",
+    b"disk": "disc",
+    b"tvsh": "show",
+    b"tven": "episode_id",
+    b"tvnn": "network",
+    b"\xa9xyz": "location",
+    b"\xa9mak": "make",
+    b"\xa9mod": "model",
+    b"XMP_": "xmp",
+}
+
+# Boxes that never hold metadata and can be large; always skipped.
+_PAYLOAD = {
+    b"mdat", b"free", b"skip", b"wide", b"minf",
+    b"stbl", b"edts", b"moof", b"mfra", b"sidx",
+}
+
+# XMP stored as a top-level uuid box.
+_XMP_UUID = bytes.fromhex("be7acfcb97a942e89c71999491e3afac")
+
+# Reads are for headers and small metadata boxes only.
+_MAX_BOX_READ = 1024 * 1024
+
+
+def probe_tags(f: BinaryIO) -> tuple[list[str], dict[str, list[str]]]:
+    """Return ffprobe-style ``(format_tag_keys, {stream_index: tag_keys})``.
+
+    Walks box headers, seeking over media data (mdat) and sample tables,
+    and reads only ftyp, mvhd, track headers and udta/meta boxes. Raises
+    ValueError for files that aren't ISO-BMFF / QuickTime.
+    """
+    size = f.seek(0, io.SEEK_END)
+    fmt: set[str] = set()
+    streams: dict[str, list[str]] = {}
+    track_index = 0
+    seen_ftyp = seen_moov = False
+
+    for btype, start, end in _iter_boxes(f, 0, size):
+        if btype == b"ftyp":
+            seen_ftyp = True
+            fmt.update(("major_brand", "minor_version", "compatible_brands"))
+        elif btype == b"moov":
+            seen_moov = True
+            for ctype, cstart, cend in _iter_boxes(f, start, end):
+                if ctype == b"mvhd":
+                    if _creation_time(f, cstart):
+                        fmt.add("creation_time")
+                elif ctype in (b"udta", b"meta"):
+                    fmt.update(_user_data(f, ctype, cstart, cend))
+                elif ctype == b"trak":
+                    keys = _track_tags(f, cstart, cend)
+                    if keys:
+                        streams[str(track_index)] = sorted(keys)
+                    track_index += 1
+        elif btype == b"meta":
+            fmt.update(_user_data(f, btype, start, end))
+        elif btype == b"uuid":
+            f.seek(start)
+            if _read(f, 16) == _XMP_UUID:
+                fmt.add("xmp")
+
+    if not (seen_ftyp or seen_moov):
+        raise ValueError("not an ISO base media / QuickTime file")
+    return sorted(fmt), streams
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yield ``(type, payload_start, box_end)`` for the boxes in [start, end)."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, btype = struct.unpack(">I4s", header)
+        payload = pos + 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            (size,) = struct.unpack(">Q", large)
+            payload += 8
+        elif size == 0:
+            size = end - pos
+        if size < payload - pos or pos + size > end:
+            raise ValueError(f"bad box size at offset {pos}")
+        yield btype, payload, pos + size
+        pos += size
+
+
+def _read(f: BinaryIO, n: int) -> bytes:
+    if n > _MAX_BOX_READ:
+        raise ValueError("metadata box too large")
+    return f.read(n)
+
+
+def _creation_time(f: BinaryIO, payload: int) -> int:
+    # mvhd/tkhd/mdhd: version(1) flags(3) then creation_time (32 or 64 bit).
+    f.seek(payload)
+    head = _read(f, 12)
+    if len(head) < 8:
+        return 0
+    if head[0] == 1:
+        return struct.unpack(">Q", head[4:12])[0] if len(head) == 12 else 0
+    return struct.unpack(">I", head[4:8])[0]
+
+
+def _track_tags(f: BinaryIO, start: int, end: int) -> set[str]:
+    keys: set[str] = set()
+    for btype, bstart, bend in _iter_boxes(f, start, end):
+        if btype in (b"udta", b"meta"):
+            keys.update(_user_data(f, btype, bstart, bend))
+        elif btype == b"mdia":
+            for ctype, cstart, cend in _iter_boxes(f, bstart, bend):
+                if ctype == b"mdhd":
+                    if _creation_time(f, cstart):
+                        keys.add("creation_time")
+                    keys.add("language")
+                elif ctype == b"hdlr":
+                    # version/flags(4) pre_defined(4) handler_type(4) reserved(12) name
+                    f.seek(cstart + 24)
+                    name = _read(f, cend - cstart - 24)
+                    if name.strip(b"\x00 "):
+                        keys.add("handler_name")
+    return keys
+
+
+def _user_data(f: BinaryIO, btype: bytes, start: int, end: int) -> set[str]:
+    if btype == b"meta":
+        return _meta_items(f, start, end)
+
+    keys: set[str] = set()
+    for ctype, cstart, cend in _iter_boxes(f, start, end):
+        if ctype == b"meta":
+            keys.update(_meta_items(f, cstart, cend))
+        elif ctype in _ITEM_NAMES:
+            keys.add(_ITEM_NAMES[ctype])
+        elif ctype not in _PAYLOAD:
+            keys.add(ctype.decode("latin-1"))
+    return keys
+
+
+def _meta_items(f: BinaryIO, start: int, end: int) -> set[str]:
+    # ISO 'meta' is a full box (version/flags first); QuickTime's isn't.
+    f.seek(start)
+    head = _read(f, 8)
+    if head[4:8] != b"hdlr":
+        start += 4
+
+    names: list[str] = []
+    keys: set[str] = set()
+    for ctype, cstart, cend in _iter_boxes(f, start, end):
+        if ctype == b"keys":
+            names = _mdta_keys(f, cstart, cend)
+        elif ctype == b"ilst":
+            for item, _, _ in _iter_boxes(f, cstart, cend):
+                if item in _ITEM_NAMES:
+                    keys.add(_ITEM_NAMES[item])
+                    continue
+                # mdta-style items are 1-based indexes into the keys box.
+                index = int.from_bytes(item, "big")
+                if names and 1 <= index <= len(names):
+                    keys.add(names[index - 1])
+                else:
+                    keys.add(item.decode("latin-1"))
+        elif ctype == b"xml ":
+            keys.add("xmp")
+    return keys
+
+
+def _mdta_keys(f: BinaryIO, start: int, end: int) -> list[str]:
+    # version/flags(4) count(4), then (size(4) namespace(4) name) entries.
+    f.seek(start)
+    data = _read(f, end - start)
+    names: list[str] = []
+    pos = 8
+    while pos + 8 <= len(data):
+        (size,) = struct.unpack_from(">I", data, pos)
+        if size < 8:
+            break
+        names.append(data[pos + 8 : pos + size].decode("utf-8", errors="replace"))
+        pos += size
+    return names
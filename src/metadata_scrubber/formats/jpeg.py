@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+SOI = b"\xff\xd8"
+
+APP0 = 0xE0
+APP14 = 0xEE
+COM = 0xFE
+SOS = 0xDA
+EOI = 0xD9
+
+# Markers without a length field.
+_STANDALONE = {0x01, *range(0xD0, 0xD8)}
+
+# APP0 (JFIF) is harmless and APP14 (Adobe) tells decoders how to convert
+# colors, so both stay; every other APPn and COM segment is metadata.
+_KEEP_APP = {APP0, APP14}
+
+
+def iter_segments(data: bytes) -> Iterator[tuple[int, int, int]]:
+    """Yield ``(marker, start, end)`` for each header segment of a JPEG.
+
+    ``start`` points at the 0xFF of the marker and ``end`` just past the
+    segment. Iteration stops at SOS (start of entropy-coded data); the SOS
+    segment itself is yielded with ``end == len(data)``. Raises ValueError on
+    data that doesn't parse as a JPEG header.
+    """
+    if not data.startswith(SOI):
+        raise ValueError("not a JPEG (missing SOI)")
+
+    pos = 2
+    n = len(data)
+    while pos < n:
+        if data[pos] != 0xFF:
+            raise ValueError(f"expected marker at offset {pos}")
+        start = pos
+        # Any number of 0xFF fill bytes may precede the marker code.
+        while pos < n and data[pos] == 0xFF:
+            pos += 1
+        if pos >= n:
+            raise ValueError("truncated marker")
+        marker = data[pos]
+        pos += 1
+
+        if marker in _STANDALONE:
+            yield marker, start, pos
+            continue
+        if marker == EOI:
+            yield marker, start, pos
+            return
+        if pos + 2 > n:
+            raise ValueError("truncated segment length")
+
+        length = int.from_bytes(data[pos : pos + 2], "big")
+        end = pos + length
+        if length < 2 or end > n:
+            raise ValueError(f"bad segment length at offset {start}")
+
+        if marker == SOS:
+            yield marker, start, n
+            return
+
+        yield marker, start, end
+        pos = end
+
+
+def is_metadata_segment(marker: int) -> bool:
+    return (0xE0 <= marker <= 0xEF and marker not in _KEEP_APP) or marker == COM
+
+
+def strip_metadata_segments(data: bytes) -> bytes:
+    """Return data without APPn (except JFIF/Adobe) and COM segments.
+
+    Works on the marker level only: pixels are never decoded and the
+    entropy-coded data is copied through untouched.
+    """
+    kept: list[bytes] = [SOI]
+    dropped = False
+    for marker, start, end in iter_segments(data):
+        if is_metadata_segment(marker):
+            dropped = True
+            continue
+        kept.append(data[start:end])
+
+    if not dropped:
+        return data
+    return b"".join(kept)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import io
+import struct
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+_ZIP64_LIMIT = (1 << 31) - 1
+
+# zipfile has no public way to append precompressed data, so write_packed
+# drives these writer internals directly. They are unchanged from Python 3.10
+# through 3.13; the tests check they are still there.
+WRITER_INTERNALS = ("_lock", "_writing", "_seekable", "_writecheck", "_didModify", "start_dir")
+
+
+@dataclass(frozen=True)
+class PackedMember:
+    """A member's payload, already compressed according to ``compress_type``."""
+
+    compress_type: int
+    payload: bytes
+    crc: int
+    file_size: int
+
+
+def pack(data: bytes, *, compress_type: int, level: int | None = None, store_if_larger: bool = False) -> PackedMember:
+    """Compress data for a ZIP member (raw deflate, as ZIP stores it).
+
+    zlib releases the GIL, so this is meant to run on worker threads; the
+    result is written with :func:`write_packed`. With ``store_if_larger``,
+    data that doesn't shrink is stored instead.
+    """
+    crc = zlib.crc32(data)
+    if compress_type == zipfile.ZIP_STORED:
+        return PackedMember(zipfile.ZIP_STORED, data, crc, len(data))
+    if compress_type != zipfile.ZIP_DEFLATED:
+        raise ValueError(f"unsupported compression type: {compress_type}")
+
+    comp = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, -15)
+    payload = comp.compress(data) + comp.flush()
+    if store_if_larger and len(payload) >= len(data):
+        return PackedMember(zipfile.ZIP_STORED, data, crc, len(data))
+    return PackedMember(zipfile.ZIP_DEFLATED, payload, crc, len(data))
+
+
+def write_packed(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, member: PackedMember) -> None:
+    """Append a precompressed member to a ZipFile opened for writing.
+
+    ``zipfile`` can only compress as it writes, so this does what
+    ``ZipFile.open(zinfo, "w")`` does, with sizes and CRC known up front.
+    """
+    missing = [attr for attr in WRITER_INTERNALS if not hasattr(zf, attr)]
+    if missing:
+        raise RuntimeError(f"zipfile internals changed, missing: {', '.join(missing)}")
+
+    zinfo.compress_type = member.compress_type
+    zinfo.file_size = member.file_size
+    zinfo.compress_size = len(member.payload)
+    zinfo.CRC = member.crc
+    zinfo.flag_bits = 0
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > _ZIP64_LIMIT
+
+    with zf._lock:
+        if zf._writing:
+            raise ValueError("another write handle is open on the ZIP file")
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(member.payload)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def set_compress_level(zinfo: zipfile.ZipInfo, level: int | None) -> None:
+    """Set the deflate level ``ZipFile.open(zinfo, "w")`` compresses with."""
+    if hasattr(zinfo, "compress_level"):
+        # Public since Python 3.13.
+        zinfo.compress_level = level
+    else:
+        zinfo._compresslevel = level
+
+
+@dataclass(frozen=True)
+class CentralEntry:
+    name: str
+    date_time: tuple[int, int, int, int, int, int]
+    compress_size: int
+    file_size: int
+
+
+_EOCD = struct.Struct("<4s4H2LH")
+_EOCD_SIG = b"PK\x05\x06"
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_LOCATOR_SIG = b"PK\x06\x07"
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_EOCD_SIG = b"PK\x06\x06"
+_CENTRAL = struct.Struct("<4s6H3L5H2L")
+_CENTRAL_SIG = b"PK\x01\x02"
+
+# Enough for the end records, a maximal archive comment and the central
+# directory of any ordinary Office document.
+_TAIL = 256 * 1024
+
+
+def read_central_directory(f: BinaryIO) -> list[CentralEntry]:
+    """List a ZIP's members from its central directory alone.
+
+    Reads the end of the file once (plus a second read only if the directory
+    is larger than that), never the member data. Raises ValueError if f
+    isn't a ZIP.
+    """
+    size = f.seek(0, io.SEEK_END)
+    tail_start = max(0, size - _TAIL)
+    f.seek(tail_start)
+    tail = f.read()
+
+    pos = tail.rfind(_EOCD_SIG)
+    if pos < 0 or len(tail) - pos < _EOCD.size:
+        raise ValueError("not a ZIP file (no end of central directory)")
+    _, _, _, _, count, cd_size, _, _ = _EOCD.unpack_from(tail, pos)
+    # The directory ends where the end records begin; computing its start from
+    # there (not the stored offset) also copes with data prepended to the ZIP.
+    cd_end = tail_start + pos
+
+    loc = pos - _ZIP64_LOCATOR.size
+    if loc >= 0 and tail[loc : loc + 4] == _ZIP64_LOCATOR_SIG:
+        rec = loc - _ZIP64_EOCD.size
+        if rec >= 0 and tail[rec : rec + 4] == _ZIP64_EOCD_SIG:
+            fields = _ZIP64_EOCD.unpack_from(tail, rec)
+            count, cd_size = fields[7], fields[8]
+            cd_end = tail_start + rec
+
+    cd_start = cd_end - cd_size
+    if cd_start < 0:
+        raise ValueError("corrupt ZIP (central directory out of range)")
+    if cd_start >= tail_start:
+        cd = tail[cd_start - tail_start : cd_end - tail_start]
+    else:
+        f.seek(cd_start)
+        cd = f.read(cd_size)
+
+    entries: list[CentralEntry] = []
+    off = 0
+    for _ in range(count):
+        if cd[off : off + 4] != _CENTRAL_SIG:
+            raise ValueError("corrupt ZIP (bad central directory entry)")
+        fields = _CENTRAL.unpack_from(cd, off)
+        flags, mtime, mdate = fields[3], fields[5], fields[6]
+        compress_size, file_size = fields[8], fields[9]
+        name_len, extra_len, comment_len = fields[10], fields[11], fields[12]
+
+        off += _CENTRAL.size
+        raw_name = cd[off : off + name_len]
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = cd[off + name_len : off + name_len + extra_len]
+        off += name_len + extra_len + comment_len
+
+        if 0xFFFFFFFF in (compress_size, file_size):
+            file_size, compress_size = _zip64_sizes(extra, file_size, compress_size)
+
+        date_time = (
+            (mdate >> 9) + 1980,
+            (mdate >> 5) & 0xF,
+            mdate & 0x1F,
+            mtime >> 11,
+            (mtime >> 5) & 0x3F,
+            (mtime & 0x1F) * 2,
+        )
+        entries.append(CentralEntry(name, date_time, compress_size, file_size))
+    return entries
+
+
+def _zip64_sizes(extra: bytes, file_size: int, compress_size: int) -> tuple[int, int]:
+    # The ZIP64 extra field (id 1) holds only the values that overflowed, in
+    # the order: uncompressed size, compressed size.
+    pos = 0
+    while pos + 4 <= len(extra):
+        tag, length = struct.unpack_from("<HH", extra, pos)
+        if tag == 1:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, pos + 4))
+            if file_size == 0xFFFFFFFF:
+                file_size = next(values, file_size)
+            if compress_size == 0xFFFFFFFF:
+                compress_size = next(values, compress_size)
+            break
+        pos += 4 + length
+    return file_size, compress_size
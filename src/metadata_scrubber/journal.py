@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+
+class JournalState(str, Enum):
+    PLANNED = "planned"
+    BACKED_UP = "backed_up"
+    SCRUBBED = "scrubbed"
+    # Terminal state: output written and mode/times restored (or nothing to do).
+    STAT_RESTORED = "stat_restored"
+
+
+class Journal:
+    """Append-only JSON-lines journal of per-file task states.
+
+    Records are buffered and written (and fsynced) in batches, so journaling
+    costs one write per ``batch_size`` state changes instead of one per change.
+    Losing the tail of the journal on a crash is safe: resume only ever sees
+    an *earlier* state than the real one, and the rollback logic in ``core``
+    is written to cope with that.
+
+    ``before_flush`` runs before each write; batched durability uses it to
+    commit staged renames, so the journal never gets ahead of the files.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        append: bool = False,
+        batch_size: int = 1024,
+        before_flush: Callable[[], None] | None = None,
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(path, "a" if append else "w", encoding="utf-8")  # noqa: SIM115
+        self._batch_size = batch_size
+        self._pending: list[str] = []
+        self._before_flush = before_flush
+
+    def record(self, src: Path, state: JournalState, **extra: Any) -> None:
+        entry = {"src": str(src), "state": state.value, **extra}
+        self._pending.append(json.dumps(entry, sort_keys=True))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        if self._before_flush is not None:
+            self._before_flush()
+        self._f.write("\n".join(self._pending) + "\n")
+        self._pending.clear()
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._f.close()
+
+    def __enter__(self) -> Journal:  # noqa: PYI034
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def load_journal(path: Path) -> dict[str, dict[str, Any]]:
+    """Fold a journal into ``src -> merged entry`` (latest state wins)."""
+    entries: dict[str, dict[str, Any]] = {}
+    if not path.exists():
+        return entries
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write.
+                continue
+            entries.setdefault(rec["src"], {}).update(rec)
+
+    return entries
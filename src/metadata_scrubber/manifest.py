@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from .models import RunStats, ScrubResult
+from .utils import TempPath, atomic_replace
+
+MANIFEST_VERSION = 1
+
+# RunStats fields that count work and add up across shards; every other
+# numeric stat is a peak or ratio and merges as the maximum.
+_COUNTER_STATS = frozenset({"dedup_files", "dedup_bytes_saved"})
+
+
+def write_manifest(
+    path: Path,
+    results: Iterable[ScrubResult],
+    *,
+    shard: tuple[int, int] | None = None,
+    stats: RunStats | None = None,
+) -> None:
+    """Write a JSON manifest of a run's results (atomically)."""
+    rows = [
+        {
+            "src": str(r.src),
+            "dst": str(r.dst) if r.dst is not None else None,
+            "status": r.status.value,
+            "scrubber": r.scrubber,
+            "message": r.message,
+        }
+        for r in results
+    ]
+    payload: dict[str, Any] = {
+        "version": MANIFEST_VERSION,
+        "shards": [{"index": shard[0], "count": shard[1]}] if shard is not None else [],
+        "totals": _totals(rows),
+        "stats": asdict(stats) if stats is not None else {},
+        "results": rows,
+    }
+
+    with TempPath(path) as tmp:
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        atomic_replace(tmp, path)
+
+
+def read_manifest(path: Path) -> dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"unsupported manifest version in {path}: {data.get('version')!r}")
+    return data
+
+
+def merge_manifests(paths: Iterable[Path]) -> dict[str, Any]:
+    """Combine per-shard manifests into a single manifest with totals.
+
+    ``missing_shards`` lists shard indexes not covered by the inputs (only
+    when all inputs agree on the shard count). Counter stats are summed;
+    peaks and utilization ratios keep the highest shard's value.
+    """
+    shards: list[dict[str, int]] = []
+    stats: dict[str, Any] = {}
+    rows: list[dict[str, Any]] = []
+
+    for p in paths:
+        data = read_manifest(p)
+        shards.extend(data.get("shards") or [])
+        rows.extend(data.get("results") or [])
+        for k, v in (data.get("stats") or {}).items():
+            if isinstance(v, dict):
+                gauges = stats.setdefault(k, {})
+                for name, value in v.items():
+                    gauges[name] = max(gauges.get(name, value), value)
+            elif isinstance(v, (int, float)):
+                stats[k] = stats.get(k, 0) + v if k in _COUNTER_STATS else max(stats.get(k, v), v)
+
+    counts = {s["count"] for s in shards}
+    missing: list[int] = []
+    if len(counts) == 1:
+        seen = {s["index"] for s in shards}
+        missing = [i for i in range(counts.pop()) if i not in seen]
+
+    return {
+        "version": MANIFEST_VERSION,
+        "shards": sorted(shards, key=lambda s: (s["count"], s["index"])),
+        "missing_shards": missing,
+        "totals": _totals(rows),
+        "stats": stats,
+        "results": rows,
+    }
+
+
+def _totals(rows: list[dict[str, Any]]) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for r in rows:
+        totals[r["status"]] = totals.get(r["status"], 0) + 1
+    return totals
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .manifest import merge_manifests
+
+
+def main(
+    manifests: list[Path] = typer.Argument(..., exists=True, readable=True, dir_okay=False),
+    out: Path | None = typer.Option(None, "--out", help="Write the merged manifest to this file"),
+    json_output: bool = typer.Option(False, "--json", help="Output the merged manifest as JSON to stdout"),
+) -> None:
+    try:
+        merged = merge_manifests(manifests)
+    except (ValueError, KeyError) as e:
+        raise typer.BadParameter(str(e)) from None
+
+    if out is not None:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(merged, indent=2, sort_keys=True), encoding="utf-8")
+
+    if json_output:
+        typer.echo(json.dumps(merged, indent=2, sort_keys=True))
+    else:
+        console = Console()
+
+        table = Table(title=f"Merged Results ({len(manifests)} manifests)")
+        table.add_column("Status")
+        table.add_column("Count", justify="right")
+        for status, count in sorted(merged["totals"].items()):
+            table.add_row(status, str(count))
+        table.add_row("total", str(len(merged["results"])))
+        console.print(table)
+
+        if merged["missing_shards"]:
+            console.print(f"Missing shards: {', '.join(str(i) for i in merged['missing_shards'])}")
+
+    if merged["missing_shards"] or merged["totals"].get("error"):
+        raise typer.Exit(code=1)
+
+
+def app() -> None:
+    typer.run(main)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
 
 class ScrubStatus(str, Enum):
     SCRUBBED = "scrubbed"
+    ALREADY_CLEAN = "already_clean"
+    DEDUPLICATED = "deduplicated"
     COPIED_UNKNOWN = "copied_unknown"
     SKIPPED_UNSUPPORTED = "skipped_unsupported"
     SKIPPED_NOT_A_FILE = "skipped_not_a_file"
     SKIPPED_EXISTS = "skipped_exists"
+    SKIPPED_DONE = "skipped_done"
     DRY_RUN = "dry_run"
+    REJECTED = "rejected"
+    TIMEOUT = "timeout"
     ERROR = "error"
 
 
@@ -23,3 +28,18 @@ class ScrubResult:
     scrubber: str | None = None
     message: str | None = None
     removed_xattrs: tuple[str, ...] = ()
+
+
+@dataclass
+class RunStats:
+    """Run-level counters filled in by ``scrub_paths`` when passed in."""
+
+    dedup_files: int = 0
+    dedup_bytes_saved: int = 0
+    # Busy time / (wall time * workers) per scheduler pool ("cpu", "io").
+    pool_utilization: dict[str, float] = field(default_factory=dict)
+    # With --prefetch/--drop-behind: busy time / wall time per pipeline stage
+    # ("prefetch", "compute", "drop_behind"); compute is per worker.
+    stage_utilization: dict[str, float] = field(default_factory=dict)
+    # Highest summed memory estimate of concurrently admitted files (bytes).
+    peak_estimated_memory: int = 0
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+# Without posix_fadvise (macOS, Windows) prefetching falls back to reading
+# files through once, which still warms the OS cache for the scrubber.
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+_READ_CHUNK = 1024 * 1024
+
+
+class ReadAhead:
+    """Prefetch and drop-behind stages around the scrub (compute) stage.
+
+    A prefetch thread runs up to ``depth`` files ahead of dispatch and asks
+    the kernel to read them (``POSIX_FADV_WILLNEED``), so the disk works
+    while the CPU scrubs. With ``drop_behind`` a second thread takes
+    finished inputs from a queue of ``behind_depth`` and evicts them from the
+    page cache (``POSIX_FADV_DONTNEED``), so a large run doesn't push
+    everything else out of it.
+
+    The dispatcher calls ``advance`` as each file starts, ``compute`` with
+    the time spent scrubbing and ``done`` when a file is finished.
+    """
+
+    def __init__(self, paths: list[Path], *, depth: int, drop_behind: bool = False, behind_depth: int = 32) -> None:
+        self._paths = paths
+        self._depth = depth
+        self._dispatched = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = {"prefetch": 0.0, "compute": 0.0, "drop_behind": 0.0}
+        self._started = time.perf_counter()
+
+        self._prefetcher: threading.Thread | None = None
+        if depth > 0:
+            self._prefetcher = threading.Thread(target=self._prefetch_loop, name="prefetch", daemon=True)
+            self._prefetcher.start()
+
+        self._behind: queue.Queue[Path | None] | None = None
+        self._dropper: threading.Thread | None = None
+        if drop_behind and _HAS_FADVISE:
+            self._behind = queue.Queue(maxsize=behind_depth)
+            self._dropper = threading.Thread(target=self._drop_loop, name="drop-behind", daemon=True)
+            self._dropper.start()
+
+    def advance(self) -> None:
+        """One more file was dispatched; let the prefetcher move a step further."""
+        with self._cond:
+            self._dispatched += 1
+            self._cond.notify()
+
+    def compute(self, seconds: float) -> None:
+        self._busy["compute"] += seconds
+
+    def done(self, path: Path) -> None:
+        # Blocks when the queue is full, so drop-behind can't fall arbitrarily far behind.
+        if self._behind is not None:
+            self._behind.put(path)
+
+    def close(self, *, workers: int = 1) -> dict[str, float]:
+        """Stop both stages; return busy time / wall time per stage.
+
+        ``compute`` is divided by ``workers``, since that many files can be
+        scrubbed at once.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._prefetcher is not None:
+            self._prefetcher.join()
+        if self._behind is not None and self._dropper is not None:
+            self._behind.put(None)
+            self._dropper.join()
+
+        wall = max(time.perf_counter() - self._started, 1e-9)
+        utilization = {"compute": min(self._busy["compute"] / (wall * max(workers, 1)), 1.0)}
+        if self._prefetcher is not None:
+            utilization["prefetch"] = min(self._busy["prefetch"] / wall, 1.0)
+        if self._dropper is not None:
+            utilization["drop_behind"] = min(self._busy["drop_behind"] / wall, 1.0)
+        return utilization
+
+    def _prefetch_loop(self) -> None:
+        for i, path in enumerate(self._paths):
+            with self._cond:
+                while not self._closed and i >= self._dispatched + self._depth:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            started = time.perf_counter()
+            _advise(path, "willneed")
+            self._busy["prefetch"] += time.perf_counter() - started
+
+    def _drop_loop(self) -> None:
+        assert self._behind is not None
+        while (path := self._behind.get()) is not None:
+            started = time.perf_counter()
+            _advise(path, "dontneed")
+            self._busy["drop_behind"] += time.perf_counter() - started
+
+
+def _advise(path: Path, advice: str) -> None:
+    # Purely a hint: a file that vanished or can't be read is the scrubber's problem.
+    try:
+        with open(path, "rb", buffering=0) as f:
+            if _HAS_FADVISE:
+                flag = os.POSIX_FADV_WILLNEED if advice == "willneed" else os.POSIX_FADV_DONTNEED
+                os.posix_fadvise(f.fileno(), 0, 0, flag)
+            elif advice == "willneed":
+                while f.read(_READ_CHUNK):
+                    pass
+    except OSError:
+        pass
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import mmap
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .utils import open_mapped
+
+# Byte signatures of metadata that can survive in places the structured
+# verifiers don't look (or in file types they don't know).
+SIGNATURES: dict[str, tuple[bytes, ...]] = {
+    "xmp": (b"<x:xmpmeta", b"<?xpacket begin"),
+    "exif": (b"Exif\x00\x00",),
+    "gps": (b"GPSL",),  # GPSLatitude / GPSLongitude
+    "iptc": (b"8BIM\x04\x04", b"Photoshop 3.0\x00"),
+    "author": (b"/Author", b"<dc:creator", b"<cp:lastModifiedBy", b"<meta:initial-creator"),
+}
+
+MAX_OFFSETS = 16
+
+# All needles are searched within one window before moving on, so each
+# window is paged in (from disk, for cold files) once rather than once per needle.
+_WINDOW = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ResidualHit:
+    offsets: list[int]
+    # More matches exist than were recorded.
+    truncated: bool = False
+
+
+def build_patterns(strings: Iterable[str] = ()) -> dict[str, tuple[bytes, ...]]:
+    """Known signatures plus user strings (searched as UTF-8 and UTF-16LE)."""
+    patterns = dict(SIGNATURES)
+    for s in strings:
+        if s:
+            patterns[f"string:{s}"] = tuple(dict.fromkeys((s.encode("utf-8"), s.encode("utf-16-le"))))
+    return patterns
+
+
+def scan_file(
+    path: Path,
+    patterns: dict[str, tuple[bytes, ...]],
+    *,
+    max_offsets: int = MAX_OFFSETS,
+) -> dict[str, ResidualHit]:
+    """Search the raw bytes of path for each pattern; returns only the names found.
+
+    The file is memory-mapped and needles are located with the C-level
+    ``find`` window by window, so there is no per-byte Python work.
+    Compressed content (deflated ZIP members, PDF streams) is not looked into.
+    """
+    offsets: dict[str, list[int]] = {name: [] for name in patterns}
+    truncated: set[str] = set()
+    longest = max((len(n) for needles in patterns.values() for n in needles), default=1)
+
+    with open_mapped(path) as buf:
+        if isinstance(buf, mmap.mmap):
+            if hasattr(buf, "madvise"):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+            data = buf
+        else:
+            data = buf.read()
+
+        size = len(data)
+        for start in range(0, size, _WINDOW):
+            # Matches must start in this window but may run into the next.
+            limit = min(size, start + _WINDOW)
+            end = min(size, limit + longest - 1)
+            for name, needles in patterns.items():
+                if name in truncated:
+                    continue
+                found = offsets[name]
+                for needle in needles:
+                    pos = data.find(needle, start, end)
+                    while 0 <= pos < limit:
+                        if len(found) >= max_offsets:
+                            truncated.add(name)
+                            break
+                        found.append(pos)
+                        pos = data.find(needle, pos + 1, end)
+
+    return {name: ResidualHit(sorted(found), name in truncated) for name, found in offsets.items() if found}
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .verify import (
+    VerifyOptions,
+    VerifyResult,
+    VerifyStatus,
+    iter_files,
+    verifier_kind,
+    verify_paths,
+)
+
+if TYPE_CHECKING:
+    from .verify_cache import VerifyCache
+
+
+@dataclass
+class StratumReport:
+    population: int
+    sampled: int = 0
+    defects: int = 0
+    errors: int = 0
+    # Sampled files with no clean/metadata verdict (errors, unsupported).
+    excluded: int = 0
+
+
+@dataclass
+class SampleReport:
+    """Outcome of a sampled verify run.
+
+    ``estimate`` is the stratified metadata rate (defects per file);
+    ``lower``/``upper`` is an exact (Clopper-Pearson) interval at
+    ``confidence`` on the pooled sample, which proportional allocation keeps
+    close to self-weighting. Both only count the ``trials`` files that got a
+    verdict; the ``excluded`` rest (errors, unsupported) say nothing either way.
+    """
+
+    population: int
+    sample_size: int
+    defects: int
+    errors: int
+    excluded: int
+    trials: int
+    confidence: float
+    estimate: float
+    lower: float
+    upper: float
+    seed: int
+    strata: dict[str, StratumReport] = field(default_factory=dict)
+    results: list[VerifyResult] = field(default_factory=list)
+
+    def within(self, max_defect_rate: float) -> bool:
+        return self.upper <= max_defect_rate
+
+
+def required_sample_size(confidence: float, max_defect_rate: float) -> int:
+    """Files to check so that finding no defects bounds the rate.
+
+    With n files and zero defects, the upper end of the two-sided interval at
+    ``confidence`` is exactly ``1 - ((1 - confidence) / 2) ** (1 / n)``; this
+    returns the smallest n that brings it down to max_defect_rate.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if not 0 < max_defect_rate < 1:
+        raise ValueError("max defect rate must be between 0 and 1")
+    alpha = 1 - confidence
+    return math.ceil(math.log(alpha / 2) / math.log1p(-max_defect_rate))
+
+
+def sample_verify(
+    paths: Iterable[Path],
+    options: VerifyOptions,
+    *,
+    sample_size: int,
+    confidence: float = 0.95,
+    seed: int = 0,
+    cache: VerifyCache | None = None,
+) -> SampleReport:
+    """Verify a reproducible, format-stratified random sample of the files.
+
+    Files without a verifier are not part of the population. Each stratum
+    (verifier kind) gets a share of sample_size proportional to its size
+    (see ``_allocate``), and its files are drawn from a generator seeded with
+    (seed, kind), so the same tree and seed always give the same sample.
+    """
+    strata_paths: dict[str, list[Path]] = {}
+    for root in paths:
+        for p in iter_files(root.expanduser(), recursive=options.recursive):
+            kind = verifier_kind(p)
+            if kind is not None:
+                strata_paths.setdefault(kind, []).append(p)
+
+    population = sum(len(v) for v in strata_paths.values())
+    allocation = _allocate(sample_size, {k: len(v) for k, v in strata_paths.items()})
+
+    strata: dict[str, StratumReport] = {}
+    results: list[VerifyResult] = []
+    estimate = 0.0
+    for kind in sorted(strata_paths):
+        members = sorted(strata_paths[kind], key=str)
+        chosen = random.Random(f"{seed}:{kind}").sample(members, allocation[kind])
+        chosen.sort(key=str)
+
+        stratum = StratumReport(population=len(members), sampled=len(chosen))
+        for r in verify_paths(chosen, options, cache=cache):
+            if r.status == VerifyStatus.METADATA_FOUND:
+                stratum.defects += 1
+            elif r.status != VerifyStatus.CLEAN:
+                # No verdict: counting these as clean would understate the bound.
+                stratum.excluded += 1
+                if r.status == VerifyStatus.ERROR:
+                    stratum.errors += 1
+            results.append(r)
+        strata[kind] = stratum
+        trials = stratum.sampled - stratum.excluded
+        if trials:
+            estimate += (stratum.population / population) * (stratum.defects / trials)
+
+    n = sum(s.sampled - s.excluded for s in strata.values())
+    defects = sum(s.defects for s in strata.values())
+    lower, upper = clopper_pearson(defects, n, confidence)
+    return SampleReport(
+        population=population,
+        sample_size=sum(s.sampled for s in strata.values()),
+        defects=defects,
+        errors=sum(s.errors for s in strata.values()),
+        excluded=sum(s.excluded for s in strata.values()),
+        trials=n,
+        confidence=confidence,
+        estimate=estimate,
+        lower=lower,
+        upper=upper,
+        seed=seed,
+        strata=strata,
+        results=results,
+    )
+
+
+def _allocate(total: int, sizes: dict[str, int]) -> dict[str, int]:
+    # Proportional allocation that never exceeds total. While the budget
+    # lasts, every stratum gets one file first (largest strata first), so a
+    # rare format isn't skipped; each further file goes to the stratum
+    # furthest below its proportional quota.
+    population = sum(sizes.values())
+    if total >= population:
+        return dict(sizes)
+
+    alloc = dict.fromkeys(sizes, 0)
+    for k in sorted(sizes, key=lambda k: (-sizes[k], k))[:total]:
+        alloc[k] = 1
+    quotas = {k: total * n / population for k, n in sizes.items()}
+    for _ in range(total - sum(alloc.values())):
+        k = max(sorted(k for k in sizes if alloc[k] < sizes[k]), key=lambda k: quotas[k] - alloc[k])
+        alloc[k] += 1
+    return alloc
+
+
+def clopper_pearson(successes: int, trials: int, confidence: float) -> tuple[float, float]:
+    """Exact two-sided binomial interval for successes / trials."""
+    if trials == 0:
+        return 0.0, 1.0
+    alpha = 1 - confidence
+    lower = 0.0
+    if successes > 0:
+        # Smallest p with P(X >= successes) >= alpha/2.
+        lower = _bisect(lambda p: 1 - _binom_cdf(successes - 1, trials, p) - alpha / 2)
+    upper = 1.0
+    if successes < trials:
+        # Largest p with P(X <= successes) >= alpha/2.
+        upper = _bisect(lambda p: alpha / 2 - _binom_cdf(successes, trials, p))
+    return lower, upper
+
+
+def _binom_cdf(k: int, n: int, p: float) -> float:
+    if p <= 0:
+        return 1.0
+    if p >= 1:
+        return 1.0 if k >= n else 0.0
+    log_p, log_q = math.log(p), math.log1p(-p)
+    total = 0.0
+    for i in range(k + 1):
+        total += math.exp(
+            math.lgamma(n + 1) - math.lgamma(i + 1) - math.lgamma(n - i + 1) + i * log_p + (n - i) * log_q
+        )
+    return min(total, 1.0)
+
+
+def _bisect(f) -> float:
+    # f is increasing in p on [0, 1]; find its root.
+    lo, hi = 0.0, 1.0
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if f(mid) < 0:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
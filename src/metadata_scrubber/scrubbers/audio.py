@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.util
 import shutil
 from pathlib import Path
 
@@ -14,6 +15,13 @@ class AudioScrubber(Scrubber):
     def can_handle(self, path: Path) -> bool:
         return path.suffix.lower() in self._exts
 
+    def missing_dependency(self) -> str | None:
+        return None if importlib.util.find_spec("mutagen") else "mutagen not installed"
+
+    def estimate_memory(self, path: Path) -> int:
+        # mutagen only reads and rewrites the tag blocks.
+        return 16 * 1024 * 1024
+
     def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:  # noqa: ARG002
         # Mutagen works in-place, so we copy first when dst != src.
         shutil.copyfile(src, dst)
@@ -1,14 +1,41 @@
 from __future__ import annotations
 
+import tempfile
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 
 @dataclass(frozen=True)
 class ScrubOptions:
     normalize_zip_timestamps: bool = True
     pdf_aggressive: bool = False
+    pdf_compact: bool = False
+    # Scrub images and embedded packages inside Office documents too.
+    openxml_media: bool = True
+    # Author names in Office parts: "pseudonymize", "strip" or "keep".
+    openxml_authors: str = "pseudonymize"
+    # Office ZIP members: "auto" stores already-compressed media and deflates
+    # the rest, "deflate" deflates everything, "store" compresses nothing.
+    zip_compression: str = "auto"
+    # zlib level 0-9 for deflated members (None: zlib's default).
+    zip_level: int | None = None
+    # Seconds an external tool (ffmpeg) may run before it is killed.
+    tool_timeout: float | None = None
+
+    # Budgets for untrusted input (None: unlimited), checked before any
+    # decoding or decompression starts.
+    max_pixels: int | None = None
+    # Declared uncompressed bytes of a ZIP package, and that over its compressed size.
+    zip_max_total: int | None = None
+    zip_max_ratio: float | None = None
+    pdf_max_objects: int | None = None
+    # Bytes of the largest object (in practice: stream) in a PDF.
+    pdf_max_stream: int | None = None
+
+
+class ResourceLimitExceeded(Exception):
+    """The input is over one of the ScrubOptions budgets and was not scrubbed."""
 
 
 class Scrubber(ABC):
@@ -19,6 +46,43 @@ class Scrubber(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:
-        """Write a scrubbed version of src to dst."""
+    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> str | None:
+        """Write a scrubbed version of src to dst.
+
+        May return a short note for the result message (for example parts
+        that were left as they were).
+        """
         raise NotImplementedError
+
+    def missing_dependency(self) -> str | None:
+        """Why this scrubber can't run here (a missing tool or module), or None."""
+        return None
+
+    def check_limits(self, path: Path, *, options: ScrubOptions) -> None:
+        """Raise ResourceLimitExceeded if path is over a budget in options.
+
+        Called before any output (or in-place backup) is written, so it must
+        only look at headers. scrub() checks again for embedded files.
+        """
+
+    def scrub_bytes(self, data: bytes, name: str, *, options: ScrubOptions) -> bytes:
+        """Scrub an in-memory file, such as a member of a container.
+
+        ``name`` is only used for its extension. The default round-trips
+        through temp files; scrubbers that can work on buffers override it.
+        """
+        suffix = PurePosixPath(name).suffix
+        with tempfile.TemporaryDirectory(prefix="metadata-scrubber-") as tmp:
+            src = Path(tmp) / f"in{suffix}"
+            dst = Path(tmp) / f"out{suffix}"
+            src.write_bytes(data)
+            self.scrub(src, dst, options=options)
+            return dst.read_bytes()
+
+    def estimate_memory(self, path: Path) -> int:
+        """Rough peak memory (bytes) needed to scrub path.
+
+        Used by the scheduler's ``--max-memory`` admission control; it only has
+        to be cheap and in the right ballpark.
+        """
+        return 2 * path.stat().st_size
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from pathlib import Path
+import io
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
 
 from PIL import Image, ImageOps
 
-from .base import ScrubOptions, Scrubber
+from .base import ResourceLimitExceeded, ScrubOptions, Scrubber
+
+
+# Pillow stores most multi-band modes as 4 bytes per pixel internally.
+_BYTES_PER_PIXEL = {"1": 1, "L": 1, "P": 1, "I;16": 2, "I;16B": 2, "I;16L": 2}
 
 
 class ImageScrubber(Scrubber):
@@ -15,30 +21,67 @@ class ImageScrubber(Scrubber):
     def can_handle(self, path: Path) -> bool:
         return path.suffix.lower() in self._exts
 
-    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:  # noqa: ARG002
-        ext = src.suffix.lower()
-
-        with Image.open(src) as img:
-            # If we remove EXIF, we should also bake in its orientation.
-            img = ImageOps.exif_transpose(img)
-
-            # Drop any sidecar info dict to avoid accidental propagation.
-            img_clean = img.copy()
-            img_clean.info = {}
-
-            save_kwargs: dict[str, object] = {}
-            if ext in {".jpg", ".jpeg"}:
-                if img_clean.mode in {"RGBA", "LA"}:
-                    img_clean = img_clean.convert("RGB")
-                save_kwargs.update({"format": "JPEG", "quality": 95, "optimize": True})
-            elif ext == ".png":
-                save_kwargs.update({"format": "PNG", "optimize": True})
-            elif ext in {".tif", ".tiff"}:
-                save_kwargs.update({"format": "TIFF"})
-            elif ext == ".webp":
-                save_kwargs.update({"format": "WEBP", "quality": 95, "method": 6})
-            else:
-                # Shouldn't happen due to can_handle, but keep it safe.
-                save_kwargs.update({"format": img_clean.format or "PNG"})
-
-            img_clean.save(dst, **save_kwargs)
+    def estimate_memory(self, path: Path) -> int:
+        # Image.open only parses the header; pixels aren't decoded here.
+        with Image.open(path) as img:
+            w, h = img.size
+            bpp = _BYTES_PER_PIXEL.get(img.mode, 4)
+        # The decoded frame, the transposed frame and img.copy() can be alive at once.
+        return 3 * w * h * bpp + path.stat().st_size
+
+    def check_limits(self, path: Path, *, options: ScrubOptions) -> None:
+        if options.max_pixels is not None:
+            with _open_image(path) as img:
+                _check_pixels(img, options)
+
+    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:
+        _reencode(src, dst, ext=src.suffix.lower(), options=options)
+
+    def scrub_bytes(self, data: bytes, name: str, *, options: ScrubOptions) -> bytes:
+        out = io.BytesIO()
+        _reencode(io.BytesIO(data), out, ext=PurePosixPath(name).suffix.lower(), options=options)
+        return out.getvalue()
+
+
+def _open_image(src: Path | BinaryIO) -> Image.Image:
+    try:
+        return Image.open(src)
+    except Image.DecompressionBombError as e:
+        # Pillow's own hard limit; report it like ours rather than as a crash.
+        raise ResourceLimitExceeded(str(e)) from e
+
+
+def _check_pixels(img: Image.Image, options: ScrubOptions) -> None:
+    # img.size comes from the header; nothing has been decoded yet.
+    w, h = img.size
+    if options.max_pixels is not None and w * h > options.max_pixels:
+        raise ResourceLimitExceeded(f"image is {w}x{h} ({w * h} pixels), over the {options.max_pixels} pixel budget")
+
+
+def _reencode(src: Path | BinaryIO, dst: Path | BinaryIO, *, ext: str, options: ScrubOptions) -> None:
+    with _open_image(src) as img:
+        _check_pixels(img, options)
+
+        # If we remove EXIF, we should also bake in its orientation.
+        img = ImageOps.exif_transpose(img)
+
+        # Drop any sidecar info dict to avoid accidental propagation.
+        img_clean = img.copy()
+        img_clean.info = {}
+
+        save_kwargs: dict[str, object] = {}
+        if ext in {".jpg", ".jpeg"}:
+            if img_clean.mode in {"RGBA", "LA"}:
+                img_clean = img_clean.convert("RGB")
+            save_kwargs.update({"format": "JPEG", "quality": 95, "optimize": True})
+        elif ext == ".png":
+            save_kwargs.update({"format": "PNG", "optimize": True})
+        elif ext in {".tif", ".tiff"}:
+            save_kwargs.update({"format": "TIFF"})
+        elif ext == ".webp":
+            save_kwargs.update({"format": "WEBP", "quality": 95, "method": 6})
+        else:
+            # Shouldn't happen due to can_handle, but keep it safe.
+            save_kwargs.update({"format": img_clean.format or "PNG"})
+
+        img_clean.save(dst, **save_kwargs)
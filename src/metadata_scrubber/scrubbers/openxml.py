@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import io
+import os
+import shutil
+import tempfile
 import xml.etree.ElementTree as ET
 import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 from defusedxml import ElementTree as DefusedET
 
-from .base import ScrubOptions, Scrubber
+from ..formats.zip import PackedMember, pack, set_compress_level, write_packed
+from .base import ResourceLimitExceeded, ScrubOptions, Scrubber
+from .openxml_authors import Pseudonyms, is_author_part, mentions_authors, rewrite_author_xml
 
 
 class OpenXmlScrubber(Scrubber):
@@ -29,31 +36,279 @@ class OpenXmlScrubber(Scrubber):
     def can_handle(self, path: Path) -> bool:
         return path.suffix.lower() in self._exts
 
-    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:
+    def estimate_memory(self, path: Path) -> int:
+        # Large members are streamed; the largest buffered member (plus
+        # its compressed copy) dominates, times the number of members that
+        # may be in flight on the thread pool.
+        with zipfile.ZipFile(path, "r") as z:
+            infos = z.infolist()
+        buffered = [info.file_size for info in infos if _is_buffered(info)]
+        largest = max(buffered, default=0)
+        return 2 * largest * max(1, min(len(buffered), _WINDOW)) + 8 * 1024 * 1024
+
+    def check_limits(self, path: Path, *, options: ScrubOptions) -> None:
+        if options.zip_max_total is not None or options.zip_max_ratio is not None:
+            with zipfile.ZipFile(path, "r") as z:
+                _check_zip_budget(z.infolist(), options)
+
+    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> str | None:
         with zipfile.ZipFile(src, "r") as zin:
             with zipfile.ZipFile(dst, "w", compression=zipfile.ZIP_DEFLATED) as zout:
-                for info in zin.infolist():
-                    name = info.filename
+                kept = self._scrub_package(zin, zout, options=options)
+        if not kept:
+            return None
+        return f"kept {len(kept)} embedded file(s) unscrubbed: {', '.join(sorted(kept))}"
+
+    def scrub_bytes(self, data: bytes, name: str, *, options: ScrubOptions) -> bytes:
+        out = io.BytesIO()
+        with (
+            zipfile.ZipFile(io.BytesIO(data), "r") as zin,
+            zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zout,
+        ):
+            self._scrub_package(zin, zout, options=options)
+        return out.getvalue()
+
+    def _scrub_package(
+        self, zin: zipfile.ZipFile, zout: zipfile.ZipFile, *, options: ScrubOptions
+    ) -> list[str]:
+        """Write the scrubbed package; return embedded members kept as they were, with why."""
+        _check_zip_budget(zin.infolist(), options)
+        members = [info for info in zin.infolist() if info.filename not in self._remove_parts]
+
+        nested: dict[str, Scrubber] = {}
+        # Appended to from pool threads; list.append is atomic.
+        kept: list[str] = []
+        if options.openxml_media:
+            nested = _nested_scrubbers(members, kept)
+
+        # One mapping per package so the same person gets the same pseudonym
+        # in document.xml and comments.xml.
+        pseudonyms = Pseudonyms()
+
+        pool = None
+        buffered_bytes = sum(info.file_size for info in members if _is_buffered(info))
+        if len(nested) >= _POOL_THRESHOLD or buffered_bytes >= _POOL_MIN_BYTES:
+            pool = ThreadPoolExecutor(max_workers=min(_WINDOW, os.cpu_count() or 1))
+
+        # Buffered members are scrubbed (media) and compressed on the pool, a
+        # bounded window at a time, and written back in their original order.
+        window: deque[tuple[zipfile.ZipInfo, Future[PackedMember]]] = deque()
+
+        def drain(keep: int) -> None:
+            while len(window) > keep:
+                info, fut = window.popleft()
+                write_packed(zout, _member_info(info, options=options), fut.result())
+
+        def submit(info: zipfile.ZipInfo, fn, *args) -> None:
+            if pool is None:
+                write_packed(zout, _member_info(info, options=options), fn(*args))
+            else:
+                window.append((info, pool.submit(fn, *args)))
+                drain(keep=_WINDOW - 1)
+
+        try:
+            for info in members:
+                name = info.filename
+
+                if name == self._rels_path:
+                    submit(info, _pack, name, _scrub_rels_xml(zin.read(info)), options)
+                elif name == self._content_types_path:
+                    submit(info, _pack, name, _scrub_content_types_xml(zin.read(info)), options)
+                elif name in nested and _is_buffered(info):
+                    submit(info, _scrub_and_pack, nested[name], name, zin.read(info), options, kept)
+                elif name in nested:
+                    drain(keep=0)
+                    _scrub_spooled(zin, zout, info, nested[name], kept, options=options)
+                elif options.openxml_authors != "keep" and is_author_part(name):
+                    drain(keep=0)
+                    _rewrite_author_member(zin, zout, info, pseudonyms, options=options)
+                elif _is_buffered(info):
+                    submit(info, _pack, name, zin.read(info), options)
+                else:
+                    # Large parts are streamed, so memory stays bounded.
+                    drain(keep=0)
+                    _copy_member(zin, zout, info, options=options)
+            drain(keep=0)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        return kept
+
+
+ZIP_COMPRESSION_MODES = ("auto", "deflate", "store")
+
+
+def _check_zip_budget(infos: list[zipfile.ZipInfo], options: ScrubOptions) -> None:
+    """Reject a package by its central directory, before anything is inflated.
+
+    zipfile never yields more than a member's declared size (and checks the
+    CRC), so the declared sizes bound what scrubbing will decompress.
+    """
+    total = sum(info.file_size for info in infos)
+    if options.zip_max_total is not None and total > options.zip_max_total:
+        raise ResourceLimitExceeded(f"ZIP expands to {total} bytes, over the {options.zip_max_total} byte budget")
+    if options.zip_max_ratio is not None:
+        compressed = max(1, sum(info.compress_size for info in infos))
+        if total / compressed > options.zip_max_ratio:
+            raise ResourceLimitExceeded(
+                f"ZIP compression ratio {total / compressed:.0f}:1 is over the {options.zip_max_ratio:g}:1 budget"
+            )
+
+
+# Media scrubbing and zlib both release the GIL, so packages with enough
+# buffered work use a thread pool; small documents aren't worth the overhead.
+_POOL_THRESHOLD = 4
+_POOL_MIN_BYTES = 4 * 1024 * 1024
+_WINDOW = 8
+
+# Members up to this size are read into memory and compressed on the pool;
+# larger ones are streamed (embedded media through temp files).
+_BUFFER_LIMIT = 16 * 1024 * 1024
+
+# Already-compressed formats: deflating them again costs time and saves nothing.
+_PRECOMPRESSED_EXTS = {
+    ".jpg", ".jpeg", ".jfif", ".png", ".gif", ".webp",
+    ".mp3", ".m4a", ".wma", ".mp4", ".m4v", ".mov", ".wmv", ".webm", ".mkv",
+    ".zip", ".docx", ".docm", ".xlsx", ".xlsm", ".pptx", ".pptm",
+}
+
+_MEDIA_DIRS = ("word/media/", "ppt/media/", "xl/media/")
+
+
+def _is_nested_candidate(name: str) -> bool:
+    return name.startswith(_MEDIA_DIRS) or "/embeddings/" in name
+
+
+def _is_buffered(info: zipfile.ZipInfo) -> bool:
+    return info.file_size <= _BUFFER_LIMIT
+
+
+def _compress_type(name: str, options: ScrubOptions) -> int:
+    if options.zip_compression == "store":
+        return zipfile.ZIP_STORED
+    if options.zip_compression == "auto" and Path(name).suffix.lower() in _PRECOMPRESSED_EXTS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _pack(name: str, data: bytes, options: ScrubOptions) -> PackedMember:
+    return pack(
+        data,
+        compress_type=_compress_type(name, options),
+        level=options.zip_level,
+        store_if_larger=options.zip_compression == "auto",
+    )
+
+
+def _nested_scrubbers(members: list[zipfile.ZipInfo], kept: list[str]) -> dict[str, Scrubber]:
+    # Members whose scrubber can't run here (no ffmpeg, no mutagen) are copied
+    # as they are and listed in kept, like the package without --openxml-media.
+    # Imported lazily: the registry itself imports this module.
+    from . import default_scrubbers
+
+    registry = default_scrubbers()
+    found: dict[str, Scrubber] = {}
+    for info in members:
+        if info.is_dir() or not _is_nested_candidate(info.filename):
+            continue
+        for scrubber in registry:
+            if scrubber.can_handle(Path(info.filename)):
+                missing = scrubber.missing_dependency()
+                if missing is None:
+                    found[info.filename] = scrubber
+                else:
+                    kept.append(f"{info.filename} ({missing})")
+                break
+    return found
+
+
+def _scrub_and_pack(
+    scrubber: Scrubber, name: str, data: bytes, options: ScrubOptions, kept: list[str]
+) -> PackedMember:
+    try:
+        data = scrubber.scrub_bytes(data, name, options=options)
+    except ResourceLimitExceeded as e:
+        raise ResourceLimitExceeded(f"embedded {name}: {e}") from e
+    except Exception as e:  # noqa: BLE001
+        # One corrupt image shouldn't cost the whole document its scrub.
+        kept.append(f"{name} ({e})")
+    return _pack(name, data, options)
+
+
+def _scrub_spooled(
+    zin: zipfile.ZipFile,
+    zout: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    scrubber: Scrubber,
+    kept: list[str],
+    *,
+    options: ScrubOptions,
+) -> None:
+    # Too large to buffer: round-trip through temp files with the scrubber's
+    # path-based API and stream the result back, so memory stays bounded.
+    name = info.filename
+    with tempfile.TemporaryDirectory(prefix="metadata-scrubber-") as tmp:
+        src = Path(tmp) / f"in{Path(name).suffix}"
+        dst = Path(tmp) / f"out{Path(name).suffix}"
+        with zin.open(info) as fin, src.open("wb") as fout:
+            shutil.copyfileobj(fin, fout, _COPY_CHUNK)
+        try:
+            scrubber.scrub(src, dst, options=options)
+        except ResourceLimitExceeded as e:
+            raise ResourceLimitExceeded(f"embedded {name}: {e}") from e
+        except Exception as e:  # noqa: BLE001
+            kept.append(f"{name} ({e})")
+            dst = src
+
+        zi = _member_info(info, options=options)
+        zi.file_size = dst.stat().st_size
+        with dst.open("rb") as fin, zout.open(zi, "w", force_zip64=zi.file_size > _ZIP64_LIMIT) as fout:
+            shutil.copyfileobj(fin, fout, _COPY_CHUNK)
+
+
+def _member_info(info: zipfile.ZipInfo, *, options: ScrubOptions) -> zipfile.ZipInfo:
+    zi = zipfile.ZipInfo(filename=info.filename)
+    if options.normalize_zip_timestamps:
+        zi.date_time = (1980, 1, 1, 0, 0, 0)
+    else:
+        zi.date_time = info.date_time
+
+    zi.compress_type = _compress_type(info.filename, options)
+    set_compress_level(zi, options.zip_level)
+    zi.external_attr = info.external_attr
+    return zi
+
+
+def _copy_member(zin: zipfile.ZipFile, zout: zipfile.ZipFile, info: zipfile.ZipInfo, *, options: ScrubOptions) -> None:
+    zi = _member_info(info, options=options)
+    zi.file_size = info.file_size
+    with zin.open(info) as fin, zout.open(zi, "w", force_zip64=info.file_size > _ZIP64_LIMIT) as fout:
+        shutil.copyfileobj(fin, fout, _COPY_CHUNK)
 
-                    if name in self._remove_parts:
-                        continue
 
-                    data = zin.read(name)
+def _rewrite_author_member(
+    zin: zipfile.ZipFile,
+    zout: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    pseudonyms: Pseudonyms,
+    *,
+    options: ScrubOptions,
+) -> None:
+    # Decompressing twice is much cheaper than parsing, and big parts like
+    # sharedStrings.xml usually have nothing to rewrite.
+    with zin.open(info) as fin:
+        if not mentions_authors(fin):
+            _copy_member(zin, zout, info, options=options)
+            return
 
-                    if name == self._rels_path:
-                        data = _scrub_rels_xml(data)
-                    elif name == self._content_types_path:
-                        data = _scrub_content_types_xml(data)
+    zi = _member_info(info, options=options)
+    # The rewritten part is about the size of the original; leave headroom.
+    with zin.open(info) as fin, zout.open(zi, "w", force_zip64=info.file_size > _ZIP64_LIMIT // 2) as fout:
+        rewrite_author_xml(fin, fout, mode=options.openxml_authors, pseudonyms=pseudonyms)
 
-                    zi = zipfile.ZipInfo(filename=name)
-                    if options.normalize_zip_timestamps:
-                        zi.date_time = (1980, 1, 1, 0, 0, 0)
-                    else:
-                        zi.date_time = info.date_time
 
-                    zi.compress_type = zipfile.ZIP_DEFLATED
-                    zi.external_attr = info.external_attr
-                    zout.writestr(zi, data)
+_ZIP64_LIMIT = (1 << 31) - 1
+_COPY_CHUNK = 1024 * 1024
 
 
 def _scrub_rels_xml(raw: bytes) -> bytes:
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import re
+import zipfile
+from pathlib import Path
+from typing import BinaryIO
+from xml.parsers import expat
+
+from defusedxml import DTDForbidden, EntitiesForbidden, ExternalReferenceForbidden
+
+# Parts that carry author names, revision ids (rsids) or presence info.
+_AUTHOR_PARTS = re.compile(
+    r"^(?:"
+    r"word/(?:document|comments\w*|footnotes|endnotes|header\d*|footer\d*|settings|people)\.xml"
+    r"|xl/(?:comments\d*|sharedStrings|persons/person\w*)\.xml"
+    r"|ppt/(?:commentAuthors|authors)\.xml"
+    r")$"
+)
+
+_CHUNK = 1024 * 1024
+
+AUTHOR_MODES = ("pseudonymize", "strip", "keep")
+
+
+# Any byte sequence the rewriter acts on; parts without one are copied as is.
+_TRIGGERS = re.compile(rb"rsid|author|Author|w:date|initials|userId|providerId|displayName|person")
+_TRIGGER_OVERLAP = 16
+
+
+def is_author_part(name: str) -> bool:
+    return _AUTHOR_PARTS.match(name) is not None
+
+
+def mentions_authors(src: BinaryIO) -> bool:
+    """Cheap pre-scan: False means rewrite_author_xml would change nothing."""
+    tail = b""
+    while chunk := src.read(_CHUNK):
+        if _TRIGGERS.search(tail + chunk):
+            return True
+        tail = chunk[-_TRIGGER_OVERLAP:]
+    return False
+
+
+def package_mentions_authors(path: Path) -> bool:
+    """mentions_authors over every author part of an OpenXML package."""
+    with zipfile.ZipFile(path, "r") as z:
+        for info in z.infolist():
+            if is_author_part(info.filename):
+                with z.open(info) as f:
+                    if mentions_authors(f):
+                        return True
+    return False
+
+
+class Pseudonyms:
+    """Stable ``real name -> "Author N"`` mapping, shared by all parts of a package."""
+
+    def __init__(self) -> None:
+        self._names: dict[str, str] = {}
+
+    def name(self, real: str) -> str:
+        if real not in self._names:
+            self._names[real] = f"Author {len(self._names) + 1}"
+        return self._names[real]
+
+
+def rewrite_author_xml(src: BinaryIO, dst: BinaryIO, *, mode: str, pseudonyms: Pseudonyms) -> None:
+    """Stream an OpenXML part from src to dst, removing personal data.
+
+    ``rsid*`` attributes, ``w:date`` and ``<w:rsids>`` are always dropped;
+    author names, initials and user ids are replaced by pseudonyms
+    (``mode="pseudonymize"``) or blanked (``mode="strip"``).
+
+    The input is copied through byte for byte and only the tags that change
+    are re-serialized, so throughput stays close to expat's and memory use
+    doesn't depend on the part size.
+    """
+    rewriter = _AuthorRewriter(dst, mode=mode, pseudonyms=pseudonyms)
+    first = True
+    while chunk := src.read(_CHUNK):
+        if first and chunk.startswith((b"\xff\xfe", b"\xfe\xff")):
+            # Patching byte ranges assumes UTF-8, which is all Office writes.
+            raise ValueError("UTF-16 OpenXML parts are not supported")
+        first = False
+        rewriter.feed(chunk)
+    rewriter.close()
+
+
+# Attribute actions.
+_KEEP, _DROP, _NAME, _INITIALS, _USER_ID, _PROVIDER = range(6)
+
+# Elements whose name/id attributes describe a person (ppt authors, xl persons,
+# word people.xml).
+_PERSON_ELEMENTS = {"cmAuthor", "author", "person", "presenceInfo"}
+
+# End of a start tag; attribute values may contain '>' but not quotes of their own kind.
+_TAG_END = re.compile(rb"""(?:[^>"']|"[^"]*"|'[^']*')*>""")
+
+
+def _attr_action(element: str, qname: str) -> int:
+    attr = qname.rpartition(":")[2]
+    if attr.startswith("rsid") or (attr == "date" and qname.startswith("w:")):
+        return _DROP
+    if attr == "author":
+        return _NAME
+    if attr == "initials":
+        return _INITIALS
+    if element.rpartition(":")[2] in _PERSON_ELEMENTS:
+        if attr in ("name", "displayName"):
+            return _NAME
+        if attr == "userId":
+            return _USER_ID
+        if attr == "providerId":
+            return _PROVIDER
+    return _KEEP
+
+
+def _quote(value: str) -> str:
+    value = value.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;")
+    return value.replace("\t", "&#9;").replace("\n", "&#10;").replace("\r", "&#13;")
+
+
+def _forbid_dtd(name, sysid, pubid, has_internal_subset):
+    raise DTDForbidden(name, sysid, pubid)
+
+
+def _forbid_entities(name, is_parameter_entity, value, base, sysid, pubid, notation_name):
+    raise EntitiesForbidden(name, value, base, sysid, pubid, notation_name)
+
+
+def _forbid_unparsed(name, base, sysid, pubid, notation_name):
+    raise EntitiesForbidden(name, None, base, sysid, pubid, notation_name)
+
+
+def _forbid_external(context, base, sysid, pubid):
+    raise ExternalReferenceForbidden(context, base, sysid, pubid)
+
+
+class _AuthorRewriter:
+    # Namespace processing is off: names arrive as qnames, which is what gets
+    # written back. Input not covered by a rewrite is passed through verbatim
+    # (declaration, comments, CDATA, entity references and all).
+
+    def __init__(self, dst: BinaryIO, *, mode: str, pseudonyms: Pseudonyms) -> None:
+        self._dst = dst
+        self._mode = mode
+        self._pseudonyms = pseudonyms
+
+        # Input not yet written or dropped; _base is the offset of _buf[0].
+        self._buf = bytearray()
+        self._base = 0
+        self._seen = 0
+
+        self._actions: dict[tuple[str, str], int] = {}
+        self._skip_depth = 0
+        self._skip_self_closing = False
+        self._author_text: list[str] | None = None
+        self._author_text_start = 0
+
+        p = expat.ParserCreate()
+        p.ordered_attributes = True
+        p.buffer_text = True
+        # The end handler is only installed while inside <w:rsids> or <author>.
+        p.StartElementHandler = self._start
+        p.StartDoctypeDeclHandler = _forbid_dtd
+        p.EntityDeclHandler = _forbid_entities
+        p.UnparsedEntityDeclHandler = _forbid_unparsed
+        p.ExternalEntityRefHandler = _forbid_external
+        self._parser = p
+
+    def feed(self, chunk: bytes) -> None:
+        self._buf += chunk
+        self._parser.Parse(chunk, False)
+        if self._skip_depth or self._author_text is not None:
+            return
+        # Only input up to the last reported tag is known not to need a
+        # rewrite; expat may still be holding on to the rest.
+        self._emit_upto(self._seen)
+
+    def close(self) -> None:
+        self._parser.Parse(b"", True)
+        self._emit_upto(self._base + len(self._buf))
+
+    def _emit_upto(self, pos: int) -> None:
+        n = pos - self._base
+        if n > 0:
+            self._dst.write(self._buf[:n])
+            self._drop_upto(pos)
+
+    def _drop_upto(self, pos: int) -> None:
+        del self._buf[: pos - self._base]
+        self._base = pos
+
+    def _tag_end(self, start: int) -> int:
+        m = _TAG_END.match(self._buf, start - self._base)
+        if m is None:
+            raise ValueError(f"unterminated tag at byte {start}")
+        return self._base + m.end()
+
+    def _replace_name(self, value: str) -> str:
+        if self._mode == "strip" or not value:
+            return ""
+        return self._pseudonyms.name(value)
+
+    def _start(self, name: str, attrs: list[str]) -> None:
+        self._seen = start = self._parser.CurrentByteIndex
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if self._author_text is not None:
+            # Mixed content: not a plain name, leave it alone.
+            self._stop_author_text()
+
+        if name.endswith("rsids") and name.rpartition(":")[2] == "rsids":
+            # <w:rsids> in settings.xml lists every editing session id.
+            self._emit_upto(start)
+            end = self._tag_end(start)
+            self._skip_self_closing = self._buf[end - self._base - 2] == ord("/")
+            if self._skip_self_closing:
+                self._drop_upto(end)
+            self._skip_depth = 1
+            self._parser.EndElementHandler = self._end
+            return
+
+        new_attrs: list[tuple[str, str]] | None = None
+        if attrs:
+            actions = self._actions
+            for i in range(0, len(attrs), 2):
+                key = (name, attrs[i])
+                action = actions.get(key)
+                if action is None:
+                    action = actions[key] = _attr_action(name, attrs[i])
+                if action != _KEEP:
+                    new_attrs = self._rewrite_attrs(name, attrs)
+                    break
+
+        end = None
+        if new_attrs is not None:
+            self._emit_upto(start)
+            end = self._tag_end(start)
+            self_closing = self._buf[end - self._base - 2] == ord("/")
+            parts = [f"<{name}"]
+            parts.extend(f' {k}="{_quote(v)}"' for k, v in new_attrs)
+            parts.append("/>" if self_closing else ">")
+            self._dst.write("".join(parts).encode("utf-8"))
+            self._drop_upto(end)
+
+        if name == "author":
+            # xl/comments*.xml: <authors><author>Real Name</author></authors>
+            if end is None:
+                end = self._tag_end(start)
+            if self._buf[end - self._base - 2] != ord("/"):
+                self._author_text = []
+                self._author_text_start = end
+                self._parser.CharacterDataHandler = self._author_text.append
+                self._parser.EndElementHandler = self._end
+
+    def _rewrite_attrs(self, name: str, attrs: list[str]) -> list[tuple[str, str]]:
+        out: list[tuple[str, str]] = []
+        for i in range(0, len(attrs), 2):
+            qname, value = attrs[i], attrs[i + 1]
+            action = self._actions.get((name, qname))
+            if action is None:
+                action = self._actions[(name, qname)] = _attr_action(name, qname)
+            if action == _DROP:
+                continue
+            if action == _NAME or action == _USER_ID:
+                value = self._replace_name(value)
+            elif action == _INITIALS:
+                value = "" if self._mode == "strip" else "A"
+            elif action == _PROVIDER:
+                value = "None"
+            out.append((qname, value))
+        return out
+
+    def _stop_author_text(self) -> None:
+        self._author_text = None
+        self._parser.CharacterDataHandler = None
+        self._parser.EndElementHandler = None
+
+    def _end(self, name: str) -> None:
+        self._seen = self._parser.CurrentByteIndex
+        if self._skip_depth:
+            self._skip_depth -= 1
+            if not self._skip_depth:
+                if not self._skip_self_closing:
+                    self._drop_upto(self._tag_end(self._seen))
+                self._parser.EndElementHandler = None
+            return
+
+        if self._author_text is not None:
+            text = "".join(self._author_text)
+            self._stop_author_text()
+            if text.strip():
+                self._emit_upto(self._author_text_start)
+                self._dst.write(_quote(self._replace_name(text)).encode("utf-8"))
+                self._drop_upto(self._seen)
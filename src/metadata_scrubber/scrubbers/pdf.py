@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import io
+import itertools
+import os
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 from pypdf import PdfReader, PdfWriter
-from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject
+from pypdf.errors import PdfReadError
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    StreamObject,
+    TextStringObject,
+)
 
-from .base import ScrubOptions, Scrubber
+from ..formats.jpeg import strip_metadata_segments
+from ..utils import open_mapped
+from .base import ResourceLimitExceeded, ScrubOptions, Scrubber
 
 
 class PdfScrubber(Scrubber):
@@ -14,18 +31,97 @@ class PdfScrubber(Scrubber):
     def can_handle(self, path: Path) -> bool:
         return path.suffix.lower() == ".pdf"
 
-    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:
-        reader = PdfReader(str(src))
-        writer = PdfWriter()
+    def estimate_memory(self, path: Path) -> int:
+        # pypdf keeps the parsed object graph alive, typically several times the file size.
+        return 8 * path.stat().st_size + 16 * 1024 * 1024
 
-        for page in reader.pages:
-            _sanitize_page(page, aggressive=options.pdf_aggressive)
-            writer.add_page(page)
+    def check_limits(self, path: Path, *, options: ScrubOptions) -> None:
+        if options.pdf_max_objects is not None or options.pdf_max_stream is not None:
+            with open_mapped(path) as stream:
+                size = _stream_size(stream)
+                _check_pdf_budget(PdfReader(stream), stream, size, options)
 
-        _sanitize_writer(writer, aggressive=options.pdf_aggressive)
+    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> str | None:
+        # The reader resolves objects lazily, so the mapping must outlive the write.
+        with open_mapped(src) as stream, open(dst, "wb") as f:
+            stats = _scrub_pdf(stream, f, options=options)
+        if stats.keys_removed:
+            return (
+                f"deep scrub removed {stats.keys_removed} key(s) "
+                f"from {stats.objects_visited} object(s) visited"
+            )
+        return None
 
-        with open(dst, "wb") as f:
-            writer.write(f)
+    def scrub_bytes(self, data: bytes, name: str, *, options: ScrubOptions) -> bytes:
+        out = io.BytesIO()
+        _scrub_pdf(io.BytesIO(data), out, options=options)
+        return out.getvalue()
+
+
+def _scrub_pdf(stream, out, *, options: ScrubOptions) -> DeepScrubStats:
+    size = _stream_size(stream)
+    reader = PdfReader(stream)
+    _check_pdf_budget(reader, stream, size, options)
+    writer = PdfWriter()
+
+    for page in reader.pages:
+        _sanitize_page(page, aggressive=options.pdf_aggressive)
+        writer.add_page(page)
+
+    stats = _sanitize_writer(writer, aggressive=options.pdf_aggressive)
+    _strip_embedded_jpegs(writer)
+    if options.pdf_compact:
+        _compact_writer(writer)
+    _drop_unreachable(writer)
+
+    writer.write(out)
+    return stats
+
+
+def _stream_size(stream) -> int:
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _check_pdf_budget(reader: PdfReader, stream, size: int, options: ScrubOptions) -> None:
+    """Reject a PDF by its cross-reference table, before any object is parsed.
+
+    An object can't extend past the next object or xref section, so the gaps
+    between offsets bound every stream's size without reading one. Bytes of
+    superseded revisions only make that bound larger.
+    """
+    offsets = {off for by_generation in reader.xref.values() for off in by_generation.values()}
+    count = len(offsets) + len(reader.xref_objStm)
+    if options.pdf_max_objects is not None and count > options.pdf_max_objects:
+        raise ResourceLimitExceeded(f"PDF has {count} objects, over the {options.pdf_max_objects} object budget")
+
+    if options.pdf_max_stream is not None:
+        startxref = _startxref(stream, size)
+        bounds = sorted(offsets | {size} | ({startxref} if startxref is not None else set()))
+        largest = max((end - start for start, end in itertools.pairwise(bounds) if start in offsets), default=0)
+        if largest > options.pdf_max_stream:
+            raise ResourceLimitExceeded(
+                f"PDF has an object of up to {largest} bytes, over the {options.pdf_max_stream} byte budget"
+            )
+
+
+# The trailer ends with "startxref", the offset of the last xref section, and
+# "%%EOF"; 1 KiB comfortably covers it plus trailing whitespace.
+_STARTXREF_TAIL = 1024
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+
+
+def _startxref(stream, size: int) -> int | None:
+    """Offset of the last cross-reference section, read from the file's tail."""
+    pos = stream.tell()
+    try:
+        stream.seek(max(0, size - _STARTXREF_TAIL))
+        matches = _STARTXREF_RE.findall(stream.read())
+    finally:
+        stream.seek(pos)
+    return int(matches[-1]) if matches else None
 
 
 def _sanitize_page(page, *, aggressive: bool) -> None:
@@ -47,7 +143,7 @@ def _sanitize_page(page, *, aggressive: bool) -> None:
                 pass
 
 
-def _sanitize_writer(writer: PdfWriter, *, aggressive: bool) -> None:
+def _sanitize_writer(writer: PdfWriter, *, aggressive: bool) -> DeepScrubStats:
     # Best-effort removal of document info (/Info), XMP metadata streams, and
     # other root-level structures that often contain identifying information.
     try:
@@ -100,54 +196,178 @@ def _sanitize_writer(writer: PdfWriter, *, aggressive: bool) -> None:
         pass
 
     # Deep scrub: traverse copied objects and delete any lingering metadata keys.
-    keys_to_delete = {"/Metadata", "/PieceInfo", "/LastModified"}
-    if aggressive:
-        keys_to_delete |= {"/CreationDate", "/ModDate", "/Creator", "/Producer"}
+    keys = _DEEP_KEYS_AGGRESSIVE if aggressive else _DEEP_KEYS
+    return _deep_delete_keys(writer._root_object, keys)  # type: ignore[attr-defined]
 
-    try:
-        _deep_delete_keys(writer._root_object, keys_to_delete, aggressive=aggressive)  # type: ignore[attr-defined]
-    except Exception:
-        pass
+
+# Below this many images the thread pool costs more than it saves.
+_JPEG_POOL_THRESHOLD = 32
 
 
-def _deep_delete_keys(obj, keys_to_delete: set[str], *, aggressive: bool, _seen: set[int] | None = None) -> None:
-    if _seen is None:
-        _seen = set()
+def _strip_embedded_jpegs(writer: PdfWriter) -> int:
+    """Strip EXIF/XMP/IPTC/COM segments from DCTDecode image XObjects.
 
+    Operates on the encoded JPEG bytes at the marker level, so pixels are
+    never decoded or re-encoded. Returns the number of images changed.
+    """
+    images = []
+    for obj in writer._objects:  # type: ignore[attr-defined]
+        if not isinstance(obj, StreamObject) or obj.get("/Subtype") != "/Image":
+            continue
+        # Per-image XMP; the deep scrub would catch it too, but be explicit.
+        if "/Metadata" in obj:
+            del obj["/Metadata"]
+        # Only plain JPEG streams: with a filter chain the bytes aren't a JPEG file.
+        if obj.get("/Filter") in ("/DCTDecode", ArrayObject([NameObject("/DCTDecode")])):
+            images.append(obj)
+
+    if len(images) >= _JPEG_POOL_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+            stripped = list(pool.map(_strip_jpeg_or_keep, (img._data for img in images)))
+    else:
+        stripped = [_strip_jpeg_or_keep(img._data) for img in images]
+
+    changed = 0
+    for img, data in zip(images, stripped):
+        if data is not img._data:
+            img._data = data
+            # Drop any cached decoded copy of the old bytes.
+            if getattr(img, "decoded_self", None) is not None:
+                img.decoded_self = None
+            changed += 1
+    return changed
+
+
+def _strip_jpeg_or_keep(data: bytes) -> bytes:
     try:
+        return strip_metadata_segments(data)
+    except ValueError:
+        # Not parseable as a JPEG header; leave the stream alone.
+        return data
+
+
+def _compact_writer(writer: PdfWriter) -> None:
+    # The writer always emits a single revision (and _drop_unreachable keeps
+    # only objects reachable from the new root), so old incremental updates
+    # never survive. Compact mode additionally shrinks what is left.
+    for page in writer.pages:
+        if "/Contents" not in page:
+            continue
+        try:
+            page.compress_content_streams()
+        except Exception:
+            pass
+
+    objects = writer._objects  # type: ignore[attr-defined]
+    for i, obj in enumerate(objects):
+        if isinstance(obj, StreamObject) and "/Filter" not in obj:
+            # Indirect references resolve through this list, so swap in place.
+            try:
+                encoded = obj.flate_encode()
+            except (PdfReadError, TypeError, ValueError):
+                continue
+            encoded.indirect_reference = obj.indirect_reference
+            objects[i] = encoded
+
+    # pypdf insists on an /Info object while merging, so lend it a
+    # uniquely-keyed placeholder (it can't be merged with anything) and drop
+    # it again afterwards.
+    had_info = writer._info is not None  # type: ignore[attr-defined]
+    if not had_info:
+        writer._info = DictionaryObject(  # type: ignore[attr-defined]
+            {NameObject("/Placeholder"): TextStringObject(secrets.token_hex(8))}
+        )
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=False)
+    if not had_info:
+        writer._info = None  # type: ignore[attr-defined]
+
+
+def _drop_unreachable(writer: PdfWriter) -> int:
+    """Drop objects no longer reachable from the document root.
+
+    The writer emits every object it holds, including ones the sanitizer just
+    unlinked (for example a page-level XMP stream), so they must be removed
+    explicitly. Returns the number of objects dropped.
+    """
+    objects = writer._objects  # type: ignore[attr-defined]
+    reachable: set[int] = set()
+    stack: list = [writer._root_object.indirect_reference]  # type: ignore[attr-defined]
+    if writer._info is not None:  # type: ignore[attr-defined]
+        stack.append(writer._info_obj)  # type: ignore[attr-defined]
+
+    while stack:
+        obj = stack.pop()
         if isinstance(obj, IndirectObject):
-            real = obj.get_object()
-            oid = id(real)
-            if oid in _seen:
-                return
-            _seen.add(oid)
-            _deep_delete_keys(real, keys_to_delete, aggressive=aggressive, _seen=_seen)
-            return
+            if obj.pdf is not writer or obj.idnum in reachable:
+                continue
+            reachable.add(obj.idnum)
+            obj = objects[obj.idnum - 1]
 
         if isinstance(obj, DictionaryObject):
-            for k in list(obj.keys()):
-                if k in keys_to_delete:
-                    try:
-                        del obj[k]
-                    except Exception:
-                        pass
-
-            # Aggressive: drop annotation arrays and form actions anywhere they appear.
-            if aggressive:
-                for k in ("/Annots", "/AA", "/OpenAction"):
-                    if k in obj:
-                        try:
-                            del obj[k]
-                        except Exception:
-                            pass
-
-            for v in list(obj.values()):
-                _deep_delete_keys(v, keys_to_delete, aggressive=aggressive, _seen=_seen)
-            return
-
-        if isinstance(obj, ArrayObject):
-            for item in list(obj):
-                _deep_delete_keys(item, keys_to_delete, aggressive=aggressive, _seen=_seen)
-            return
-    except Exception:
-        return
+            stack.extend(obj.values())
+        elif isinstance(obj, ArrayObject):
+            stack.extend(obj)
+
+    dropped = 0
+    for i, obj in enumerate(objects):
+        if obj is not None and (i + 1) not in reachable:
+            objects[i] = None
+            dropped += 1
+    return dropped
+
+
+_DEEP_KEYS = frozenset({"/Metadata", "/PieceInfo", "/LastModified"})
+# Aggressive mode also drops dates/tool names and annotation/action entries anywhere.
+_DEEP_KEYS_AGGRESSIVE = _DEEP_KEYS | {
+    "/CreationDate",
+    "/ModDate",
+    "/Creator",
+    "/Producer",
+    "/Annots",
+    "/AA",
+    "/OpenAction",
+}
+
+
+@dataclass
+class DeepScrubStats:
+    objects_visited: int = 0
+    keys_removed: int = 0
+
+
+def _deep_delete_keys(root, keys_to_delete: frozenset[str]) -> DeepScrubStats:
+    """Delete keys_to_delete from every dictionary reachable from root.
+
+    Uses an explicit stack, so deep page trees or long linked structures can't
+    hit the recursion limit, and visits each indirect object once, keyed by
+    its (idnum, generation) within the owning document.
+    """
+    stats = DeepScrubStats()
+    seen: set[tuple[int, int, int]] = set()
+    stack = [root]
+
+    while stack:
+        obj = stack.pop()
+
+        if isinstance(obj, IndirectObject):
+            ref = (id(obj.pdf), obj.idnum, obj.generation)
+            if ref in seen:
+                continue
+            seen.add(ref)
+            try:
+                obj = obj.get_object()
+            except (PdfReadError, IndexError, KeyError, ValueError):
+                # Dangling or unreadable reference; nothing to scrub behind it.
+                continue
+
+        if isinstance(obj, DictionaryObject):
+            stats.objects_visited += 1
+            for k in [k for k in obj if k in keys_to_delete]:
+                del obj[k]
+                stats.keys_removed += 1
+            stack.extend(obj.values())
+        elif isinstance(obj, ArrayObject):
+            stats.objects_visited += 1
+            stack.extend(obj)
+
+    return stats
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import shutil
-import subprocess
 from pathlib import Path
 
+from ..utils import run_tool
 from .base import ScrubOptions, Scrubber
 
 
@@ -15,7 +15,14 @@ class VideoScrubber(Scrubber):
     def can_handle(self, path: Path) -> bool:
         return path.suffix.lower() in self._exts
 
-    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:  # noqa: ARG002
+    def missing_dependency(self) -> str | None:
+        return None if shutil.which("ffmpeg") else "ffmpeg not found"
+
+    def estimate_memory(self, path: Path) -> int:
+        # Stream copy in a separate ffmpeg process: fixed-size buffers, not the file size.
+        return 64 * 1024 * 1024
+
+    def scrub(self, src: Path, dst: Path, *, options: ScrubOptions) -> None:
         ffmpeg = shutil.which("ffmpeg")
         if not ffmpeg:
             raise RuntimeError(
@@ -67,4 +74,4 @@ class VideoScrubber(Scrubber):
             str(dst),
         ]
 
-        subprocess.run(cmd, check=True)
+        run_tool(cmd, timeout=options.tool_timeout)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+from collections.abc import Sequence
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse ``"I/N"`` (0 <= I < N) into ``(index, count)``."""
+    try:
+        index_s, count_s = spec.split("/", 1)
+        index, count = int(index_s), int(count_s)
+    except ValueError:
+        raise ValueError(f"invalid shard {spec!r} (expected I/N, e.g. 0/4)") from None
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"invalid shard {spec!r} (need 0 <= I < N)")
+    return index, count
+
+
+def assign_shards(keys: Sequence[str], count: int, *, sizes: Sequence[int] | None = None) -> list[int]:
+    """Assign each key to a shard in ``range(count)``.
+
+    Keys are relative paths, so every node computes the same assignment no
+    matter where the share is mounted. Without sizes, each key goes to a
+    shard by a stable hash. With sizes, files are dealt largest-first to the
+    least-loaded shard (ties broken by key), which balances bytes per shard.
+    """
+    if sizes is None:
+        return [_stable_hash(k) % count for k in keys]
+
+    order = sorted(range(len(keys)), key=lambda i: (-sizes[i], keys[i]))
+    loads = [(0, shard) for shard in range(count)]
+    assignment = [0] * len(keys)
+    for i in order:
+        load, shard = heapq.heappop(loads)
+        assignment[i] = shard
+        heapq.heappush(loads, (load + sizes[i], shard))
+    return assignment
+
+
+def _stable_hash(key: str) -> int:
+    # Python's hash() is salted per process; use a real digest instead.
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
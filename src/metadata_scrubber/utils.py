@@ -1,18 +1,86 @@
 from __future__ import annotations
 
+import glob
+import mmap
 import os
+import re
+import secrets
 import shutil
+import subprocess
 import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
+from typing import BinaryIO
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(spec: str) -> int:
+    """Parse a byte size like ``"512M"``, ``"4G"``, ``"4GiB"`` or ``"1048576"``."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", spec, flags=re.IGNORECASE)
+    if m is None:
+        raise ValueError(f"invalid size: {spec!r}")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).upper()])
+
+
+# Set by the asyncio API for work on its executor threads, so that external
+# tools run as asyncio subprocesses on the event loop (and can be killed).
+tool_runner: ContextVar[Callable[[list[str], bool, float | None], bytes] | None] = ContextVar(
+    "tool_runner", default=None
+)
+
+
+def run_tool(cmd: list[str], *, capture: bool = False, timeout: float | None = None) -> bytes:
+    """Run an external tool (ffmpeg, ffprobe) to completion.
+
+    Returns its stdout when capture is set. Raises CalledProcessError on a
+    non-zero exit, and kills the tool and raises TimeoutExpired once it has
+    run for timeout seconds.
+    """
+    runner = tool_runner.get()
+    if runner is not None:
+        return runner(cmd, capture, timeout)
+    if capture:
+        return subprocess.check_output(cmd, timeout=timeout)
+    subprocess.run(cmd, check=True, timeout=timeout)
+    return b""
 
 
 def ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def atomic_replace(src_tmp: Path, dst: Path) -> None:
-    # os.replace is atomic on POSIX when src and dst are on same filesystem.
+def atomic_replace(src_tmp: Path, dst: Path, *, durable: bool = False) -> None:
+    """Move src_tmp over dst in one step.
+
+    os.replace is atomic on POSIX when both are on the same filesystem. With
+    durable set, the data is fsynced first and the directory entry after, so
+    the new file also survives a power loss (one file at a time; see
+    durability.GroupCommit for batches).
+    """
+    if durable:
+        with open(src_tmp, "rb") as f:
+            os.fsync(f.fileno())
     os.replace(src_tmp, dst)
+    if durable:
+        fsync_dir(dst.parent)
+
+
+def fsync_dir(path: Path) -> None:
+    """Persist a directory's entries (renames, new files); a no-op where unsupported."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Windows can't open directories; NTFS journals renames itself.
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 
 def copy_bytes(src: Path, dst: Path) -> None:
@@ -20,6 +88,70 @@ def copy_bytes(src: Path, dst: Path) -> None:
     shutil.copyfile(src, dst)
 
 
+# Linux ioctl that makes dst share src's extents (btrfs, XFS, bcachefs, ...).
+_FICLONE = 0x40049409
+
+
+def clone_or_copy(src: Path, dst: Path) -> None:
+    """Copy src to dst, using a reflink when the filesystem supports it.
+
+    A reflink is a metadata-only operation, so it costs the same for a 1 KB
+    file and a 10 GB file. Falls back to a regular byte copy.
+    """
+    ensure_parent_dir(dst)
+    if not _try_reflink(src, dst):
+        shutil.copyfile(src, dst)
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def link_replace(target: Path, dst: Path) -> None:
+    """Atomically make dst a hard link to target."""
+    ensure_parent_dir(dst)
+    tmp = dst.with_name(f".{dst.name}.{secrets.token_hex(6)}.tmp")
+    os.link(target, tmp)
+    try:
+        os.replace(tmp, dst)
+    finally:
+        # rename() is a no-op when dst already links to target; drop the extra name.
+        if tmp.exists():
+            tmp.unlink()
+
+
+@contextmanager
+def open_mapped(path: Path) -> Iterator[BinaryIO | mmap.mmap]:
+    """Open path read-only, memory-mapped where possible.
+
+    Readers such as pypdf copy the whole file into memory when given a path;
+    with an mmap the OS only pages in the parts that are actually read.
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some special files can't be mapped.
+            mapped = None
+
+        if mapped is None:
+            yield f
+            return
+
+        with mapped:
+            yield mapped
+
+
 def preserve_stat(src: Path, dst: Path, *, preserve_times: bool, preserve_perms: bool) -> None:
     st = src.stat()
     if preserve_perms:
@@ -78,3 +210,15 @@ class TempPath:
                 self.path.unlink()
         except OSError:
             pass
+
+
+def remove_temp_files(dst: Path) -> list[Path]:
+    """Remove TempPath files for dst left behind by a killed process."""
+    removed = []
+    for p in dst.parent.glob(f".{glob.escape(dst.name)}.*.tmp"):
+        try:
+            p.unlink()
+            removed.append(p)
+        except OSError:
+            pass
+    return removed
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import io
 import json
 import os
+import re
 import shutil
-import subprocess
 import zipfile
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
 from defusedxml import ElementTree as DefusedET
 from PIL import ExifTags, Image
 from pypdf import PdfReader
+from pypdf.generic import IndirectObject
+
+from .formats import ebml, isobmff
+from .formats.image_headers import scan_image_headers
+from .formats.zip import read_central_directory
+from .residual import build_patterns, scan_file
+from .utils import open_mapped, run_tool
+
+if TYPE_CHECKING:
+    from .verify_cache import VerifyCache
+
+# Bump whenever a verifier's logic or result details change; cached results
+# from other versions are ignored.
+VERIFIER_VERSION = 5
 
 
 class VerifyStatus(str, Enum):
@@ -35,36 +50,92 @@ class VerifyResult:
 class VerifyOptions:
     recursive: bool = True
     show_values: bool = False
-
-
-def verify_paths(paths: Iterable[Path], options: VerifyOptions) -> list[VerifyResult]:
+    # Only look at document-level structures; cost independent of file size.
+    fast: bool = False
+    # Also search the raw bytes for metadata signatures and these strings.
+    deep_scan: bool = False
+    scan_strings: tuple[str, ...] = ()
+
+
+def verify_paths(
+    paths: Iterable[Path],
+    options: VerifyOptions,
+    *,
+    cache: VerifyCache | None = None,
+) -> list[VerifyResult]:
     results: list[VerifyResult] = []
 
     for root in paths:
         root = root.expanduser()
-        for p in _iter_files(root, recursive=options.recursive):
-            results.append(verify_file(p, options=options))
+        for p in iter_files(root, recursive=options.recursive):
+            if cache is None:
+                results.append(verify_file(p, options=options))
+                continue
+
+            # Stat before verifying: a file changed meanwhile misses next time.
+            try:
+                st = p.stat()
+            except OSError:
+                results.append(verify_file(p, options=options))
+                continue
+            result = cache.get(p, st)
+            if result is None:
+                result = verify_file(p, options=options)
+                cache.put(result, st)
+            results.append(result)
 
     return results
 
 
+_KINDS_BY_EXT = {
+    **dict.fromkeys((".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp"), "image"),
+    ".pdf": "pdf",
+    **dict.fromkeys((".docx", ".xlsx", ".pptx"), "openxml"),
+    **dict.fromkeys((".mp3", ".flac", ".m4a", ".ogg"), "audio"),
+    **dict.fromkeys((".mp4", ".mov", ".m4v", ".mkv", ".avi", ".webm"), "video"),
+}
+
+
+def verifier_kind(path: Path) -> str | None:
+    """The verifier that handles path (by extension), or None if unsupported."""
+    return _KINDS_BY_EXT.get(path.suffix.lower())
+
+
 def verify_file(path: Path, *, options: VerifyOptions) -> VerifyResult:
-    ext = path.suffix.lower()
+    result = _verify_structured(path, options=options)
+    if not options.deep_scan or result.status == VerifyStatus.ERROR:
+        return result
 
     try:
-        if ext in {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp"}:
+        hits = scan_file(path, build_patterns(options.scan_strings))
+    except Exception as e:  # noqa: BLE001
+        return VerifyResult(path=path, status=VerifyStatus.ERROR, kind=result.kind, message=str(e))
+
+    details = dict(result.details)
+    details["residual"] = {name: {"offsets": h.offsets, "truncated": h.truncated} for name, h in hits.items()}
+    # Unsupported types stay "unsupported" when nothing turns up: the scan
+    # alone can't vouch for a format it doesn't understand.
+    status = VerifyStatus.METADATA_FOUND if hits else result.status
+    return VerifyResult(path=path, status=status, kind=result.kind, details=details, message=result.message)
+
+
+def _verify_structured(path: Path, *, options: VerifyOptions) -> VerifyResult:
+    kind = verifier_kind(path)
+
+    try:
+        if kind == "image":
             return _verify_image(path, options=options)
 
-        if ext == ".pdf":
-            return _verify_pdf(path)
+        if kind == "pdf":
+            return _verify_pdf(path, options=options)
 
-        if ext in {".docx", ".xlsx", ".pptx"}:
+        if kind == "openxml":
             return _verify_openxml(path, options=options)
 
-        if ext in {".mp3", ".flac", ".m4a", ".ogg"}:
+        if kind == "audio":
             return _verify_audio(path)
 
-        if ext in {".mp4", ".mov", ".m4v", ".mkv", ".avi", ".webm"}:
+        if kind == "video":
             return _verify_video(path)
 
         return VerifyResult(path=path, status=VerifyStatus.UNSUPPORTED)
@@ -73,7 +144,8 @@ def verify_file(path: Path, *, options: VerifyOptions) -> VerifyResult:
         return VerifyResult(path=path, status=VerifyStatus.ERROR, message=str(e))
 
 
-def _iter_files(root: Path, *, recursive: bool) -> Iterable[Path]:
+def iter_files(root: Path, *, recursive: bool) -> Iterable[Path]:
+    """Files under root in the order verify_paths visits them (symlinks skipped)."""
     if root.is_file():
         if not root.is_symlink():
             yield root
@@ -82,25 +154,31 @@ def _iter_files(root: Path, *, recursive: bool) -> Iterable[Path]:
     if not root.is_dir():
         return
 
-    if recursive:
-        for dirpath, dirnames, filenames in os.walk(root):
-            dirnames[:] = [d for d in dirnames if d not in {".git", ".venv", "__pycache__"}]
-            base = Path(dirpath)
-            for fn in filenames:
-                p = base / fn
-                if p.is_symlink():
+    # scandir reports entry types from the directory listing, so walking
+    # costs no per-file stat (os.walk order: files first, then subdirectories).
+    stack = [root]
+    while stack:
+        subdirs: list[Path] = []
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does.
+            continue
+        with it:
+            for entry in it:
+                if entry.is_symlink():
                     continue
-                if p.is_file():
-                    yield p
-    else:
-        for p in root.iterdir():
-            if p.is_symlink():
-                continue
-            if p.is_file():
-                yield p
+                if entry.is_file():
+                    yield Path(entry.path)
+                elif recursive and entry.is_dir() and entry.name not in {".git", ".venv", "__pycache__"}:
+                    subdirs.append(Path(entry.path))
+        stack.extend(reversed(subdirs))
 
 
 def _verify_image(path: Path, *, options: VerifyOptions) -> VerifyResult:
+    if options.fast and not options.show_values:
+        return _verify_image_headers(path)
+
     with Image.open(path) as img:
         exif = img.getexif()
         exif_tags: dict[str, Any] = {}
@@ -136,8 +214,30 @@ def _verify_image(path: Path, *, options: VerifyOptions) -> VerifyResult:
         return VerifyResult(path=path, kind="image", status=status, details=details)
 
 
-def _verify_pdf(path: Path) -> VerifyResult:
-    r = PdfReader(str(path))
+def _verify_image_headers(path: Path) -> VerifyResult:
+    # Walks JPEG segments / PNG, RIFF chunks / TIFF IFDs and seeks over
+    # everything else, so the cost doesn't grow with the image size.
+    with path.open("rb") as f:
+        scan = scan_image_headers(f)
+
+    status = VerifyStatus.METADATA_FOUND if scan.blocks else VerifyStatus.CLEAN
+    details = {
+        "format": scan.format,
+        "metadata_blocks": scan.blocks,
+        "header_bytes_read": scan.bytes_read,
+    }
+    return VerifyResult(path=path, kind="image", status=status, details=details)
+
+
+def _verify_pdf(path: Path, *, options: VerifyOptions) -> VerifyResult:
+    with open_mapped(path) as stream:
+        return _verify_pdf_stream(path, stream, options=options)
+
+
+def _verify_pdf_stream(path: Path, stream, *, options: VerifyOptions) -> VerifyResult:
+    # pypdf parses the xref up front but resolves objects lazily, so the fast
+    # tier below only touches the trailer, /Info and /Root.
+    r = PdfReader(stream)
 
     md = dict(r.metadata or {})
     md_keys = sorted(md.keys())
@@ -162,16 +262,19 @@ def _verify_pdf(path: Path) -> VerifyResult:
 
     page_pieceinfo = 0
     page_annots = 0
-    try:
-        for page in r.pages:
-            if "/PieceInfo" in page:
-                page_pieceinfo += 1
-            if "/Annots" in page:
-                page_annots += 1
-    except Exception:
-        pass
+    jpeg_metadata_images = 0
+    if not options.fast:
+        try:
+            for page in r.pages:
+                if "/PieceInfo" in page:
+                    page_pieceinfo += 1
+                if "/Annots" in page:
+                    page_annots += 1
+        except Exception:
+            pass
+        jpeg_metadata_images = _count_jpeg_metadata_images(r)
 
-    found = bool(md_keys) or has_root_metadata or page_pieceinfo > 0
+    found = bool(md_keys) or has_root_metadata or page_pieceinfo > 0 or jpeg_metadata_images > 0
     status = VerifyStatus.METADATA_FOUND if found else VerifyStatus.CLEAN
 
     details = {
@@ -180,55 +283,170 @@ def _verify_pdf(path: Path) -> VerifyResult:
         "names_keys": names_keys,
         "page_pieceinfo_count": page_pieceinfo,
         "page_annots_count": page_annots,
+        "jpeg_metadata_images": jpeg_metadata_images,
+        "pages_checked": not options.fast,
     }
 
     return VerifyResult(path=path, kind="pdf", status=status, details=details)
 
 
-def _verify_openxml(path: Path, *, options: VerifyOptions) -> VerifyResult:
-    with zipfile.ZipFile(path, "r") as z:
-        names = set(z.namelist())
+def _count_jpeg_metadata_images(reader: PdfReader) -> int:
+    """Count the JPEG (DCTDecode) images on any page that carry APPn/COM segments.
+
+    Follows page and form XObject resources. Only the JPEG headers are read,
+    never the scan data.
+    """
+    count = 0
+    seen: set[int] = set()
+    stack = [page.get("/Resources") for page in reader.pages]
+    while stack:
+        resources = stack.pop()
+        if isinstance(resources, IndirectObject):
+            resources = resources.get_object()
+        if not hasattr(resources, "get"):
+            continue
+        xobjects = resources.get("/XObject")
+        if isinstance(xobjects, IndirectObject):
+            xobjects = xobjects.get_object()
+        if not hasattr(xobjects, "values"):
+            continue
+
+        for ref in xobjects.values():
+            if isinstance(ref, IndirectObject):
+                if ref.idnum in seen:
+                    continue
+                seen.add(ref.idnum)
+            xobj = ref.get_object()
+            subtype = xobj.get("/Subtype")
+            if subtype == "/Form":
+                stack.append(xobj.get("/Resources"))
+            elif subtype == "/Image" and xobj.get("/Filter") in ("/DCTDecode", ["/DCTDecode"]):
+                # Same selection as the scrubber: with a filter chain the bytes aren't a JPEG file.
+                try:
+                    scan = scan_image_headers(io.BytesIO(xobj._data))
+                except ValueError:
+                    continue
+                if scan.blocks:
+                    count += 1
+    return count
 
-        docprops = [
-            p
-            for p in ["docProps/core.xml", "docProps/app.xml", "docProps/custom.xml"]
-            if p in names
-        ]
 
-        core_fields: list[str] = []
-        if "docProps/core.xml" in names:
-            try:
-                raw = z.read("docProps/core.xml")
-                root = DefusedET.fromstring(raw)
-                for el in root.iter():
-                    # Element tags are namespaced: {ns}local
-                    if "}" in el.tag:
-                        local = el.tag.split("}", 1)[1]
-                    else:
-                        local = el.tag
-                    if (el.text or "").strip() == "":
-                        continue
-                    core_fields.append(local)
-                core_fields = sorted(set(core_fields))
-            except Exception:
-                core_fields = ["<unreadable>"]
-
-        # ZIP entry timestamps can carry metadata; most scrubbers normalize them.
-        ts = {info.date_time for info in z.infolist()}
-        normalized_ts = (1980, 1, 1, 0, 0, 0)
-        non_normalized_ts_count = sum(1 for t in ts if t != normalized_ts)
-
-        found = bool(docprops) or non_normalized_ts_count > 0
-        status = VerifyStatus.METADATA_FOUND if found else VerifyStatus.CLEAN
+def _verify_openxml(path: Path, *, options: VerifyOptions) -> VerifyResult:
+    deep = not options.fast or options.show_values
+
+    core_fields: list[str] = []
+    core_values: dict[str, str] = {}
+    media_with_metadata: list[str] = []
+    media_unchecked: list[str] = []
+    if deep:
+        with zipfile.ZipFile(path, "r") as z:
+            infos = z.infolist()
+            names = [info.filename for info in infos]
+            timestamps = [info.date_time for info in infos]
+            if "docProps/core.xml" in names:
+                try:
+                    core_values = _core_properties(z.read("docProps/core.xml"))
+                    core_fields = sorted(core_values)
+                except Exception:
+                    core_fields = ["<unreadable>"]
+            media_with_metadata, media_unchecked = _check_openxml_media(z, infos)
+    else:
+        # The answer only depends on member names and timestamps, which the
+        # central directory at the end of the file has on its own.
+        with path.open("rb") as f:
+            entries = read_central_directory(f)
+        names = [e.name for e in entries]
+        timestamps = [e.date_time for e in entries]
+
+    docprops = [
+        p
+        for p in ["docProps/core.xml", "docProps/app.xml", "docProps/custom.xml"]
+        if p in names
+    ]
 
-        details: dict[str, Any] = {
-            "docprops_present": docprops,
-            "core_fields": core_fields,
-            "unique_zip_timestamps": len(ts),
-            "non_normalized_zip_timestamps": non_normalized_ts_count,
-        }
+    # ZIP entry timestamps can carry metadata; most scrubbers normalize them.
+    ts = set(timestamps)
+    normalized_ts = (1980, 1, 1, 0, 0, 0)
+    non_normalized_ts_count = sum(1 for t in ts if t != normalized_ts)
+
+    # Comment parts carry reviewers' names and text, which scrubbing keeps;
+    # media_count is informational (embedded images are judged by their headers).
+    comment_parts = sum(1 for n in names if _OPENXML_COMMENT_PARTS.match(n))
+    found = (
+        bool(docprops)
+        or non_normalized_ts_count > 0
+        or comment_parts > 0
+        or bool(media_with_metadata)
+    )
+    status = VerifyStatus.METADATA_FOUND if found else VerifyStatus.CLEAN
 
-        return VerifyResult(path=path, kind="openxml", status=status, details=details)
+    details: dict[str, Any] = {
+        "docprops_present": docprops,
+        "core_fields": core_fields,
+        "unique_zip_timestamps": len(ts),
+        "non_normalized_zip_timestamps": non_normalized_ts_count,
+        "comment_parts": comment_parts,
+        "media_count": sum(1 for n in names if n.startswith(_OPENXML_MEDIA_DIRS)),
+        "media_with_metadata": media_with_metadata,
+        "media_unchecked": media_unchecked,
+        "parts_parsed": deep,
+    }
+    if options.show_values and core_values:
+        details["core_values"] = core_values
+
+    return VerifyResult(path=path, kind="openxml", status=status, details=details)
+
+
+_OPENXML_COMMENT_PARTS = re.compile(
+    r"^(?:word/comments\w*\.xml|xl/comments\d*\.xml|xl/threadedComments/|ppt/comments/|ppt/commentAuthors\.xml)"
+)
+_OPENXML_MEDIA_DIRS = ("word/media/", "ppt/media/", "xl/media/")
+
+
+def _check_openxml_media(z: zipfile.ZipFile, infos: list[zipfile.ZipInfo]) -> tuple[list[str], list[str]]:
+    """Embedded images with metadata blocks, and embedded files that weren't checked.
+
+    Images are checked by their headers alone. Other embedded files the
+    scrubber would process (video, audio, nested packages and PDFs) are
+    listed as unchecked. Files no scrubber handles are ignored.
+    """
+    with_metadata: list[str] = []
+    unchecked: list[str] = []
+    for info in infos:
+        name = info.filename
+        if info.is_dir() or not (name.startswith(_OPENXML_MEDIA_DIRS) or "/embeddings/" in name):
+            continue
+        kind = verifier_kind(Path(name))
+        if kind is None:
+            continue
+        if kind != "image":
+            unchecked.append(name)
+            continue
+        try:
+            with z.open(info) as f:
+                scan = scan_image_headers(f)
+        except ValueError:
+            unchecked.append(name)
+            continue
+        if scan.blocks:
+            with_metadata.append(name)
+    return with_metadata, unchecked
+
+
+def _core_properties(raw: bytes) -> dict[str, str]:
+    root = DefusedET.fromstring(raw)
+    values: dict[str, str] = {}
+    for el in root.iter():
+        # Element tags are namespaced: {ns}local
+        if "}" in el.tag:
+            local = el.tag.split("}", 1)[1]
+        else:
+            local = el.tag
+        text = (el.text or "").strip()
+        if text == "":
+            continue
+        values[local] = _safe_str(text)
+    return values
 
 
 def _verify_audio(path: Path) -> VerifyResult:
@@ -258,7 +476,26 @@ def _verify_audio(path: Path) -> VerifyResult:
     return VerifyResult(path=path, kind="audio", status=status, details={"tag_keys": keys})
 
 
+# Containers whose header metadata is read in-process; others go to ffprobe.
+_NATIVE_VIDEO_PROBES = {
+    **dict.fromkeys((".mp4", ".mov", ".m4v"), isobmff.probe_tags),
+    **dict.fromkeys((".mkv", ".webm"), ebml.probe_tags),
+}
+
+
 def _verify_video(path: Path) -> VerifyResult:
+    probe = _NATIVE_VIDEO_PROBES.get(path.suffix.lower())
+    if probe is not None:
+        try:
+            with path.open("rb") as f:
+                format_keys, stream_tags = probe(f)
+        except ValueError:
+            # Mislabelled or unusual files still get a verdict when ffprobe is around.
+            if not shutil.which("ffprobe"):
+                raise
+        else:
+            return _video_result(path, format_keys, stream_tags, probe="native")
+
     ffprobe = shutil.which("ffprobe")
     if not ffprobe:
         return VerifyResult(
@@ -278,7 +515,7 @@ def _verify_video(path: Path) -> VerifyResult:
         "-show_streams",
         str(path),
     ]
-    out = subprocess.check_output(cmd)
+    out = run_tool(cmd, capture=True)
     data = json.loads(out.decode("utf-8", errors="replace"))
 
     format_tags = data.get("format", {}).get("tags") or {}
@@ -288,16 +525,22 @@ def _verify_video(path: Path) -> VerifyResult:
         if tags:
             stream_tags[str(idx)] = sorted(tags.keys())
 
-    found = bool(format_tags) or bool(stream_tags)
-    status = VerifyStatus.METADATA_FOUND if found else VerifyStatus.CLEAN
+    return _video_result(path, sorted(format_tags.keys()), stream_tags, probe="ffprobe")
+
 
+def _video_result(
+    path: Path, format_keys: list[str], stream_tags: dict[str, list[str]], *, probe: str
+) -> VerifyResult:
+    found = bool(format_keys) or bool(stream_tags)
+    status = VerifyStatus.METADATA_FOUND if found else VerifyStatus.CLEAN
     return VerifyResult(
         path=path,
         kind="video",
         status=status,
         details={
-            "format_tag_keys": sorted(list(format_tags.keys())),
+            "format_tag_keys": format_keys,
             "stream_tag_keys": stream_tags,
+            "probe": probe,
         },
     )
 
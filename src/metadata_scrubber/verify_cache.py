@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from dataclasses import asdict
+from pathlib import Path
+
+from .verify import VERIFIER_VERSION, VerifyOptions, VerifyResult, VerifyStatus
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    verifier TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    kind TEXT,
+    details TEXT NOT NULL,
+    message TEXT,
+    PRIMARY KEY (dev, ino, verifier)
+)
+"""
+
+# Only definitive answers are cached: errors may be transient and
+# "unsupported" can change when an optional tool gets installed.
+_CACHEABLE = {VerifyStatus.CLEAN, VerifyStatus.METADATA_FOUND}
+
+
+class VerifyCache:
+    """Persistent verify results, keyed on file identity and verifier settings.
+
+    A file is identified by (device, inode) and considered unchanged while its
+    size, mtime and ctime match. ctime is included because it can't be set
+    from userspace, unlike the mtime our scrubber itself restores. The
+    verifier key combines VERIFIER_VERSION with the options that affect
+    per-file results, so changing either simply misses.
+    """
+
+    def __init__(self, path: Path, options: VerifyOptions, *, commit_every: int = 1000) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        # WAL lets concurrent CI jobs read while one of them writes.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+        per_file = {k: v for k, v in asdict(options).items() if k != "recursive"}
+        self._verifier = f"{VERIFIER_VERSION}:{json.dumps(per_file, sort_keys=True)}"
+        self._commit_every = commit_every
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, st: os.stat_result) -> VerifyResult | None:
+        row = self._db.execute(
+            "SELECT size, mtime_ns, ctime_ns, status, kind, details, message FROM results"
+            " WHERE dev = ? AND ino = ? AND verifier = ?",
+            (st.st_dev, st.st_ino, self._verifier),
+        ).fetchone()
+        if row is None or tuple(row[:3]) != (st.st_size, st.st_mtime_ns, st.st_ctime_ns):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        _, _, _, status, kind, details, message = row
+        return VerifyResult(
+            path=path,
+            status=VerifyStatus(status),
+            kind=kind,
+            details=json.loads(details),
+            message=message,
+        )
+
+    def put(self, result: VerifyResult, st: os.stat_result) -> None:
+        if result.status not in _CACHEABLE:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO results"
+            " (dev, ino, verifier, size, mtime_ns, ctime_ns, status, kind, details, message)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                st.st_dev,
+                st.st_ino,
+                self._verifier,
+                st.st_size,
+                st.st_mtime_ns,
+                st.st_ctime_ns,
+                result.status.value,
+                result.kind,
+                json.dumps(result.details, sort_keys=True),
+                result.message,
+            ),
+        )
+        self._pending += 1
+        if self._pending >= self._commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._db.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def __enter__(self) -> VerifyCache:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -7,7 +7,9 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
+from .sampling import SampleReport, required_sample_size, sample_verify
 from .verify import VerifyOptions, VerifyStatus, verify_paths
+from .verify_cache import VerifyCache
 
 
 def main(
@@ -15,17 +17,81 @@ def main(
     json_output: bool = typer.Option(False, "--json", help="Output JSON to stdout"),
     show_values: bool = typer.Option(False, "--show-values", help="Include values (may expose sensitive data)"),
     no_recursive: bool = typer.Option(False, "--no-recursive", help="Do not traverse directories"),
+    fast: bool = typer.Option(
+        False,
+        "--fast",
+        help="Only check document-level metadata (skip the per-page PDF scan; Office files from the ZIP directory, images from their headers only)",
+    ),
     fail_on_metadata: bool = typer.Option(
         False,
         "--fail-on-metadata",
         help="Exit with a non-zero code if any metadata is found",
     ),
+    cache: Path | None = typer.Option(
+        None,
+        "--cache",
+        help="SQLite file caching results of unchanged files across runs",
+    ),
+    sample: int | None = typer.Option(
+        None,
+        "--sample",
+        min=1,
+        help="Verify a random sample of N files (stratified by format) and estimate the metadata rate",
+    ),
+    confidence: float = typer.Option(0.95, "--confidence", help="Confidence level for sampled estimates"),
+    max_defect_rate: float | None = typer.Option(
+        None,
+        "--max-defect-rate",
+        help="Sample enough files to show the metadata rate is below this at --confidence (fails otherwise)",
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed for reproducible sampling"),
+    deep_scan: bool = typer.Option(
+        False,
+        "--deep-scan",
+        help="Also search every file's raw bytes for XMP/EXIF/GPS/IPTC/author signatures (reports offsets)",
+    ),
+    scan_string: list[str] = typer.Option(
+        [],
+        "--scan-string",
+        help="Sensitive string to search for in raw bytes (UTF-8 and UTF-16); repeatable, implies --deep-scan",
+    ),
 ) -> None:
-    opts = VerifyOptions(recursive=not no_recursive, show_values=show_values)
-    results = verify_paths(paths, opts)
+    opts = VerifyOptions(
+        recursive=not no_recursive,
+        show_values=show_values,
+        fast=fast,
+        deep_scan=deep_scan or bool(scan_string),
+        scan_strings=tuple(scan_string),
+    )
+
+    sample_size = sample
+    if max_defect_rate is not None:
+        try:
+            required = required_sample_size(confidence, max_defect_rate)
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from None
+        sample_size = max(sample_size or 0, required)
+    elif sample is not None and not 0 < confidence < 1:
+        raise typer.BadParameter("confidence must be between 0 and 1")
+
+    verify_cache = None
+    if cache is not None:
+        verify_cache = VerifyCache(cache, opts)
+    report = None
+    try:
+        if sample_size is not None:
+            report = sample_verify(
+                paths, opts, sample_size=sample_size, confidence=confidence, seed=seed, cache=verify_cache
+            )
+            results = report.results
+        else:
+            results = verify_paths(paths, opts, cache=verify_cache)
+    finally:
+        if verify_cache is not None:
+            verify_cache.close()
 
     if json_output:
-        payload = [
+        rows = [
             {
                 "path": str(r.path),
                 "status": r.status.value,
@@ -35,6 +101,7 @@ def main(
             }
             for r in results
         ]
+        payload = rows if report is None else {"sample": _sample_summary(report), "results": rows}
         typer.echo(json.dumps(payload, indent=2, sort_keys=True))
     else:
         console = Console()
@@ -50,6 +117,10 @@ def main(
             if st in counts:
                 table.add_row(st.value, str(counts[st]))
         console.print(table)
+        if report is not None:
+            _print_sample(console, report)
+        if verify_cache is not None:
+            console.print(f"Cache: {verify_cache.hits} hits, {verify_cache.misses} misses")
 
         findings = [r for r in results if r.status in {VerifyStatus.METADATA_FOUND, VerifyStatus.ERROR}]
         if findings:
@@ -69,17 +140,77 @@ def main(
         raise typer.Exit(code=2)
     if fail_on_metadata and has_metadata:
         raise typer.Exit(code=1)
+    if report is not None and max_defect_rate is not None and not report.within(max_defect_rate):
+        raise typer.Exit(code=1)
 
 
 def app() -> None:
     typer.run(main)
 
 
+def _sample_summary(report: SampleReport) -> dict:
+    return {
+        "population": report.population,
+        "sample_size": report.sample_size,
+        "defects": report.defects,
+        "errors": report.errors,
+        "excluded": report.excluded,
+        "trials": report.trials,
+        "seed": report.seed,
+        "confidence": report.confidence,
+        "estimate": report.estimate,
+        "lower": report.lower,
+        "upper": report.upper,
+        "strata": {
+            kind: {
+                "population": s.population,
+                "sampled": s.sampled,
+                "defects": s.defects,
+                "errors": s.errors,
+                "excluded": s.excluded,
+            }
+            for kind, s in report.strata.items()
+        },
+    }
+
+
+def _print_sample(console: Console, report: SampleReport) -> None:
+    st = Table(title=f"Sample (seed {report.seed})")
+    st.add_column("Kind")
+    st.add_column("Files", justify="right")
+    st.add_column("Sampled", justify="right")
+    st.add_column("Metadata", justify="right")
+    st.add_column("No verdict", justify="right")
+    for kind, s in report.strata.items():
+        st.add_row(kind, str(s.population), str(s.sampled), str(s.defects), str(s.excluded))
+    console.print(st)
+    console.print(
+        f"Estimated metadata rate: {report.estimate:.4%} "
+        f"({report.confidence:.0%} CI {report.lower:.4%} - {report.upper:.4%}, "
+        f"{report.trials} of {report.population} files checked)"
+    )
+    if report.excluded:
+        console.print(
+            f"{report.excluded} sampled file(s) gave no verdict (error or unsupported) "
+            "and are not counted in the estimate"
+        )
+
+
 def _summarize(r) -> str:
+    summary = _summarize_details(r)
+    residual = r.details.get("residual")
+    if residual:
+        summary = f"{summary} residual={','.join(sorted(residual))}".strip()
+    return summary
+
+
+def _summarize_details(r) -> str:
     if r.status == VerifyStatus.ERROR:
         return r.message or ""
 
     if r.kind == "image":
+        if "metadata_blocks" in r.details:
+            return f"metadata_blocks={','.join(r.details['metadata_blocks']) or '-'}"
         exif_n = r.details.get("exif_tag_count", 0)
         interesting = r.details.get("interesting_info_keys") or []
         return f"exif_tags={exif_n} interesting_info_keys={len(interesting)}"
@@ -89,12 +220,15 @@ def _summarize(r) -> str:
         pieceinfo = r.details.get("page_pieceinfo_count", 0)
         annots = r.details.get("page_annots_count", 0)
         root_md = bool(r.details.get("has_root_metadata"))
+        if not r.details.get("pages_checked", True):
+            return f"docinfo_keys={len(md_keys)} root_md={root_md} pages=skipped"
         return f"docinfo_keys={len(md_keys)} root_md={root_md} pieceinfo_pages={pieceinfo} annots_pages={annots}"
 
     if r.kind == "openxml":
         docprops = r.details.get("docprops_present") or []
         non_norm = r.details.get("non_normalized_zip_timestamps", 0)
-        return f"docprops={len(docprops)} non_normalized_zip_timestamps={non_norm}"
+        comments = r.details.get("comment_parts", 0)
+        return f"docprops={len(docprops)} non_normalized_zip_timestamps={non_norm} comment_parts={comments}"
 
     if r.kind == "audio":
         keys = r.details.get("tag_keys") or []
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Any
+
+
+class CallTimeout(Exception):
+    """A watched call ran past its time limit; its worker process was killed."""
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__(f"timed out after {timeout:g}s")
+        self.timeout = timeout
+
+
+class Watchdog:
+    """A worker process that runs one call at a time under a time limit.
+
+    A call that overruns gets its process killed (SIGKILL: pure-Python loops
+    inside pypdf or Pillow don't respond to anything gentler) and the next
+    call starts a fresh one. Each worker leads its own process group, and
+    the whole group is killed, so tools it started (ffmpeg for a video
+    inside a document) die with it. Each worker gets a private temp
+    directory so files left by ``tempfile`` users in a killed worker are
+    removed with it.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._proc: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._scratch: str | None = None
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in the worker; fn, args and the result must be picklable."""
+        conn = self._ensure_worker()
+        conn.send((fn, args))
+        if not conn.poll(self.timeout):
+            self._kill()
+            self.restarts += 1
+            raise CallTimeout(self.timeout)
+        try:
+            ok, value = conn.recv()
+        except EOFError:
+            # Crashed (segfault, OOM killer): replace it on the next call.
+            self._kill()
+            raise RuntimeError("worker process died") from None
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+        if self._proc is not None:
+            self._proc.join(timeout=5)
+        # A worker that exited on its own has been reaped, so its group id may be reused.
+        self._kill(group=self._proc is not None and self._proc.exitcode is None)
+
+    def __enter__(self) -> Watchdog:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _ensure_worker(self) -> Connection:
+        if self._proc is not None and self._proc.is_alive() and self._conn is not None:
+            return self._conn
+
+        self._kill()
+        self._scratch = tempfile.mkdtemp(prefix="metadata-scrubber-worker-")
+        parent, child = self._ctx.Pipe()
+        self._proc = self._ctx.Process(target=_worker_main, args=(child, self._scratch), daemon=True)
+        self._proc.start()
+        child.close()
+        # Start-up (interpreter + imports) doesn't count against a call's limit.
+        parent.recv()
+        self._conn = parent
+        return parent
+
+    def _kill(self, *, group: bool = True) -> None:
+        if self._proc is not None:
+            # Before join: until the worker is reaped its pid (= group id) can't be reused.
+            if group:
+                _kill_group(self._proc.pid)
+            if self._proc.is_alive():
+                self._proc.kill()
+            self._proc.join()
+            self._proc = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._scratch is not None:
+            shutil.rmtree(self._scratch, ignore_errors=True)
+            self._scratch = None
+
+
+class WatchdogPool:
+    """Executor-like pool of Watchdog workers, one per thread.
+
+    Stands in for a ProcessPoolExecutor when calls need a time limit: a
+    timed-out call raises CallTimeout from its future and only its own
+    worker is replaced, instead of the whole pool breaking.
+    """
+
+    def __init__(self, workers: int, timeout: float) -> None:
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watchdog")
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._watchdogs: list[Watchdog] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        return self._threads.submit(self._call, fn, *args)
+
+    def shutdown(self) -> None:
+        self._threads.shutdown(wait=True)
+        for watchdog in self._watchdogs:
+            watchdog.close()
+
+    def __enter__(self) -> WatchdogPool:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        watchdog = getattr(self._local, "watchdog", None)
+        if watchdog is None:
+            watchdog = self._local.watchdog = Watchdog(self._timeout)
+            with self._lock:
+                self._watchdogs.append(watchdog)
+        return watchdog.call(fn, *args)
+
+
+def _kill_group(pid: int | None) -> None:
+    if pid is None or not hasattr(os, "killpg"):
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # The group is gone already (or the worker never got to setsid()).
+        pass
+
+
+def _worker_main(conn: Connection, scratch: str) -> None:
+    if hasattr(os, "setsid"):
+        os.setsid()
+    tempfile.tempdir = scratch
+    conn.send("ready")
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            conn.send((True, fn(*args)))
+        except Exception as e:  # noqa: BLE001
+            conn.send((False, f"{type(e).__name__}: {e}"))
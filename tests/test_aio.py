@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+from metadata_scrubber import ascrub_paths, averify_paths
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import ScrubStatus
+from metadata_scrubber.verify import VerifyOptions, VerifyStatus
+
+
+def test_ascrub_paths_matches_scrub_paths(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for i in range(3):
+        exif = Image.Exif()
+        exif[0x010F] = "TestMaker"
+        Image.new("RGB", (16, 16), (i, 0, 0)).save(src_dir / f"img{i}.jpg", exif=exif)
+    (src_dir / "notes.txt").write_text("hello")
+
+    sequential = scrub_paths([src_dir], RunOptions(out_dir=tmp_path / "seq"))
+    results = asyncio.run(ascrub_paths([src_dir], RunOptions(out_dir=tmp_path / "async"), concurrency=2))
+
+    assert [(r.src, r.status) for r in results] == [(r.src, r.status) for r in sequential]
+    assert sum(r.status == ScrubStatus.SCRUBBED for r in results) == 3
+
+    verified = asyncio.run(averify_paths([tmp_path / "async"], VerifyOptions()))
+    assert [r.status for r in verified] == [VerifyStatus.CLEAN] * 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as a fake ffmpeg")
+def test_ascrub_cancellation_kills_ffmpeg_and_removes_temp_files(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pid_file = tmp_path / "ffmpeg.pid"
+    fake = bin_dir / "ffmpeg"
+    fake.write_text(f'#!/bin/sh\necho $$ > "{pid_file}"\nexec sleep 60\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    src = tmp_path / "in" / "clip.mp4"
+    src.parent.mkdir()
+    src.write_bytes(b"\x00" * 64)
+    out_dir = tmp_path / "out"
+
+    async def run() -> None:
+        task = asyncio.create_task(ascrub_paths([src], RunOptions(out_dir=out_dir)))
+        for _ in range(500):
+            if pid_file.exists() and pid_file.read_text().strip():
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    pid = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+    assert [p for p in out_dir.rglob("*") if p.is_file()] == []
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import shutil
+
+from PIL import Image
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.dedup import find_duplicates
+from metadata_scrubber.models import RunStats, ScrubStatus
+
+
+def test_find_duplicates_groups_identical_content(tmp_path):
+    a = tmp_path / "a.bin"
+    b = tmp_path / "b.bin"
+    c = tmp_path / "c.bin"
+    d = tmp_path / "d.bin"
+    a.write_bytes(b"x" * 100_000)
+    b.write_bytes(b"x" * 100_000)
+    c.write_bytes(b"x" * 99_999 + b"y")  # same size and head, different tail
+    d.write_bytes(b"x" * 100_000)
+
+    assert find_duplicates([a, b, c, d]) == {1: 0, 3: 0}
+
+
+def test_dedup_scrubs_identical_inputs_once(tmp_path):
+    src_dir = tmp_path / "in"
+    (src_dir / "sub").mkdir(parents=True)
+
+    first = src_dir / "a.jpg"
+    exif = Image.Exif()
+    exif[274] = 3
+    Image.new("RGB", (20, 20), (10, 20, 30)).save(first, exif=exif, quality=95)
+    shutil.copyfile(first, src_dir / "sub" / "b.jpg")
+
+    out = tmp_path / "out"
+    stats = RunStats()
+    results = scrub_paths([src_dir], RunOptions(out_dir=out, dedup=True, dedup_hardlinks=True), stats=stats)
+    by_name = {r.src.name: r for r in results}
+
+    assert by_name["a.jpg"].status == ScrubStatus.SCRUBBED
+    assert by_name["b.jpg"].status == ScrubStatus.DEDUPLICATED
+    assert stats.dedup_files == 1
+    assert stats.dedup_bytes_saved == first.stat().st_size
+
+    out_a = out / "in" / "a.jpg"
+    out_b = out / "in" / "sub" / "b.jpg"
+    assert out_a.read_bytes() == out_b.read_bytes()
+    assert out_a.read_bytes() != first.read_bytes()
+    assert out_a.stat().st_ino == out_b.stat().st_ino
+
+
+def test_dedup_never_links_across_extensions(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    Image.new("RGB", (20, 20), (10, 20, 30)).save(src_dir / "a.jpg")
+    shutil.copyfile(src_dir / "a.jpg", src_dir / "b.png")
+
+    out = tmp_path / "out"
+    results = scrub_paths([src_dir], RunOptions(out_dir=out, dedup=True))
+
+    assert [r.status for r in results] == [ScrubStatus.SCRUBBED] * 2
+    with Image.open(out / "in" / "b.png") as img:
+        assert img.format == "PNG"
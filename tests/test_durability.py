@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from PIL import Image
+
+from metadata_scrubber import durability
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.durability import GroupCommit
+from metadata_scrubber.journal import load_journal
+from metadata_scrubber.models import ScrubStatus
+
+
+def test_group_commit_renames_after_sync_and_syncs_each_directory_once(tmp_path, monkeypatch):
+    synced_dirs = []
+    monkeypatch.setattr(durability, "fsync_dir", synced_dirs.append)
+
+    commit = GroupCommit(batch_size=3)
+    for name in ("a", "b"):
+        tmp = tmp_path / f".{name}.x.tmp"
+        tmp.write_text(name)
+        commit.stage(tmp, tmp_path / name)
+
+    assert not (tmp_path / "a").exists()
+    assert synced_dirs == []
+
+    tmp = tmp_path / ".c.x.tmp"
+    tmp.write_text("c")
+    commit.stage(tmp, tmp_path / "c")  # fills the batch
+
+    assert [(tmp_path / n).read_text() for n in "abc"] == ["a", "b", "c"]
+    assert synced_dirs == [tmp_path]
+    assert commit.batches == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "b", "c"]
+
+
+def test_batch_durability_in_place_with_journal_and_pool(tmp_path):
+    for jobs in (1, 2):
+        src_dir = tmp_path / f"in{jobs}"
+        src_dir.mkdir()
+        for i in range(5):
+            exif = Image.Exif()
+            exif[0x010F] = "Camera"
+            Image.new("RGB", (16, 16), (i, 0, 0)).save(src_dir / f"img{i}.jpg", exif=exif)
+        journal = tmp_path / f"run{jobs}.journal"
+
+        options = RunOptions(
+            out_dir=None,
+            in_place=True,
+            journal=journal,
+            jobs=jobs,
+            durability="batch",
+            durability_batch=2,
+        )
+        results = scrub_paths([src_dir], options)
+
+        assert [r.status for r in results] == [ScrubStatus.SCRUBBED] * 5
+        assert all(not Image.open(r.src).getexif() for r in results)
+        assert all(e["state"] == "stat_restored" for e in load_journal(journal).values())
+        assert sorted(p.suffix for p in src_dir.iterdir()) == [".bak"] * 5 + [".jpg"] * 5
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import shutil
+
+from PIL import Image
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.journal import Journal, JournalState, load_journal
+from metadata_scrubber.models import ScrubStatus
+
+
+def _dirty_jpeg(path):
+    exif = Image.Exif()
+    exif[274] = 3
+    Image.new("RGB", (20, 20), (10, 20, 30)).save(path, exif=exif, quality=95)
+
+
+def test_resume_skips_finished_files(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    _dirty_jpeg(src_dir / "a.jpg")
+    _dirty_jpeg(src_dir / "b.jpg")
+    journal = tmp_path / "run.journal"
+
+    first = scrub_paths([src_dir], RunOptions(out_dir=None, in_place=True, journal=journal))
+    assert {r.status for r in first} == {ScrubStatus.SCRUBBED}
+
+    entries = load_journal(journal)
+    assert {e["state"] for e in entries.values()} == {JournalState.STAT_RESTORED.value}
+
+    second = scrub_paths([src_dir], RunOptions(out_dir=None, in_place=True, journal=journal, resume=True))
+    by_name = {r.src.name: r.status for r in second}
+    assert by_name["a.jpg"] == ScrubStatus.SKIPPED_DONE
+    assert by_name["b.jpg"] == ScrubStatus.SKIPPED_DONE
+
+
+def test_resume_rolls_back_half_finished_in_place_file(tmp_path):
+    src = tmp_path / "a.jpg"
+    _dirty_jpeg(src)
+    original = src.read_bytes()
+    backup = tmp_path / "a.jpg.bak"
+    journal = tmp_path / "run.journal"
+
+    # Simulate a run killed after the backup was taken and the file was
+    # clobbered, but before the journal recorded the scrub.
+    shutil.copyfile(src, backup)
+    st = src.stat()
+    with Journal(journal) as j:
+        j.record(src, JournalState.PLANNED, mode=st.st_mode, atime_ns=st.st_atime_ns, mtime_ns=st.st_mtime_ns)
+        j.record(src, JournalState.BACKED_UP)
+    src.write_bytes(b"half-written")
+
+    results = scrub_paths([src], RunOptions(out_dir=None, in_place=True, journal=journal, resume=True))
+
+    assert [r.status for r in results] == [ScrubStatus.SCRUBBED]
+    assert backup.read_bytes() == original
+    with Image.open(src) as img:
+        assert len(img.getexif()) == 0
+    assert load_journal(journal)[str(src)]["state"] == JournalState.STAT_RESTORED.value
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import zipfile
+
+import pytest
+from PIL import Image
+from pypdf import PdfWriter
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import ScrubStatus
+from metadata_scrubber.scrubbers.base import ResourceLimitExceeded, ScrubOptions
+from metadata_scrubber.scrubbers.pdf import PdfScrubber
+
+
+def test_oversized_image_and_zip_bomb_are_rejected_without_output(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    Image.new("RGB", (400, 300)).save(src_dir / "big.png")
+    Image.new("RGB", (10, 10)).save(src_dir / "small.png")
+    with zipfile.ZipFile(src_dir / "bomb.docx", "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("word/document.xml", b"\x00" * (4 * 1024 * 1024))
+    out_dir = tmp_path / "out"
+
+    results = scrub_paths([src_dir], RunOptions(out_dir=out_dir, max_pixels=100_000, zip_max_ratio=100))
+    by_name = {r.src.name: r for r in results}
+
+    assert by_name["big.png"].status == ScrubStatus.REJECTED
+    assert "120000 pixels" in by_name["big.png"].message
+    assert by_name["bomb.docx"].status == ScrubStatus.REJECTED
+    assert by_name["small.png"].status == ScrubStatus.SCRUBBED
+    assert sorted(p.name for p in out_dir.rglob("*") if p.is_file()) == ["small.png"]
+
+
+def test_pdf_budgets_come_from_the_xref_table(tmp_path):
+    src = tmp_path / "in.pdf"
+    w = PdfWriter()
+    for _ in range(5):
+        w.add_blank_page(width=72, height=72)
+    with open(src, "wb") as f:
+        w.write(f)
+    scrubber = PdfScrubber()
+
+    with pytest.raises(ResourceLimitExceeded, match="objects"):
+        scrubber.check_limits(src, options=ScrubOptions(pdf_max_objects=4))
+    with pytest.raises(ResourceLimitExceeded, match="bytes"):
+        scrubber.check_limits(src, options=ScrubOptions(pdf_max_stream=16))
+
+    scrubber.check_limits(src, options=ScrubOptions(pdf_max_objects=100, pdf_max_stream=4096))
+    scrubber.scrub(src, tmp_path / "out.pdf", options=ScrubOptions(pdf_max_objects=100))
@@ -53,3 +53,199 @@ def test_openxml_removes_docprops_and_refs(tmp_path):
         # Normalized timestamps
         zi = z.getinfo("word/document.xml")
         assert zi.date_time == (1980, 1, 1, 0, 0, 0)
+
+
+def _jpeg_with_exif(text):
+    import io
+
+    from PIL import Image
+
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = text
+    Image.new("RGB", (16, 16), (200, 10, 10)).save(buf, format="JPEG", exif=exif)
+    return buf.getvalue()
+
+
+def test_openxml_scrubs_media_and_embedded_packages(tmp_path):
+    import io
+
+    from PIL import Image
+
+    inner = tmp_path / "inner.docx"
+    _make_openxml(inner)
+    with zipfile.ZipFile(inner, "a") as z:
+        z.writestr("word/media/image1.jpeg", _jpeg_with_exif("InnerCamera"))
+
+    src = tmp_path / "deck.pptx"
+    with zipfile.ZipFile(src, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("ppt/presentation.xml", "<p:presentation/>")
+        for i in range(6):
+            z.writestr(f"ppt/media/image{i}.jpeg", _jpeg_with_exif(f"Camera{i}"))
+        z.writestr("ppt/media/image9.emf", b"unsupported stays as-is")
+        z.writestr("ppt/embeddings/Document1.docx", inner.read_bytes())
+
+    dst = tmp_path / "out.pptx"
+    OpenXmlScrubber().scrub(src, dst, options=ScrubOptions())
+
+    with zipfile.ZipFile(dst, "r") as z:
+        assert z.namelist() == zipfile.ZipFile(src).namelist()
+        for i in range(6):
+            with Image.open(io.BytesIO(z.read(f"ppt/media/image{i}.jpeg"))) as img:
+                assert len(img.getexif()) == 0
+        assert z.read("ppt/media/image9.emf") == b"unsupported stays as-is"
+
+        with zipfile.ZipFile(io.BytesIO(z.read("ppt/embeddings/Document1.docx"))) as nested:
+            assert "docProps/core.xml" not in nested.namelist()
+            assert b"InnerCamera" not in nested.read("word/media/image1.jpeg")
+
+    untouched = tmp_path / "untouched.pptx"
+    OpenXmlScrubber().scrub(src, untouched, options=ScrubOptions(openxml_media=False))
+    with zipfile.ZipFile(untouched, "r") as z:
+        assert b"Camera0" in z.read("ppt/media/image0.jpeg")
+
+
+def test_openxml_pseudonymizes_authors_and_drops_rsids(tmp_path):
+    src = tmp_path / "review.docx"
+    dst = tmp_path / "out.docx"
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    with zipfile.ZipFile(src, "w") as z:
+        z.writestr(
+            "word/document.xml",
+            f'<w:document {w}><w:body><w:p w:rsidR="00A1B2C3">'
+            '<w:ins w:id="1" w:author="Alice Smith" w:date="2024-05-01T10:00:00Z"><w:r><w:t>x &amp; y</w:t></w:r></w:ins>'
+            "</w:p></w:body></w:document>",
+        )
+        z.writestr(
+            "word/comments.xml",
+            f'<w:comments {w}><w:comment w:id="0" w:author="Alice Smith" w:initials="AS"/></w:comments>',
+        )
+        z.writestr("word/settings.xml", f'<w:settings {w}><w:rsids><w:rsidRoot w:val="00A1B2C3"/></w:rsids></w:settings>')
+        z.writestr("xl/comments1.xml", "<comments><authors><author>Bob Jones</author></authors></comments>")
+
+    OpenXmlScrubber().scrub(src, dst, options=ScrubOptions())
+
+    with zipfile.ZipFile(dst, "r") as z:
+        document = z.read("word/document.xml").decode("utf-8")
+        comments = z.read("word/comments.xml").decode("utf-8")
+        settings = z.read("word/settings.xml").decode("utf-8")
+        xl_comments = z.read("xl/comments1.xml").decode("utf-8")
+
+    assert "Alice" not in document + comments and "Bob" not in xl_comments
+    assert 'w:author="Author 1"' in document
+    assert 'w:author="Author 1"' in comments
+    assert "<author>Author 2</author>" in xl_comments
+    assert "rsid" not in document + settings
+    assert "w:date" not in document
+    assert "<w:t>x &amp; y</w:t>" in document
+
+
+def test_openxml_compression_policy(tmp_path):
+    src = tmp_path / "deck.pptx"
+    with zipfile.ZipFile(src, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("ppt/slides/slide1.xml", "<p:sld>" + "<p:sp/>" * 500 + "</p:sld>")
+        for i in range(5):
+            z.writestr(f"ppt/media/image{i}.jpeg", _jpeg_with_exif(f"Camera{i}"))
+
+    def compress_types(options):
+        dst = tmp_path / "out.pptx"
+        OpenXmlScrubber().scrub(src, dst, options=options)
+        with zipfile.ZipFile(dst, "r") as z:
+            assert z.testzip() is None
+            return {info.filename: info.compress_type for info in z.infolist()}
+
+    auto = compress_types(ScrubOptions())
+    assert auto["ppt/slides/slide1.xml"] == zipfile.ZIP_DEFLATED
+    assert auto["ppt/media/image0.jpeg"] == zipfile.ZIP_STORED
+
+    deflate = compress_types(ScrubOptions(zip_compression="deflate", zip_level=9))
+    assert set(deflate.values()) == {zipfile.ZIP_DEFLATED}
+
+    store = compress_types(ScrubOptions(zip_compression="store"))
+    assert set(store.values()) == {zipfile.ZIP_STORED}
+
+
+def test_zipfile_internals_behind_write_packed_still_exist():
+    # write_packed and set_compress_level use private zipfile attributes; a
+    # Python upgrade that drops them must fail here, not in a user's run.
+    import io
+
+    from metadata_scrubber.formats.zip import (
+        WRITER_INTERNALS,
+        pack,
+        set_compress_level,
+        write_packed,
+    )
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        assert [attr for attr in WRITER_INTERNALS if not hasattr(z, attr)] == []
+
+        data = b"<w:document/>" * 1000
+        write_packed(z, zipfile.ZipInfo("packed.xml"), pack(data, compress_type=zipfile.ZIP_DEFLATED))
+
+        zi = zipfile.ZipInfo("leveled.xml")
+        zi.compress_type = zipfile.ZIP_DEFLATED
+        set_compress_level(zi, 1)
+        assert getattr(zi, "compress_level", getattr(zi, "_compresslevel", None)) == 1
+        with z.open(zi, "w") as f:
+            f.write(data)
+
+    with zipfile.ZipFile(buf) as z:
+        assert z.testzip() is None
+        assert z.read("packed.xml") == z.read("leveled.xml") == data
+
+
+def test_openxml_keeps_media_it_cannot_scrub(tmp_path, monkeypatch):
+    import sys
+
+    from metadata_scrubber.core import RunOptions, scrub_paths
+    from metadata_scrubber.models import ScrubStatus
+
+    # No ffmpeg on PATH and no mutagen, whatever this machine has installed.
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    monkeypatch.setitem(sys.modules, "mutagen", None)
+
+    src = tmp_path / "in" / "deck.pptx"
+    src.parent.mkdir()
+    with zipfile.ZipFile(src, "w") as z:
+        z.writestr("ppt/media/media1.mp4", b"not really a video")
+        z.writestr("ppt/media/media2.mp3", b"not really audio")
+        z.writestr("ppt/media/image1.png", b"not really a png")
+        z.writestr("ppt/media/image2.jpeg", _jpeg_with_exif("Camera"))
+
+    [result] = scrub_paths([src.parent], RunOptions(out_dir=tmp_path / "out"))
+
+    assert result.status == ScrubStatus.SCRUBBED
+    assert "ppt/media/media1.mp4 (ffmpeg not found)" in result.message
+    assert "ppt/media/media2.mp3 (mutagen not installed)" in result.message
+    assert "ppt/media/image1.png" in result.message
+    with zipfile.ZipFile(result.dst) as z:
+        assert z.read("ppt/media/media1.mp4") == b"not really a video"
+        assert z.read("ppt/media/image1.png") == b"not really a png"
+        assert b"Camera" not in z.read("ppt/media/image2.jpeg")
+
+
+def test_openxml_streams_large_media_through_temp_files(tmp_path, monkeypatch):
+    from metadata_scrubber.scrubbers import openxml
+    from metadata_scrubber.scrubbers.images import ImageScrubber
+
+    jpeg = _jpeg_with_exif("BigCamera")
+    monkeypatch.setattr(openxml, "_BUFFER_LIMIT", len(jpeg) - 1)
+
+    def no_buffering(self, data, name, *, options):
+        raise AssertionError(f"{name} was read into memory")
+
+    monkeypatch.setattr(ImageScrubber, "scrub_bytes", no_buffering)
+
+    src = tmp_path / "big.docx"
+    with zipfile.ZipFile(src, "w") as z:
+        z.writestr("word/document.xml", "<w:document/>")
+        z.writestr("word/media/image1.jpeg", jpeg)
+    dst = tmp_path / "out.docx"
+
+    assert OpenXmlScrubber().scrub(src, dst, options=ScrubOptions()) is None
+
+    with zipfile.ZipFile(dst) as z:
+        assert z.testzip() is None
+        assert b"BigCamera" not in z.read("word/media/image1.jpeg")
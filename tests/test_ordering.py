@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from PIL import Image
+
+from metadata_scrubber import core
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.ordering import dispatch_order
+
+
+def test_dispatch_order_sorts_by_key(tmp_path):
+    paths = []
+    for name, size in [("b", 10), ("c", 30), ("a", 20)]:
+        p = tmp_path / name
+        p.write_bytes(b"x" * size)
+        paths.append(p)
+    missing = tmp_path / "gone"
+
+    assert dispatch_order(paths, "path") == [2, 0, 1]
+    assert dispatch_order(paths + [missing], "size") == [1, 2, 0, 3]
+    by_inode = sorted(range(3), key=lambda i: paths[i].stat().st_ino)
+    assert dispatch_order(paths, "inode") == by_inode
+    assert sorted(dispatch_order(paths, "physical")) == [0, 1, 2]
+
+
+def test_ordered_run_dispatches_in_order_but_reports_in_walk_order(tmp_path, monkeypatch):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for name in ["c.png", "a.png", "b.png"]:
+        Image.new("RGB", (8, 8)).save(src_dir / name)
+
+    dispatched = []
+    real_scrub_one = core._scrub_one
+
+    def recording_scrub_one(src, dst, **kwargs):
+        dispatched.append(src.name)
+        return real_scrub_one(src, dst, **kwargs)
+
+    monkeypatch.setattr(core, "_scrub_one", recording_scrub_one)
+    walked = [r.src.name for r in scrub_paths([src_dir], RunOptions(out_dir=tmp_path / "o1"))]
+    dispatched.clear()
+
+    results = scrub_paths([src_dir], RunOptions(out_dir=tmp_path / "o2", order="path"))
+
+    assert dispatched == ["a.png", "b.png", "c.png"]
+    assert [r.src.name for r in results] == walked
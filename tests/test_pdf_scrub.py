@@ -28,3 +28,145 @@ def test_pdf_scrub_removes_docinfo_and_xmp(tmp_path):
 
     root = r.trailer["/Root"]
     assert "/Metadata" not in root
+
+
+def test_deep_scrub_handles_long_chains_without_recursion(tmp_path):
+    import sys
+
+    from pypdf.generic import DictionaryObject, NameObject, TextStringObject
+
+    from metadata_scrubber.scrubbers.pdf import _DEEP_KEYS, _deep_delete_keys
+
+    w = PdfWriter()
+    w.add_blank_page(width=72, height=72)
+
+    # A linked list of indirect objects far deeper than the recursion limit,
+    # closed into a cycle, each carrying a key the deep scrub must remove.
+    depth = sys.getrecursionlimit() * 3
+    head = prev = None
+    for _ in range(depth):
+        node = DictionaryObject({NameObject("/LastModified"): TextStringObject("D:2020")})
+        ref = w._add_object(node)
+        if prev is None:
+            head = ref
+        else:
+            prev[NameObject("/Next")] = ref
+        prev = node
+    prev[NameObject("/Next")] = head
+    w._root_object[NameObject("/Chain")] = head
+
+    stats = _deep_delete_keys(w._root_object, _DEEP_KEYS)
+
+    assert stats.keys_removed == depth
+    assert stats.objects_visited >= depth
+    assert "/LastModified" not in head.get_object()
+
+
+def _pdf_with_page_xmp_and_duplicate_streams(path):
+    from pypdf.generic import DecodedStreamObject, NameObject
+
+    w = PdfWriter()
+    for _ in range(10):
+        page = w.add_blank_page(width=72, height=72)
+        content = DecodedStreamObject()
+        content.set_data(b"0 0 m 10 10 l S\n" * 200)
+        page[NameObject("/Contents")] = w._add_object(content)
+        xmp = DecodedStreamObject()
+        xmp.set_data(b"<x:xmpmeta>SecretAuthor</x:xmpmeta>")
+        page[NameObject("/Metadata")] = w._add_object(xmp)
+    with open(path, "wb") as f:
+        w.write(f)
+
+
+def test_pdf_scrub_drops_unlinked_metadata_objects(tmp_path):
+    src = tmp_path / "in.pdf"
+    dst = tmp_path / "out.pdf"
+    _pdf_with_page_xmp_and_duplicate_streams(src)
+
+    PdfScrubber().scrub(src, dst, options=ScrubOptions())
+
+    assert b"SecretAuthor" not in dst.read_bytes()
+    assert len(PdfReader(str(dst)).pages) == 10
+
+
+def test_pdf_compact_mode_shrinks_output(tmp_path):
+    src = tmp_path / "in.pdf"
+    plain = tmp_path / "plain.pdf"
+    compact = tmp_path / "compact.pdf"
+    _pdf_with_page_xmp_and_duplicate_streams(src)
+
+    PdfScrubber().scrub(src, plain, options=ScrubOptions())
+    PdfScrubber().scrub(src, compact, options=ScrubOptions(pdf_compact=True))
+
+    assert compact.stat().st_size < plain.stat().st_size / 4
+    r = PdfReader(str(compact))
+    assert len(r.pages) == 10
+    assert r.metadata is None or len(r.metadata) == 0
+
+
+def test_pdf_scrub_strips_exif_from_embedded_jpegs(tmp_path):
+    import io
+
+    from PIL import Image
+    from pypdf.generic import DictionaryObject, NameObject, NumberObject, StreamObject
+
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = "SecretCameraMaker"
+    Image.new("RGB", (16, 16), (200, 10, 10)).save(buf, format="JPEG", exif=exif, comment=b"SecretComment")
+    jpeg = buf.getvalue()
+
+    w = PdfWriter()
+    page = w.add_blank_page(width=72, height=72)
+    img = StreamObject()
+    img._data = jpeg
+    img.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(16),
+            NameObject("/Height"): NumberObject(16),
+            NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+            NameObject("/Filter"): NameObject("/DCTDecode"),
+        }
+    )
+    xobjects = DictionaryObject({NameObject("/Im0"): w._add_object(img)})
+    page[NameObject("/Resources")] = DictionaryObject({NameObject("/XObject"): xobjects})
+
+    src = tmp_path / "in.pdf"
+    dst = tmp_path / "out.pdf"
+    with open(src, "wb") as f:
+        w.write(f)
+    assert b"SecretCameraMaker" in src.read_bytes()
+
+    PdfScrubber().scrub(src, dst, options=ScrubOptions())
+
+    out = dst.read_bytes()
+    assert b"SecretCameraMaker" not in out
+    assert b"SecretComment" not in out
+
+    r = PdfReader(str(dst))
+    data = r.pages[0]["/Resources"]["/XObject"]["/Im0"].get_object()._data
+    with Image.open(io.BytesIO(data)) as decoded:
+        assert decoded.size == (16, 16)
+        assert len(decoded.getexif()) == 0
+
+
+def test_pdf_scrub_reports_deep_scrub_stats(tmp_path):
+    from pypdf.generic import NameObject, TextStringObject
+
+    from metadata_scrubber.core import RunOptions, scrub_paths
+
+    src = tmp_path / "in.pdf"
+    w = PdfWriter()
+    page = w.add_blank_page(width=72, height=72)
+    page[NameObject("/LastModified")] = TextStringObject("D:20200101000000")
+    with open(src, "wb") as f:
+        w.write(f)
+
+    (result,) = scrub_paths([src], RunOptions(out_dir=tmp_path / "out"))
+
+    assert result.message is not None
+    assert result.message.startswith("deep scrub removed 1 key(s) from ")
+    assert "/LastModified" not in PdfReader(str(result.dst)).pages[0]
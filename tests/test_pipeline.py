@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+from PIL import Image
+
+from metadata_scrubber import pipeline
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import RunStats, ScrubStatus
+from metadata_scrubber.pipeline import ReadAhead
+
+
+def test_prefetch_stays_within_depth_of_dispatch(tmp_path, monkeypatch):
+    paths = [tmp_path / f"f{i}" for i in range(6)]
+    for p in paths:
+        p.write_bytes(b"x")
+    advised: list[tuple[str, str]] = []
+    fetched = threading.Semaphore(0)
+
+    def fake_advise(path, advice):
+        advised.append((path.name, advice))
+        fetched.release()
+
+    monkeypatch.setattr(pipeline, "_advise", fake_advise)
+    monkeypatch.setattr(pipeline, "_HAS_FADVISE", True)
+
+    read_ahead = ReadAhead(paths, depth=2, drop_behind=True)
+    for _ in range(2):
+        assert fetched.acquire(timeout=5)
+    assert not fetched.acquire(timeout=0.2)
+
+    read_ahead.advance()
+    assert fetched.acquire(timeout=5)
+    read_ahead.done(paths[0])
+    utilization = read_ahead.close()
+
+    assert ("f0", "dontneed") in advised
+    assert [name for name, advice in advised if advice == "willneed"] == ["f0", "f1", "f2"]
+    assert set(utilization) == {"prefetch", "compute", "drop_behind"}
+
+
+def test_pipelined_runs_report_stage_utilization(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for i in range(4):
+        Image.new("RGB", (32, 32), (i, 0, 0)).save(src_dir / f"img{i}.png")
+
+    for jobs in (1, 2):
+        stats = RunStats()
+        options = RunOptions(out_dir=tmp_path / f"out{jobs}", jobs=jobs, prefetch_depth=2, drop_behind=True)
+        results = scrub_paths([src_dir], options, stats=stats)
+
+        assert [r.status for r in results] == [ScrubStatus.SCRUBBED] * 4
+        assert "prefetch" in stats.stage_utilization
+        assert 0.0 < stats.stage_utilization["compute"] <= 1.0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from PIL import Image
+
+from metadata_scrubber.sampling import clopper_pearson, required_sample_size, sample_verify
+from metadata_scrubber.verify import VerifyOptions
+
+
+def test_sample_size_matches_zero_defect_bound():
+    n = required_sample_size(0.99, 0.001)
+    assert n == 5296
+    _, upper = clopper_pearson(0, n, 0.99)
+    assert upper <= 0.001
+    assert clopper_pearson(0, n - 1, 0.99)[1] > 0.001
+
+
+def test_sample_verify_is_stratified_and_reproducible(tmp_path):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    for i in range(20):
+        img = Image.new("RGB", (8, 8), (i, i, i))
+        if i % 4 == 0:
+            img.save(tmp_path / f"img{i:02d}.jpg", exif=exif)
+        else:
+            img.save(tmp_path / f"img{i:02d}.png")
+    (tmp_path / "notes.txt").write_text("not verifiable")
+
+    opts = VerifyOptions()
+    a = sample_verify([tmp_path], opts, sample_size=10, seed=7)
+    b = sample_verify([tmp_path], opts, sample_size=10, seed=7)
+
+    assert a.population == 20
+    assert a.sample_size == 10
+    assert [r.path for r in a.results] == [r.path for r in b.results]
+    assert set(a.strata) == {"image"}
+    assert a.lower <= a.estimate <= a.upper
+
+    everything = sample_verify([tmp_path], opts, sample_size=100)
+    assert everything.sample_size == 20
+    assert everything.defects == 5
+    assert everything.estimate == 0.25
+
+
+def test_sample_excludes_files_without_a_verdict_and_stays_within_size(tmp_path):
+    for i in range(6):
+        Image.new("RGB", (8, 8)).save(tmp_path / f"img{i}.png")
+    (tmp_path / "broken.jpg").write_bytes(b"not a jpeg")
+    (tmp_path / "doc.pdf").write_bytes(b"%PDF-1.4 truncated")
+    (tmp_path / "deck.docx").write_bytes(b"not a zip")
+
+    report = sample_verify([tmp_path], VerifyOptions(), sample_size=2)
+    assert report.sample_size == 2
+
+    everything = sample_verify([tmp_path], VerifyOptions(), sample_size=100)
+    assert everything.sample_size == 9
+    assert everything.excluded == 3
+    assert everything.trials == 6
+    assert everything.upper == clopper_pearson(0, 6, everything.confidence)[1]
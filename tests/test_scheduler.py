@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from PIL import Image
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import RunStats, ScrubStatus
+
+
+def test_parallel_run_matches_sequential_order(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for i, size in enumerate([8, 64, 16, 128, 32]):
+        exif = Image.Exif()
+        exif[274] = 3
+        Image.new("RGB", (size, size), (i, 0, 0)).save(src_dir / f"img{i}.jpg", exif=exif)
+    (src_dir / "notes.txt").write_text("hello")
+
+    sequential = scrub_paths([src_dir], RunOptions(out_dir=tmp_path / "seq"))
+
+    stats = RunStats()
+    parallel = scrub_paths([src_dir], RunOptions(out_dir=tmp_path / "par", jobs=2), stats=stats)
+
+    assert [r.src for r in parallel] == [r.src for r in sequential]
+    assert [r.status for r in parallel] == [r.status for r in sequential]
+    assert sum(r.status == ScrubStatus.SCRUBBED for r in parallel) == 5
+    assert set(stats.pool_utilization) == {"cpu", "io"}
+    assert 0.0 < stats.pool_utilization["cpu"] <= 1.0
+
+
+def test_memory_budget_limits_concurrent_admission(tmp_path):
+    from metadata_scrubber.scrubbers.images import ImageScrubber
+
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for i in range(4):
+        Image.new("RGB", (200, 100), (i, 0, 0)).save(src_dir / f"img{i}.png")
+
+    estimate = ImageScrubber().estimate_memory(src_dir / "img0.png")
+    assert estimate >= 3 * 200 * 100 * 4
+
+    stats = RunStats()
+    opts = RunOptions(out_dir=tmp_path / "out", jobs=4, max_memory=int(estimate * 1.5))
+    results = scrub_paths([src_dir], opts, stats=stats)
+
+    assert all(r.status == ScrubStatus.SCRUBBED for r in results)
+    # Only one image fits the budget at a time.
+    assert 0 < stats.peak_estimated_memory <= int(estimate * 1.5)
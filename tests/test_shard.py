@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+from PIL import Image
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.manifest import merge_manifests, write_manifest
+from metadata_scrubber.models import RunStats
+from metadata_scrubber.shard import assign_shards, parse_shard
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+
+
+@pytest.mark.parametrize("bad", ["4/4", "-1/4", "1", "a/b", "0/0"])
+def test_parse_shard_rejects(bad):
+    with pytest.raises(ValueError):
+        parse_shard(bad)
+
+
+def test_assign_shards_is_stable_and_size_balanced():
+    keys = [f"share/dir{i % 7}/file{i}.jpg" for i in range(200)]
+    assert assign_shards(keys, 4) == assign_shards(list(keys), 4)
+
+    sizes = [1000, 10, 10, 10, 500, 500]
+    assignment = assign_shards([f"f{i}" for i in range(6)], 2, sizes=sizes)
+    loads = [sum(s for s, a in zip(sizes, assignment) if a == shard) for shard in range(2)]
+    assert sorted(loads) == [1010, 1020]
+
+
+def test_shards_partition_the_run_and_merge(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for i in range(12):
+        Image.new("RGB", (8, 8), (i, 0, 0)).save(src_dir / f"img{i}.png")
+
+    manifests = []
+    seen = []
+    for index in range(3):
+        opts = RunOptions(out_dir=tmp_path / "out", shard=(index, 3))
+        results = scrub_paths([src_dir], opts)
+        seen.extend(r.src.name for r in results)
+        manifests.append(tmp_path / f"shard{index}.json")
+        write_manifest(manifests[-1], results, shard=(index, 3))
+
+    assert sorted(seen) == sorted(f"img{i}.png" for i in range(12))
+
+    merged = merge_manifests(manifests)
+    assert merged["missing_shards"] == []
+    assert merged["totals"] == {"scrubbed": 12}
+
+    partial = merge_manifests(manifests[:2])
+    assert partial["missing_shards"] == [2]
+
+
+def test_merge_manifests_sums_counters_and_keeps_peaks(tmp_path):
+    paths = []
+    for index, (dedup, peak, util) in enumerate([(2, 300, 0.5), (3, 100, 0.75)]):
+        stats = RunStats(
+            dedup_files=dedup, pool_utilization={"cpu": util}, peak_estimated_memory=peak
+        )
+        paths.append(tmp_path / f"shard{index}.json")
+        write_manifest(paths[-1], [], shard=(index, 2), stats=stats)
+
+    merged = merge_manifests(paths)["stats"]
+    assert merged["dedup_files"] == 5
+    assert merged["peak_estimated_memory"] == 300
+    assert merged["pool_utilization"] == {"cpu": 0.75}
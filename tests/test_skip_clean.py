@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from PIL import Image
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import ScrubStatus
+
+
+def test_skip_clean_copies_clean_files_and_scrubs_dirty_ones(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+
+    dirty = src_dir / "dirty.jpg"
+    exif = Image.Exif()
+    exif[274] = 3
+    Image.new("RGB", (20, 20), (10, 20, 30)).save(dirty, exif=exif, quality=95)
+
+    clean = src_dir / "clean.png"
+    Image.new("RGB", (20, 20), (10, 20, 30)).save(clean)
+
+    out = tmp_path / "out"
+    results = scrub_paths([src_dir], RunOptions(out_dir=out, skip_clean=True))
+    by_name = {r.src.name: r for r in results}
+
+    assert by_name["dirty.jpg"].status == ScrubStatus.SCRUBBED
+    assert by_name["clean.png"].status == ScrubStatus.ALREADY_CLEAN
+    assert (out / "in" / "clean.png").read_bytes() == clean.read_bytes()
+
+
+def test_skip_clean_in_place_leaves_clean_file_untouched(tmp_path):
+    clean = tmp_path / "clean.png"
+    Image.new("RGB", (20, 20), (10, 20, 30)).save(clean)
+    before = clean.read_bytes()
+
+    results = scrub_paths([clean], RunOptions(out_dir=None, in_place=True, skip_clean=True))
+
+    assert [r.status for r in results] == [ScrubStatus.ALREADY_CLEAN]
+    assert clean.read_bytes() == before
+    assert not (tmp_path / "clean.png.bak").exists()
+
+
+def test_skip_clean_scrubs_pdf_whose_only_metadata_is_embedded_jpeg_exif(tmp_path):
+    import io
+
+    from pypdf import PdfWriter
+    from pypdf.generic import DictionaryObject, NameObject, NumberObject, StreamObject
+
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = "SecretCameraMaker"
+    Image.new("RGB", (16, 16), (200, 10, 10)).save(buf, format="JPEG", exif=exif)
+
+    w = PdfWriter()
+    w._info = None
+    page = w.add_blank_page(width=72, height=72)
+    img = StreamObject()
+    img._data = buf.getvalue()
+    img.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(16),
+            NameObject("/Height"): NumberObject(16),
+            NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+            NameObject("/Filter"): NameObject("/DCTDecode"),
+        }
+    )
+    xobjects = DictionaryObject({NameObject("/Im0"): w._add_object(img)})
+    page[NameObject("/Resources")] = DictionaryObject({NameObject("/XObject"): xobjects})
+    src = tmp_path / "photo.pdf"
+    with open(src, "wb") as f:
+        w.write(f)
+
+    (result,) = scrub_paths([src], RunOptions(out_dir=tmp_path / "out", skip_clean=True))
+
+    assert result.status == ScrubStatus.SCRUBBED
+    assert b"SecretCameraMaker" not in result.dst.read_bytes()
+
+
+def _normalized_docx(path, members):
+    import zipfile
+
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in members.items():
+            z.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), data)
+
+
+def test_skip_clean_scrubs_docx_whose_only_metadata_is_media_exif(tmp_path):
+    import io
+    import zipfile
+
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = "SecretCameraMaker"
+    Image.new("RGB", (16, 16), (200, 10, 10)).save(buf, format="JPEG", exif=exif)
+
+    src = tmp_path / "photo.docx"
+    _normalized_docx(src, {"word/document.xml": "<w:document/>", "word/media/image1.jpeg": buf.getvalue()})
+
+    (result,) = scrub_paths([src], RunOptions(out_dir=tmp_path / "out", skip_clean=True))
+
+    assert result.status == ScrubStatus.SCRUBBED
+    with zipfile.ZipFile(result.dst) as z:
+        assert b"SecretCameraMaker" not in z.read("word/media/image1.jpeg")
+
+
+def test_skip_clean_rewrites_docx_whose_only_metadata_is_authors(tmp_path):
+    import zipfile
+
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        '<w:ins w:id="1" w:author="Alice Smith"><w:r><w:t>hi</w:t></w:r></w:ins>'
+        "</w:body></w:document>"
+    )
+    src = tmp_path / "review.docx"
+    _normalized_docx(src, {"word/document.xml": document})
+
+    (result,) = scrub_paths([src], RunOptions(out_dir=tmp_path / "out", skip_clean=True))
+
+    assert result.status == ScrubStatus.SCRUBBED
+    with zipfile.ZipFile(result.dst) as z:
+        assert b"Alice Smith" not in z.read("word/document.xml")
+
+    (kept,) = scrub_paths(
+        [src], RunOptions(out_dir=tmp_path / "kept", skip_clean=True, openxml_authors="keep")
+    )
+    assert kept.status == ScrubStatus.ALREADY_CLEAN
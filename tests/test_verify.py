@@ -82,3 +82,159 @@ def test_verify_pdf_detects_docinfo_then_clean_after_scrub(tmp_path):
 
     r2 = verify_file(dst, options=VerifyOptions(recursive=False, show_values=False))
     assert r2.status == VerifyStatus.CLEAN
+
+
+def test_verify_pdf_fast_skips_page_scan(tmp_path):
+    from pypdf import PdfWriter
+    from pypdf.generic import DictionaryObject, NameObject
+
+    path = tmp_path / "pieceinfo.pdf"
+    w = PdfWriter()
+    page = w.add_blank_page(width=72, height=72)
+    page[NameObject("/PieceInfo")] = DictionaryObject()
+    with open(path, "wb") as f:
+        w.write(f)
+
+    full = verify_file(path, options=VerifyOptions(recursive=False))
+    assert full.status == VerifyStatus.METADATA_FOUND
+    assert full.details["page_pieceinfo_count"] == 1
+
+    fast = verify_file(path, options=VerifyOptions(recursive=False, fast=True))
+    assert fast.details["pages_checked"] is False
+    assert fast.details["page_pieceinfo_count"] == 0
+
+
+def test_verify_openxml_fast_uses_central_directory(tmp_path):
+    src = tmp_path / "sample.docx"
+    dst = tmp_path / "out.docx"
+    _make_openxml(src)
+    OpenXmlScrubber().scrub(src, dst, options=ScrubOptions(normalize_zip_timestamps=True))
+
+    for path in (src, dst):
+        deep = verify_file(path, options=VerifyOptions(recursive=False))
+        fast = verify_file(path, options=VerifyOptions(recursive=False, fast=True))
+        assert fast.status == deep.status
+        assert fast.details["parts_parsed"] is False
+        assert fast.details["docprops_present"] == deep.details["docprops_present"]
+        assert fast.details["non_normalized_zip_timestamps"] == deep.details["non_normalized_zip_timestamps"]
+
+    shown = verify_file(src, options=VerifyOptions(recursive=False, fast=True, show_values=True))
+    assert shown.details["parts_parsed"] is True
+
+
+def test_verify_openxml_counts_comment_parts_as_metadata(tmp_path):
+    path = tmp_path / "reviewed.docx"
+    with zipfile.ZipFile(path, "w") as z:
+        for name in ("word/document.xml", "word/comments.xml"):
+            z.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), "<w:x/>")
+
+    for fast in (False, True):
+        result = verify_file(path, options=VerifyOptions(recursive=False, fast=fast))
+        assert result.details["comment_parts"] == 1
+        assert result.status == VerifyStatus.METADATA_FOUND
+
+
+def test_verify_image_fast_reads_headers_only(tmp_path):
+    from PIL import PngImagePlugin
+
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "Alice")
+
+    dirty_jpeg = tmp_path / "dirty.jpg"
+    Image.new("RGB", (512, 512), (1, 2, 3)).save(dirty_jpeg, exif=exif)
+    dirty_png = tmp_path / "dirty.png"
+    Image.new("RGB", (512, 512), (1, 2, 3)).save(dirty_png, pnginfo=info)
+    clean_tiff = tmp_path / "clean.tif"
+    Image.new("RGB", (512, 512), (1, 2, 3)).save(clean_tiff)
+
+    fast = VerifyOptions(recursive=False, fast=True)
+    r_jpeg = verify_file(dirty_jpeg, options=fast)
+    assert r_jpeg.status == VerifyStatus.METADATA_FOUND
+    assert r_jpeg.details["metadata_blocks"] == ["exif"]
+    assert r_jpeg.details["header_bytes_read"] < 1024
+
+    assert verify_file(dirty_png, options=fast).details["metadata_blocks"] == ["text"]
+    assert verify_file(clean_tiff, options=fast).status == VerifyStatus.CLEAN
+
+
+def test_verify_deep_scan_finds_residual_signatures_and_strings(tmp_path):
+    blob = tmp_path / "payload.bin"
+    blob.write_bytes(b"\x00" * 100 + b"<x:xmpmeta xmlns:x='adobe:ns:meta/'>" + b"\x00" * 50 + "Alice".encode("utf-16-le"))
+    clean = tmp_path / "clean.png"
+    Image.new("RGB", (8, 8)).save(clean)
+
+    opts = VerifyOptions(recursive=False, deep_scan=True, scan_strings=("Alice",))
+    r = verify_file(blob, options=opts)
+    assert r.status == VerifyStatus.METADATA_FOUND
+    assert r.details["residual"]["xmp"]["offsets"] == [100]
+    assert r.details["residual"]["string:Alice"]["offsets"] == [186]
+
+    assert verify_file(clean, options=opts).status == VerifyStatus.CLEAN
+    assert verify_file(blob, options=VerifyOptions(recursive=False)).status == VerifyStatus.UNSUPPORTED
+
+
+def _box(btype: bytes, payload: bytes) -> bytes:
+    return (8 + len(payload)).to_bytes(4, "big") + btype + payload
+
+
+def test_verify_mp4_reads_header_boxes_natively(tmp_path):
+    mvhd = _box(b"mvhd", bytes(100))
+    mdhd = _box(b"mdhd", bytes(24))
+    hdlr = _box(b"hdlr", bytes(8) + b"vide" + bytes(12) + b"\x00")
+    trak = _box(b"trak", _box(b"tkhd", bytes(84)) + _box(b"mdia", mdhd + hdlr))
+    ilst = _box(b"ilst", _box(b"\xa9nam", _box(b"data", bytes(8) + b"Holiday")))
+    meta = _box(b"meta", bytes(4) + _box(b"hdlr", bytes(8) + b"mdir" + bytes(13)) + ilst)
+    moov = _box(b"moov", mvhd + trak + _box(b"udta", meta))
+    p = tmp_path / "clip.mp4"
+    ftyp = _box(b"ftyp", b"isom" + bytes(4) + b"isom")
+    p.write_bytes(ftyp + _box(b"mdat", b"\xff" * 4096) + moov)
+
+    r = verify_file(p, options=VerifyOptions())
+    assert r.status == VerifyStatus.METADATA_FOUND
+    assert r.details["probe"] == "native"
+    assert "title" in r.details["format_tag_keys"]
+    assert "creation_time" not in r.details["format_tag_keys"]
+    assert r.details["stream_tag_keys"] == {"0": ["language"]}
+
+
+def _ebml(eid: int, payload: bytes) -> bytes:
+    # 8-byte size vints keep the offsets below easy to compute.
+    size = (0x01 << 56 | len(payload)).to_bytes(8, "big")
+    return eid.to_bytes((eid.bit_length() + 7) // 8, "big") + size + payload
+
+
+def test_verify_mkv_follows_seekhead_past_clusters(tmp_path):
+    info = _ebml(0x1549A966, _ebml(0x2AD7B1, (1000000).to_bytes(3, "big")))
+    track = _ebml(0xAE, _ebml(0x73C5, b"\x07") + _ebml(0x22B59C, b"und"))
+    tracks = _ebml(0x1654AE6B, track)
+    cluster = _ebml(0x1F43B675, _ebml(0xE7, b"\x00") + _ebml(0xA3, b"\xff" * 4096))
+    tags = _ebml(
+        0x1254C367,
+        _ebml(0x7373, _ebml(0x63C0, b"") + _ebml(0x67C8, _ebml(0x45A3, b"ENCODER")))
+        + _ebml(
+            0x7373,
+            _ebml(0x63C0, _ebml(0x63C5, b"\x07")) + _ebml(0x67C8, _ebml(0x45A3, b"DURATION")),
+        ),
+    )
+
+    def seekhead(tags_pos: int) -> bytes:
+        seek = _ebml(0x53AB, b"\x12\x54\xc3\x67") + _ebml(0x53AC, tags_pos.to_bytes(8, "big"))
+        return _ebml(0x114D9B74, _ebml(0x4DBB, seek))
+
+    body_before_tags = len(seekhead(0)) + len(info) + len(tracks) + len(cluster)
+    segment = seekhead(body_before_tags) + info + tracks + cluster + tags
+    header = _ebml(0x1A45DFA3, _ebml(0x4282, b"matroska"))
+    p = tmp_path / "clip.mkv"
+    p.write_bytes(header + _ebml(0x18538067, segment))
+
+    r = verify_file(p, options=VerifyOptions())
+    assert r.status == VerifyStatus.METADATA_FOUND
+    assert r.details["probe"] == "native"
+    assert r.details["format_tag_keys"] == ["ENCODER"]
+    assert r.details["stream_tag_keys"] == {"0": ["DURATION"]}
+
+    p.write_bytes(header + _ebml(0x18538067, info + tracks + cluster))
+    r = verify_file(p, options=VerifyOptions())
+    assert r.status == VerifyStatus.CLEAN
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+
+from PIL import Image
+
+from metadata_scrubber.verify import VerifyOptions, VerifyStatus, verify_paths
+from metadata_scrubber.verify_cache import VerifyCache
+
+
+def _jpeg(path, *, exif_make=None):
+    img = Image.new("RGB", (16, 16), (1, 2, 3))
+    if exif_make is None:
+        img.save(path)
+        return
+    exif = Image.Exif()
+    exif[0x010F] = exif_make
+    img.save(path, exif=exif)
+
+
+def test_cache_returns_stored_results_for_unchanged_files(tmp_path):
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    _jpeg(tree / "a.jpg", exif_make="Camera")
+    _jpeg(tree / "b.jpg")
+    db = tmp_path / "verify.sqlite"
+    opts = VerifyOptions()
+
+    with VerifyCache(db, opts) as cache:
+        first = verify_paths([tree], opts, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    with VerifyCache(db, opts) as cache:
+        second = verify_paths([tree], opts, cache=cache)
+        assert (cache.hits, cache.misses) == (2, 0)
+    assert [(r.path, r.status, r.details) for r in second] == [(r.path, r.status, r.details) for r in first]
+
+    # A rewritten file misses even if its mtime is put back.
+    st = (tree / "a.jpg").stat()
+    _jpeg(tree / "a.jpg")
+    os.utime(tree / "a.jpg", ns=(st.st_atime_ns, st.st_mtime_ns))
+    with VerifyCache(db, opts) as cache:
+        third = {r.path.name: r.status for r in verify_paths([tree], opts, cache=cache)}
+        assert (cache.hits, cache.misses) == (1, 1)
+    assert third["a.jpg"] == VerifyStatus.CLEAN
+
+    # Different per-file options use separate entries.
+    with VerifyCache(db, VerifyOptions(fast=True)) as cache:
+        verify_paths([tree], VerifyOptions(fast=True), cache=cache)
+        assert cache.hits == 0
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+from PIL import Image
+
+from metadata_scrubber.core import RunOptions, scrub_paths
+from metadata_scrubber.models import ScrubStatus
+from metadata_scrubber.watchdog import CallTimeout, Watchdog
+
+
+def test_watchdog_kills_overrunning_call_and_restarts():
+    with Watchdog(0.5) as watchdog:
+        assert watchdog.call(pow, 2, 10) == 1024
+        with pytest.raises(CallTimeout):
+            watchdog.call(time.sleep, 30)
+        assert watchdog.call(pow, 3, 3) == 27
+        assert watchdog.restarts == 1
+
+
+def test_file_timeout_marks_cpu_scrub_timeout_without_temp_files(tmp_path):
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    for i in range(2):
+        Image.new("RGB", (64, 64), (i, 0, 0)).save(src_dir / f"img{i}.jpg")
+    out_dir = tmp_path / "out"
+
+    # Far below a worker round trip, so every file overruns.
+    results = scrub_paths([src_dir], RunOptions(out_dir=out_dir, file_timeout=0.0001))
+
+    assert [r.status for r in results] == [ScrubStatus.TIMEOUT] * 2
+    assert [p for p in out_dir.rglob("*") if p.is_file()] == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as a fake ffmpeg")
+def test_file_timeout_kills_hung_ffmpeg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pid_file = tmp_path / "ffmpeg.pid"
+    fake = bin_dir / "ffmpeg"
+    fake.write_text(f'#!/bin/sh\necho $$ > "{pid_file}"\nexec sleep 60\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    src = tmp_path / "in" / "clip.mkv"
+    src.parent.mkdir()
+    src.write_bytes(b"\x00" * 64)
+    out_dir = tmp_path / "out"
+
+    started = time.monotonic()
+    [result] = scrub_paths([src], RunOptions(out_dir=out_dir, file_timeout=0.5))
+
+    assert result.status == ScrubStatus.TIMEOUT
+    assert time.monotonic() - started < 10
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+    assert [p for p in out_dir.rglob("*") if p.is_file()] == []
+
+
+def _running(pid: int) -> bool:
+    # An orphan that was killed may linger as a zombie until init reaps it.
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc; uses a shell script as a fake ffmpeg")
+def test_file_timeout_kills_ffmpeg_started_inside_the_worker(tmp_path, monkeypatch):
+    import zipfile
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pid_file = tmp_path / "ffmpeg.pid"
+    fake = bin_dir / "ffmpeg"
+    fake.write_text(f'#!/bin/sh\necho $$ > "{pid_file}"\nexec sleep 60\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    # The video is scrubbed by the OpenXML scrubber, inside the watchdog worker.
+    src = tmp_path / "in" / "deck.pptx"
+    src.parent.mkdir()
+    with zipfile.ZipFile(src, "w") as z:
+        z.writestr("ppt/media/media1.mp4", b"\x00" * 64)
+
+    [result] = scrub_paths([src], RunOptions(out_dir=tmp_path / "out", file_timeout=2))
+
+    assert result.status == ScrubStatus.TIMEOUT
+    assert not _running(int(pid_file.read_text()))